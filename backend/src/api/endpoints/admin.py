@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Query
 from sqlalchemy.orm import Session, joinedload
 from fastapi.responses import FileResponse
 
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 import os
 from datetime import datetime
 import shutil
 
-from src.database import get_db
+from src.database import get_db, ENGINES
+from src.core.pool_metrics import get_pool_stats
 from src.auth.security import get_current_teacher
 from src.models.teacher import Teacher, UserRole
 from src.crud import crud_admin, crud_data, crud_workspace, crud_dashboard
@@ -197,9 +198,8 @@ def delete_practice_by_admin(
 
     try:
         db.delete(db_practice)
-        db.commit()
-
         crud_dashboard.create_log_entry(db, teacher_id=owner_teacher_id, activity_type='DELETED', practice_title=practice_title_to_log)
+        db.commit()
 
     except Exception as e:
         db.rollback()
@@ -317,6 +317,11 @@ def update_practice_by_admin(
 
     try:
         update_data: workspace_schema.PracticeUpdate = workspace_schema.PracticeUpdate.parse_raw(update_data_str)
+        requested_bookings = [b.model_dump() for b in update_data.bookings]
+        try:
+            crud_workspace.validate_session_times(requested_bookings)
+        except crud_workspace.InvalidSessionError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         if file:
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -337,17 +342,17 @@ def update_practice_by_admin(
 
         crud_workspace.delete_future_bookings_for_practice(db, practice_id=practice_id)
 
-        for booking_info in update_data.bookings:
-            new_booking = booking.Booking(
-                practice_id=practice_id,
-                group_id=booking_info.group_id,
-                room_id=booking_info.room_id,
-                practice_date=booking_info.practice_date,
-                start_time=booking_info.start_time,
-                end_time=booking_info.end_time,
-                status='Scheduled'
+        bookings_to_create = crud_workspace.filter_retained_bookings(
+            db, practice_id=practice_id, bookings_data=requested_bookings
+        )
+        try:
+            crud_workspace.create_bookings(db, practice_id=practice_id, bookings_data=bookings_to_create)
+        except crud_workspace.BookingConflictError as conflict:
+            resource = "Room" if conflict.resource == "room" else "Group"
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Schedule conflict: {resource} '{conflict.name}' is already booked on {conflict.booking_info['practice_date']} at this time."
             )
-            db.add(new_booking)
 
         db.commit()
 
@@ -392,9 +397,40 @@ def update_teacher_role(
 )
 def get_teacher_monthly_progress_by_admin(
     teacher_id: int,
+    year: Optional[int] = Query(None, ge=1, le=9999),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    db: Session = Depends(get_db)
+):
+    """
+    Gets the monthly practice progress for a specific teacher, for the current month by default. (Admin only)
+    """
+    return crud_workspace.get_monthly_practice_progress(db, teacher_id=teacher_id, year=year, month=month)
+
+@router.get(
+    "/teachers/{teacher_id}/monthly-progress/range",
+    response_model=List[workspace_schema.MonthlyProgressSeriesItem],
+    dependencies=[Depends(get_current_admin_user)]
+)
+def get_teacher_monthly_progress_range_by_admin(
+    teacher_id: int,
+    start: str = Query(..., description="First month, YYYY-MM"),
+    end: str = Query(..., description="Last month (inclusive), YYYY-MM"),
     db: Session = Depends(get_db)
 ):
     """
-    Gets the monthly practice progress for a specific teacher. (Admin only)
+    Gets the monthly practice progress of a teacher for every month from `start` to `end`,
+    e.g. a whole semester. (Admin only)
+    """
+    try:
+        start_month, end_month = crud_workspace.parse_month_span(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return crud_workspace.get_practice_progress_series(db, teacher_id, start_month, end_month)
+
+@router.get("/db/pool", response_model=List[admin_schema.PoolStats], dependencies=[Depends(get_current_admin_user)])
+def get_database_pool_stats():
+    """
+    Reports occupancy and checkout/wait counters of this worker's connection pools. (Admin only)
+    Counters are per process and reset when the worker restarts.
     """
-    return crud_workspace.get_monthly_practice_progress(db, teacher_id=teacher_id)
\ No newline at end of file
+    return get_pool_stats(ENGINES)
\ No newline at end of file
@@ -1,7 +1,7 @@
-import fitz  
-import ollama
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Form
 from src.auth.security import get_current_teacher
+from src.core.config import settings
+from src.services import ai_stack
 import json
 import re
 
@@ -69,6 +69,8 @@ def extract_sections_with_python(full_text: str) -> dict:
 
 @router.post("/analyze-pdf", dependencies=[Depends(get_current_teacher)])
 async def analyze_practice_document(file: UploadFile = File(...), lang: str = Form("en")):
+    if not settings.AI_FEATURES_ENABLED:
+        raise HTTPException(status_code=503, detail="AI features are disabled on this server.")
     if file.content_type != 'application/pdf':
         raise HTTPException(status_code=400, detail="Invalid file type.")
 
@@ -76,10 +78,7 @@ async def analyze_practice_document(file: UploadFile = File(...), lang: str = Fo
         analyze_chunk_prompts = PROMPT_ANALYZE_CHUNK.get(lang, PROMPT_ANALYZE_CHUNK['en'])
         
         file_bytes = await file.read()
-        full_text = ""
-        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-            for page in doc:
-                full_text += page.get_text()
+        full_text = ai_stack.extract_pdf_text(file_bytes)
 
         if len(full_text.strip()) < 50:
             raise HTTPException(status_code=422, detail="PDF contains too little text.")
@@ -96,7 +95,7 @@ async def analyze_practice_document(file: UploadFile = File(...), lang: str = Fo
                 if key == "nombre_practica":
                     found_sections_result[display_name] = {"text": original_text, "feedback": "" if lang == 'es' else ""}
                 else:
-                    analyze_response = ollama.chat(model='llama3.2', messages=[{'role': 'system', 'content': analyze_chunk_prompts["system"]}, {'role': 'user', 'content': analyze_chunk_prompts["user"].format(section_name=display_name, text=original_text)}], format='json')
+                    analyze_response = ai_stack.ollama_chat(operation='analysis', model='llama3.2', messages=[{'role': 'system', 'content': analyze_chunk_prompts["system"]}, {'role': 'user', 'content': analyze_chunk_prompts["user"].format(section_name=display_name, text=original_text)}], format='json')
                     llm_output = json.loads(analyze_response['message']['content'])
                     found_sections_result[display_name] = {"text": llm_output.get("summary", original_text), "feedback": llm_output.get("feedback", "No feedback provided.")}
             else:
@@ -1,29 +1,20 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from src.database import get_db
+from src.core.config import settings
+from src.core import metrics
 from src.auth.security import get_current_teacher
 from src.models.teacher import Teacher
-from src.services import context_builder
+from src.services import context_builder, ai_stack
 from typing import List, Dict, Any, Callable
 from datetime import date
-from langchain_community.vectorstores import FAISS
-from langchain_ollama.embeddings import OllamaEmbeddings
-from langchain_ollama.llms import OllamaLLM
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.documents import Document
-
-from src.services import rag_indexer 
-import subprocess 
 
 router = APIRouter()
 
-# --- Configuration ---
-LLM_MODEL_NAME = "llama3.2"
-OLLAMA_BASE_URL = "http://host.docker.internal:11434"
-VECTOR_STORE_PATH = "/app/vector_store"
-EMBEDDING_MODEL_NAME = "nomic-embed-text" 
+# Model names, the Ollama URL and the vector store path live in src/services/ai_stack.py.
+# langchain, FAISS and Ollama are only imported when the first chat message arrives.
 
 # --- Static School Context ---
 SCHOOL_CONTEXT_EN = """
@@ -70,28 +61,8 @@ def format_history(history: List[Dict[str, Any]]) -> str:
         formatted_lines.append(f"{sender}: {text}")
     return "\n".join(formatted_lines)
 
-# --- Load the Global Vector Store and Embeddings ---
-vector_store = None
-try:
-    print("Attempting to load FAISS vector store...")
-    embeddings = OllamaEmbeddings(
-        model=EMBEDDING_MODEL_NAME,
-        base_url=OLLAMA_BASE_URL
-    )
-    vector_store = FAISS.load_local(
-        VECTOR_STORE_PATH, 
-        embeddings, 
-        allow_dangerous_deserialization=True 
-    )
-    print("FAISS vector store loaded successfully.")
-except Exception as e:
-    print(f"WARNING: Could not load FAISS vector store from '{VECTOR_STORE_PATH}'. The chat assistant will function without retrieval capabilities. Error: {e}")
-
-# --- LLM Chain Initialization ---
-try:
-    llm = OllamaLLM(model=LLM_MODEL_NAME, base_url=OLLAMA_BASE_URL)
-
-    template = """
+# --- LLM Chain ---
+CHAT_PROMPT_TEMPLATE = """
     # CORE DIRECTIVE
     You are "Controly," an AI assistant operating under a strict protocol. Your entire existence and knowledge for this interaction are confined exclusively to the context provided in this prompt. You have no memory of past conversations or external information. Your primary mission is to serve the teacher named "{teacher_name}" by providing meticulously accurate answers derived *only* from the data you are given. Accuracy and strict adherence to the provided text is your prime directive. The user, "{teacher_name}", is your sole focus.
 
@@ -155,9 +126,14 @@ try:
 
     **Controly's Answer:**
     """
-    prompt = ChatPromptTemplate.from_template(template)
 
-    chain = (
+def _build_chain():
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+
+    prompt = ChatPromptTemplate.from_template(CHAT_PROMPT_TEMPLATE)
+
+    return (
         {
             "user_specific_context": lambda x: x["user_specific_context"],
             "retrieved_knowledge": lambda x: x["retrieved_knowledge"],
@@ -167,13 +143,19 @@ try:
             "teacher_name": lambda x: x["teacher_name"] 
         }
         | prompt
-        | llm
+        | ai_stack.get_llm()
         | StrOutputParser()
     )
 
-except Exception as e:
-    print(f"An unexpected error occurred during chain initialization: {e}")
-    chain = None
+def get_chain():
+    """Returns the chat chain, built on first use in this worker, or None if it cannot be built."""
+    try:
+        return ai_stack.cached("chat_chain", _build_chain)
+    except ai_stack.AIFeaturesDisabled:
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred during chain initialization: {e}")
+        return None
 
 # --- API Endpoint ---
 class ChatRequest(BaseModel):
@@ -184,14 +166,15 @@ class ChatRequest(BaseModel):
 
 @router.post("/reindex", status_code=status.HTTP_200_OK, dependencies=[Depends(get_current_teacher)])
 def trigger_ai_reindex():
+    if not settings.AI_FEATURES_ENABLED:
+        raise HTTPException(status_code=503, detail="AI features are disabled on this server.")
     try:
         print("USER ACTION: AI Re-indexing triggered.")
+        from src.services import rag_indexer
         result_message = rag_indexer.build_and_save_index()
         print("USER ACTION: AI Re-indexing finished.")
 
-        print("USER ACTION: Triggering server restart to load new index...")
-        subprocess.run(["touch", "/app/src/main.py"])
-
+        # No restart needed: ai_stack.get_vector_store() reloads the index once its file changes.
         return {"message": result_message}
     except Exception as e:
         print(f"Error during AI re-indexing: {e}")
@@ -206,11 +189,14 @@ async def handle_chat_message(
     db: Session = Depends(get_db),
     current_teacher: Teacher = Depends(get_current_teacher)
 ):
+    # The first call in a worker imports langchain and loads the index; keep that off the event loop.
+    chain = await run_in_threadpool(get_chain)
     if chain is None:
         raise HTTPException(status_code=503, detail="The chat service is not available.")
     try:
         retrieved_docs_str = "No supplementary information was retrieved for this query."
         
+        vector_store = await run_in_threadpool(ai_stack.get_vector_store)
         if vector_store:
             def metadata_filter(metadata: dict) -> bool:
                 if "teacher_id" not in metadata:
@@ -227,7 +213,8 @@ async def handle_chat_message(
             )
             
             print(f"RAG: Retrieving documents for query: '{request.message}' for teacher_id: {current_teacher.teacher_id}")
-            retrieved_docs: List[Document] = user_specific_retriever.invoke(request.message)
+            with metrics.faiss_retrieval_duration_seconds.time():
+                retrieved_docs = await user_specific_retriever.ainvoke(request.message)
             
             formatted_docs = []
             for i, doc in enumerate(retrieved_docs):
@@ -242,7 +229,9 @@ async def handle_chat_message(
             else:
                  print("RAG: No relevant documents found for the user.")
         
-        teacher_context = context_builder.build_teacher_context_string(
+        # The context builder runs many sync ORM queries; keep them off the event loop.
+        teacher_context = await run_in_threadpool(
+            context_builder.build_teacher_context_string,
             db=db, teacher_id=current_teacher.teacher_id, lang=request.lang
         )
 
@@ -258,14 +247,15 @@ async def handle_chat_message(
 
         print(retrieved_docs_str)
 
-        llm_response = chain.invoke({
-            "user_specific_context": user_specific_full_context,
-            "retrieved_knowledge": retrieved_docs_str,
-            "question": request.message,
-            "history": request.history,
-            "current_date": current_date_str,
-            "teacher_name": current_teacher.teacher_name
-        })
+        with metrics.ollama_request_duration_seconds.time(operation="chat"):
+            llm_response = await chain.ainvoke({
+                "user_specific_context": user_specific_full_context,
+                "retrieved_knowledge": retrieved_docs_str,
+                "question": request.message,
+                "history": request.history,
+                "current_date": current_date_str,
+                "teacher_name": current_teacher.teacher_name
+            }, config={"callbacks": [ai_stack.ollama_token_callback("chat")]})
         
         return {"response": llm_response}
     
@@ -1,83 +1,61 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from src.database import get_db
-from src.crud import crud_data, crud_dashboard
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from src.database import get_db, get_async_read_db, get_async_read_sessionmaker
+from src.crud import crud_dashboard
 from src.schemas import dashboard as dashboard_schema
-from src.auth.security import get_current_teacher 
+from src.services import dashboard_summary
+from src.auth.security import get_current_teacher, get_current_teacher_async, get_current_teacher_detached_async
 from src.models.teacher import Teacher
 
 router = APIRouter()
 
 # Note: We are protecting these endpoints. Only a logged-in user can see the dashboard data.
 @router.get("/recent-activities", response_model=List[dashboard_schema.RecentActivity])
-def read_recent_activities(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_recent_activities(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
 ):
     """
     Get the most recent activities in the system. Requires authentication.
     """
-    activities = crud_data.get_recent_activities(db=db, limit=10)
-    return activities
+    return await dashboard_summary.recent_activities(db, current_teacher.teacher_id)
 
 @router.get("/top-subjects", response_model=List[dashboard_schema.TopSubject])
-def read_top_subjects(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_top_subjects(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
 ):
     """
     Get the subjects with the highest number of uploaded practices.
     """
-    top_subjects_data = crud_dashboard.get_top_subjects(
-        db=db, teacher_id=current_teacher.teacher_id, limit=3
-    )
-    
-    return [
-        {"subject_name": item.subject_name, "practice_count": item.practice_count}
-        for item in top_subjects_data
-    ]
+    return await dashboard_summary.top_subjects(db, current_teacher.teacher_id)
 
 @router.get("/activity-log")
-def read_activity_log(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_activity_log(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
 ):
-    return crud_dashboard.get_recent_logs_for_teacher(db, teacher_id=current_teacher.teacher_id)
+    return await dashboard_summary.activity_log(db, current_teacher.teacher_id)
 
 @router.get("/next-practice")
-def read_next_practice(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_next_practice(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
 ):
-    next_practice_data = crud_dashboard.get_next_practice_for_teacher(db, teacher_id=current_teacher.teacher_id)
-
-    if not next_practice_data:
-        return None
-
-    return {
-        "practice_date": next_practice_data.practice_date,
-        "start_time": next_practice_data.start_time,
-        "title": next_practice_data.title,
-        "group_name": next_practice_data.group_name,
-        "practice_id": next_practice_data.practice_id
-    }
+    return await dashboard_summary.next_practice(db, current_teacher.teacher_id)
 
 @router.get("/top-groups", response_model=List[dashboard_schema.TopGroup])
-def read_top_groups(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_top_groups(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
 ):
-    top_groups_data = crud_dashboard.get_top_performing_groups(db, teacher_id=current_teacher.teacher_id)
-
-    return [
-        {"group_name": group.group_name, "completed_sessions": group.completed_sessions}
-        for group in top_groups_data
-    ]
+    return await dashboard_summary.top_groups(db, current_teacher.teacher_id)
 
 @router.get("/announcements", response_model=List[dashboard_schema.Announcement])
-def read_announcements(db: Session = Depends(get_db)):
-    return crud_dashboard.get_announcements(db, limit=1)
+async def read_announcements(db: AsyncSession = Depends(get_async_read_db)):
+    return await dashboard_summary.announcements(db, teacher_id=None)
 
 @router.post("/announcements", response_model=dashboard_schema.Announcement)
 def create_announcement_endpoint(
@@ -91,8 +69,26 @@ def create_announcement_endpoint(
     )
 
 @router.get("/position-stats", response_model=dashboard_schema.PositionStats)
-def read_position_stats(
-    db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher)
+async def read_position_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_teacher: Teacher = Depends(get_current_teacher_async)
+):
+    return await dashboard_summary.position_stats(db, current_teacher.teacher_id)
+
+@router.get("/summary", response_model=dashboard_schema.DashboardSummary)
+async def read_dashboard_summary(
+    sections: Optional[str] = Query(
+        None, description=f"Comma-separated sections to compute (default: all). One of: {', '.join(dashboard_summary.SECTIONS)}."
+    ),
+    session_factory = Depends(get_async_read_sessionmaker),
+    current_teacher: Teacher = Depends(get_current_teacher_detached_async)
 ):
-    return crud_dashboard.get_teacher_position_stats(db, teacher_id=current_teacher.teacher_id)
\ No newline at end of file
+    """
+    All home-page sections in one request, evaluated concurrently. `meta` reports how long
+    each section took.
+    """
+    try:
+        requested = dashboard_summary.parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await dashboard_summary.build_summary(session_factory, current_teacher.teacher_id, requested)
\ No newline at end of file
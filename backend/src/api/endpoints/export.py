@@ -9,7 +9,7 @@ import os
 import re
 from typing import List
 
-from src.database import get_db
+from src.database import get_read_db
 from src.api.endpoints.admin import get_current_admin_user
 from src.crud import crud_export, crud_teacher, crud_room, crud_subject, crud_group
 from src.services import email_service
@@ -45,7 +45,7 @@ def create_csv_response(data: list, headers: list, filename: str) -> StreamingRe
     dependencies=[Depends(get_current_admin_user)],
     summary="Export all completed practice sessions to a CSV file."
 )
-def export_all_completed_practices(db: Session = Depends(get_db)):
+def export_all_completed_practices(db: Session = Depends(get_read_db)):
     """Exports a comprehensive list of all historical practice data."""
     results = crud_export.all_completed(db)
     
@@ -74,7 +74,7 @@ def export_all_completed_practices(db: Session = Depends(get_db)):
 def export_completed_practices_to_csv(
     by: str = Query(..., enum=["teacher", "room", "subject", "group"]),
     id: int = Query(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Exports historical practice data based on a specified filter."""
     today_str = date.today().strftime("%Y%m%d")
@@ -140,7 +140,7 @@ def send_export_email_endpoint(
     request: EmailExportRequest,
     by: str = Query(..., enum=["teacher", "room", "subject", "group", "all"]),
     id: int = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Generates a CSV of historical practice data and emails it to a list of recipients.
@@ -4,6 +4,7 @@ from src.database import get_db
 from src.schemas import onboarding as onboarding_schema
 from src.crud import crud_teacher, crud_subject, crud_group, crud_schedule, crud_room
 from src.models.schedule import Schedule, ScheduleType
+from src.services import schedule_projection
 from datetime import datetime, time
 
 router = APIRouter()
@@ -147,7 +148,8 @@ def onboard_new_teacher(
                         schedule_type=schedule_item.schedule_type
                     )
                     db.add(db_schedule)
-        
+
+        schedule_projection.bump_schedule_version(db, new_teacher.teacher_id)
         db.commit()
     except HTTPException as http_exc:
         db.rollback()
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Literal
 import shutil
 import os
 from datetime import datetime, date, time
@@ -21,6 +21,12 @@ router = APIRouter()
 
 UPLOADS_DIR = "/app/uploads"
 
+def _conflict_detail(conflict: crud_workspace.BookingConflictError, group_message: str) -> str:
+    """Builds the 409 message for an overlap rejected by the booking exclusion constraints."""
+    if conflict.resource == "room":
+        return f"Schedule conflict: Room '{conflict.name}' is no longer available on {conflict.booking_info['practice_date']} at this time."
+    return f"Schedule conflict: Group '{conflict.name}' {group_message}"
+
 @router.get("/subjects/{subject_id}/groups", response_model=List[workspace_schema.GroupForSubject])
 def get_groups_for_subject(
     subject_id: int,
@@ -45,92 +51,189 @@ def check_room_availability(
         db, practice_date=request.practice_date, start_time=request.start_time, end_time=request.end_time
     )
 
-@router.post("/practices", status_code=status.HTTP_201_CREATED)
-def create_practice_and_bookings(
+@router.post("/availability/batch", response_model=List[workspace_schema.SlotAvailability])
+def check_room_availability_batch(
+    request: workspace_schema.RoomAvailabilityBatchRequest,
     db: Session = Depends(get_db),
-    current_teacher: Teacher = Depends(get_current_teacher),
-    name: str = Form(...),
-    objective: str = Form(...),
-    subject_id: int = Form(...),
-    bookings_data: str = Form(...),
-    file: UploadFile = File(...)
+    current_teacher: Teacher = Depends(get_current_teacher)
 ):
+    """
+    Check which rooms are available for several sessions at once (e.g. one per group of a practice).
+    Returns the free rooms of every slot, in the order the slots were sent.
+    """
+    slots = [slot.model_dump() for slot in request.slots]
+    rooms_per_slot = crud_workspace.get_available_rooms_for_slots(db, slots)
+    return [{**slot, "rooms": rooms} for slot, rooms in zip(slots, rooms_per_slot)]
+
+MAX_PRACTICES_PER_REQUEST = 50
+
+def _parse_sessions(raw_sessions: list) -> list:
+    """Turns the sessions sent by the booking form ({group_id, room_id, date, start_time, end_time}) into booking dicts."""
     try:
-        bookings_to_create = json.loads(bookings_data)
-        
-        for booking_info in bookings_to_create:
-            conflict = crud_workspace.check_group_booking_conflict(
-                db=db,
-                group_id=booking_info['group_id'],
-                practice_date=date.fromisoformat(booking_info['date']),
-                start_time=time.fromisoformat(booking_info['start_time']),
-                end_time=time.fromisoformat(booking_info['end_time'])
-            )
-            if conflict:
-                group_name = db.query(Group.group_name).filter(Group.group_id == booking_info['group_id']).scalar()
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Schedule conflict: Group '{group_name}' is already booked on {booking_info['date']} at this time."
-                )
-
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        safe_name = "".join(c if c.isalnum() else "_" for c in name)
-        filename = f"{timestamp}_{current_teacher.teacher_id}_{subject_id}_{safe_name}_{file.filename}"
-        teacher_dir = os.path.join(UPLOADS_DIR, str(current_teacher.teacher_id))
-        os.makedirs(teacher_dir, exist_ok=True)
-        file_path_on_disk = os.path.join(teacher_dir, filename)
-        with open(file_path_on_disk, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        new_practice = Practice(
-            title=name,
-            description=objective,
-            file_url=file_path_on_disk,
-            teacher_id=current_teacher.teacher_id,
-            subject_id=subject_id
-        )
-        db.add(new_practice)
-        db.flush()
-
-        for booking_info in bookings_to_create:
-            new_booking = Booking(
-                practice_id=new_practice.practice_id,
-                group_id=booking_info['group_id'],
-                room_id=booking_info['room_id'],
-                practice_date=date.fromisoformat(booking_info['date']),
-                start_time=time.fromisoformat(booking_info['start_time']),
-                end_time=time.fromisoformat(booking_info['end_time']),
-                status='Scheduled'
+        return [
+            {
+                "group_id": int(booking_info['group_id']),
+                "room_id": int(booking_info['room_id']),
+                "practice_date": date.fromisoformat(booking_info['date']),
+                "start_time": time.fromisoformat(booking_info['start_time']),
+                "end_time": time.fromisoformat(booking_info['end_time'])
+            }
+            for booking_info in raw_sessions
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid session data: {e}")
+
+def _save_practice_file(teacher_id: int, subject_id: int, name: str, file: UploadFile) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    safe_name = "".join(c if c.isalnum() else "_" for c in name)
+    filename = f"{timestamp}_{teacher_id}_{subject_id}_{safe_name}_{file.filename}"
+    teacher_dir = os.path.join(UPLOADS_DIR, str(teacher_id))
+    os.makedirs(teacher_dir, exist_ok=True)
+    file_path_on_disk = os.path.join(teacher_dir, filename)
+    with open(file_path_on_disk, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+    return file_path_on_disk
+
+def _register_practices(db: Session, teacher_id: int, practices_data: list, saved_files: list) -> list[int]:
+    """
+    Registers the practices and commits once, or rolls back and removes `saved_files`.
+    Maps invalid sessions to 400 and booking overlaps to 409.
+    """
+    try:
+        try:
+            practice_ids = crud_workspace.create_practices_with_bookings(db, teacher_id=teacher_id, practices_data=practices_data)
+        except crud_workspace.InvalidSessionError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except crud_workspace.BookingConflictError as conflict:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=_conflict_detail(conflict, f"is already booked on {conflict.booking_info['practice_date']} at this time.")
             )
-            db.add(new_booking)
-
         db.commit()
+        return practice_ids
 
-        crud_dashboard.create_log_entry(db, teacher_id=current_teacher.teacher_id, activity_type=LogType.CREATED, practice_title=name)
-
-        return {"message": "Practice and bookings registered successfully."}
-
-    except HTTPException as http_exc:
+    except HTTPException:
         db.rollback()
-        raise http_exc 
+        _remove_files(saved_files)
+        raise
     except Exception as e:
         db.rollback()
-        if 'file_path_on_disk' in locals() and os.path.exists(file_path_on_disk):
-            os.remove(file_path_on_disk)
+        _remove_files(saved_files)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {str(e)}"
         )
+
+def _remove_files(paths: list):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+@router.post("/practices", status_code=status.HTTP_201_CREATED)
+def create_practice_and_bookings(
+    db: Session = Depends(get_db),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    name: str = Form(...),
+    objective: str = Form(...),
+    subject_id: int = Form(...),
+    bookings_data: str = Form(...),
+    file: UploadFile = File(...)
+):
+    try:
+        bookings_to_create = _parse_sessions(json.loads(bookings_data))
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid bookings_data: {e}")
+
+    file_path_on_disk = _save_practice_file(current_teacher.teacher_id, subject_id, name, file)
+    _register_practices(db, current_teacher.teacher_id, [{
+        "title": name,
+        "description": objective,
+        "file_url": file_path_on_disk,
+        "subject_id": subject_id,
+        "bookings": bookings_to_create,
+    }], [file_path_on_disk])
+
+    return {"message": "Practice and bookings registered successfully."}
+
+@router.post("/practices/bulk", status_code=status.HTTP_201_CREATED)
+def create_practices_in_bulk(
+    db: Session = Depends(get_db),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    practices_data: str = Form(..., description='JSON list of {"name", "objective", "subject_id", "bookings": [...]}, one per file'),
+    files: List[UploadFile] = File(...)
+):
+    """
+    Registers several practices (e.g. a semester plan) in one request and one transaction:
+    either every practice and session is created or none is.
+    `files[i]` is the document of the i-th practice in `practices_data`.
+    """
+    try:
+        items = json.loads(practices_data)
+        if not isinstance(items, list):
+            raise ValueError("expected a list")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid practices_data: {e}")
+    if not 1 <= len(items) <= MAX_PRACTICES_PER_REQUEST:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Send between 1 and {MAX_PRACTICES_PER_REQUEST} practices.")
+    if len(items) != len(files):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Send exactly one file per practice.")
+
+    try:
+        parsed = [
+            {
+                "title": item["name"],
+                "description": item["objective"],
+                "subject_id": int(item["subject_id"]),
+                "bookings": _parse_sessions(item["bookings"]),
+            }
+            for item in items
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid practices_data: {e}")
+
+    saved_files = []
+    try:
+        for item, file in zip(parsed, files):
+            item["file_url"] = _save_practice_file(current_teacher.teacher_id, item["subject_id"], item["title"], file)
+            saved_files.append(item["file_url"])
+    except Exception:
+        _remove_files(saved_files)
+        raise
+
+    practice_ids = _register_practices(db, current_teacher.teacher_id, parsed, saved_files)
+    return {"message": f"{len(practice_ids)} practices registered successfully.", "practice_ids": practice_ids}
     
 @router.get("/practices", response_model=List[workspace_schema.PracticeListItem])
 def get_teacher_practices(
+    response: Response,
+    subject_id: Optional[int] = Query(None, description="Only practices of this subject"),
+    session_status: Optional[Literal["upcoming", "past"]] = Query(None, alias="status", description="'upcoming': last session not finished yet; 'past': all sessions finished"),
+    search: Optional[str] = Query(None, max_length=100, description="Case-insensitive match on title or subject name"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to get every practice"),
+    cursor: Optional[str] = Query(None, description="Value of the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_teacher: Teacher = Depends(get_current_teacher)
 ):
     """
-    Get a list of all practices registered by the logged-in teacher.
+    Get a list of all practices registered by the logged-in teacher, newest first.
+    With `limit`, results are paginated: the X-Next-Cursor response header holds the
+    cursor for the next page and is absent on the last one.
     """
-    return crud_workspace.get_practices_for_teacher(db, teacher_id=current_teacher.teacher_id)
+    if limit is None:
+        return crud_workspace.get_practices_for_teacher(
+            db, teacher_id=current_teacher.teacher_id, subject_id=subject_id, status=session_status, search=search
+        )
+
+    try:
+        items, next_cursor = crud_workspace.get_practice_page_for_teacher(
+            db, teacher_id=current_teacher.teacher_id, limit=limit, cursor=cursor,
+            subject_id=subject_id, status=session_status, search=search
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.get("/practices/{practice_id}/download")
@@ -203,6 +306,11 @@ def update_practice(
 
     try:
         update_data: workspace_schema.PracticeUpdate = workspace_schema.PracticeUpdate.parse_raw(update_data_str)
+        requested_bookings = [b.model_dump() for b in update_data.bookings]
+        try:
+            crud_workspace.validate_session_times(requested_bookings)
+        except crud_workspace.InvalidSessionError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         if file:
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -223,35 +331,19 @@ def update_practice(
 
         crud_workspace.delete_future_bookings_for_practice(db, practice_id=practice_id)
 
-        for booking_info in update_data.bookings:
-            conflict = crud_workspace.check_group_booking_conflict(
-                db=db,
-                group_id=booking_info.group_id,
-                practice_date=booking_info.practice_date,
-                start_time=booking_info.start_time,
-                end_time=booking_info.end_time
-            )
-            if conflict and conflict.practice_id != practice_id:
-                group_name = db.query(Group.group_name).filter(Group.group_id == booking_info.group_id).scalar()
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Schedule conflict: Group '{group_name}' is already booked for another practice at this time."
-                )
-
-            new_booking = Booking(
-                practice_id=practice_id,
-                group_id=booking_info.group_id,
-                room_id=booking_info.room_id,
-                practice_date=booking_info.practice_date,
-                start_time=booking_info.start_time,
-                end_time=booking_info.end_time,
-                status='Scheduled'
+        bookings_to_create = crud_workspace.filter_retained_bookings(
+            db, practice_id=practice_id, bookings_data=requested_bookings
+        )
+        try:
+            crud_workspace.create_bookings(db, practice_id=practice_id, bookings_data=bookings_to_create)
+        except crud_workspace.BookingConflictError as conflict:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=_conflict_detail(conflict, "is already booked for another practice at this time.")
             )
-            db.add(new_booking)
-
-        db.commit()
 
         crud_dashboard.create_log_entry(db, teacher_id=current_teacher.teacher_id, activity_type=LogType.EDITED, practice_title=original_title)
+        db.commit()
 
         if file and old_file_path and os.path.exists(old_file_path):
             os.remove(old_file_path)
@@ -284,9 +376,8 @@ def delete_practice(
 
     try:
         db.delete(db_practice)
-        db.commit()
-
         crud_dashboard.create_log_entry(db, teacher_id=current_teacher.teacher_id, activity_type=LogType.DELETED, practice_title=practice_title_to_log)
+        db.commit()
 
     except Exception as e:
         db.rollback()
@@ -1,12 +1,12 @@
-from http.client import HTTPException
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from src.database import get_db
 from src.auth.security import get_current_teacher
 from src.models.teacher import Teacher
 from src.crud import crud_workspace
+from src.services import schedule_projection
 from src.schemas import subject as subject_schema, group as group_schema, workspace as workspace_schema
 
 router = APIRouter()
@@ -33,13 +33,32 @@ def get_teacher_groups(
 
 @router.get("/monthly-progress", response_model=List[workspace_schema.MonthlyProgress])
 def get_monthly_progress(
+    year: Optional[int] = Query(None, ge=1, le=9999),
+    month: Optional[int] = Query(None, ge=1, le=12),
     db: Session = Depends(get_db),
     current_teacher: Teacher = Depends(get_current_teacher)
 ):
     """
     Gets the monthly practice progress (completed vs. goal) for each of the teacher's subjects.
+    Defaults to the current month.
     """
-    return crud_workspace.get_monthly_practice_progress(db, teacher_id=current_teacher.teacher_id)
+    return crud_workspace.get_monthly_practice_progress(db, teacher_id=current_teacher.teacher_id, year=year, month=month)
+
+@router.get("/monthly-progress/range", response_model=List[workspace_schema.MonthlyProgressSeriesItem])
+def get_monthly_progress_range(
+    start: str = Query(..., description="First month, YYYY-MM"),
+    end: str = Query(..., description="Last month (inclusive), YYYY-MM"),
+    db: Session = Depends(get_db),
+    current_teacher: Teacher = Depends(get_current_teacher)
+):
+    """
+    Gets the monthly practice progress for every month from `start` to `end`.
+    """
+    try:
+        start_month, end_month = crud_workspace.parse_month_span(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return crud_workspace.get_practice_progress_series(db, current_teacher.teacher_id, start_month, end_month)
 
 @router.get("/subjects/{subject_id}", response_model=workspace_schema.SubjectDetail)
 def get_subject_details(
@@ -75,10 +94,20 @@ def get_group_details(
 
 @router.get("/schedule", response_model=workspace_schema.WeeklySchedule)
 def get_teacher_schedule(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_teacher: Teacher = Depends(get_current_teacher)
 ):
     """
     Get the complete weekly schedule for the logged-in teacher, organized by day.
+    Sends an ETag tied to the teacher's schedule version and answers 304 to a matching If-None-Match.
     """
-    return crud_workspace.get_teacher_weekly_schedule(db, teacher_id=current_teacher.teacher_id)
\ No newline at end of file
+    version = current_teacher.schedule_version
+    etag = schedule_projection.schedule_etag(current_teacher.teacher_id, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return schedule_projection.get_schedule_projection(db, current_teacher.teacher_id, version=version).weekly
\ No newline at end of file
@@ -1,12 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from src.crud import crud_teacher 
 from src.core.config import settings
-from src.database import get_db
+from src.database import get_db, get_async_db, AsyncSessionLocal
 from src.models.teacher import Teacher
 
 
@@ -43,6 +44,25 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 
 
 # --- User Dependency ---
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _email_from_token(token: str) -> str:
+    """Validates the token's signature and expiration and returns its subject (the user's email)."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        # The "subject" of the token is the user's email
+        email: str = payload.get("sub")
+        if email is None:
+            raise _credentials_exception()
+    except JWTError:
+        raise _credentials_exception()
+    return email
+
 def get_current_teacher(
     token: str = Depends(oauth2_scheme), 
     db: Session = Depends(get_db)
@@ -57,22 +77,39 @@ def get_current_teacher(
     4. Fetch the user from the database.
     5. Return the user object or raise a 401 Unauthorized error.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        # The "subject" of the token is the user's email
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    email = _email_from_token(token)
     
     # Fetch the teacher from the database using the email from the token
     teacher = crud_teacher.get_teacher_by_email(db, email=email)
     if teacher is None:
-        raise credentials_exception
-    return teacher
\ No newline at end of file
+        raise _credentials_exception()
+    return teacher
+
+async def get_current_teacher_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Teacher:
+    """
+    Same as get_current_teacher, but looks the teacher up through the async session.
+    Use it in `async def` endpoints so authentication does not need a threadpool worker.
+    """
+    email = _email_from_token(token)
+
+    teacher = await crud_teacher.get_teacher_by_email_async(db, email=email)
+    if teacher is None:
+        raise _credentials_exception()
+    return teacher
+
+async def get_current_teacher_detached_async(token: str = Depends(oauth2_scheme)) -> Teacher:
+    """
+    Same as get_current_teacher_async, but the lookup runs on its own session, which is
+    closed before the endpoint runs. Use it in endpoints that open sessions of their own
+    (e.g. /dashboard/summary), so the request does not hold an extra pooled connection.
+    """
+    email = _email_from_token(token)
+
+    async with AsyncSessionLocal() as db:
+        teacher = await crud_teacher.get_teacher_by_email_async(db, email=email)
+    if teacher is None:
+        raise _credentials_exception()
+    return teacher
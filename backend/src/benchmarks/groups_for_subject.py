@@ -0,0 +1,112 @@
+"""
+Benchmark for crud_workspace.get_groups_for_subject_by_teacher at 50+ groups.
+
+Seeds the synthetic dataset into a SCRATCH database, gives one teacher a subject
+taught to many groups, and compares the previous per-group implementation
+(kept below as `legacy_groups_for_subject`) with the single joined query:
+
+    python -m src.benchmarks.groups_for_subject --database-url postgresql://lab_user:...@db/lab_bench --groups 80
+
+Every table in the target database is dropped and recreated.
+"""
+import argparse
+from sqlalchemy import create_engine, distinct, insert, text
+from sqlalchemy.orm import Session, sessionmaker
+from src.core import query_stats
+from src.crud import crud_workspace
+from src.models import group, schedule, subject
+from src.benchmarks import synthetic
+from src.benchmarks.runner import median_ms, print_table
+
+
+def legacy_groups_for_subject(db: Session, teacher_id: int, subject_id: int):
+    """The implementation replaced in favour of the joined query: one schedules query per group."""
+    group_ids = [g_id for g_id, in db.query(distinct(schedule.Schedule.group_id)).filter(
+        schedule.Schedule.teacher_id == teacher_id,
+        schedule.Schedule.subject_id == subject_id
+    ).all()]
+    groups_list = db.query(group.Group).filter(group.Group.group_id.in_(group_ids)).all()
+    result = []
+    for g in groups_list:
+        schedules = db.query(schedule.Schedule).filter(
+            schedule.Schedule.teacher_id == teacher_id,
+            schedule.Schedule.subject_id == subject_id,
+            schedule.Schedule.group_id == g.group_id
+        ).all()
+        result.append({"group_id": g.group_id, "group_name": g.group_name, "schedules": schedules})
+    return result
+
+
+def add_wide_subject(db: Session, teacher_id: int, subject_id: int, groups: int) -> None:
+    """Schedules `subject_id` for the teacher in the first `groups` groups (one CLASS and one PRACTICE slot each)."""
+    rows = []
+    for group_id in range(1, groups + 1):
+        class_start, class_end = synthetic.PRACTICE_SLOTS[group_id % len(synthetic.PRACTICE_SLOTS)]
+        rows.append({
+            "teacher_id": teacher_id, "subject_id": subject_id, "group_id": group_id,
+            "day_of_week": 1 + group_id % 5, "start_time": class_start, "end_time": class_end,
+            "schedule_type": schedule.ScheduleType.CLASS,
+        })
+        rows.append({
+            "teacher_id": teacher_id, "subject_id": subject_id, "group_id": group_id,
+            "day_of_week": 1 + (group_id + 2) % 5, "start_time": class_start, "end_time": class_end,
+            "schedule_type": schedule.ScheduleType.PRACTICE,
+        })
+    db.execute(insert(schedule.Schedule), rows)
+    db.commit()
+
+
+def count_queries(fn) -> int:
+    """Number of SQL statements `fn` executes."""
+    stats, token = query_stats.start_request()
+    try:
+        fn()
+    finally:
+        query_stats.end_request(token)
+    return stats.count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="Scratch database; all of its tables are dropped.")
+    parser.add_argument("--groups", type=int, default=60, help="Groups the benchmarked subject is taught to.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    print("Seeding synthetic dataset...")
+    synthetic.reset_schema(engine)
+    db = session_factory()
+    try:
+        sample = synthetic.seed(db, semesters=1, groups=max(args.groups, 80))
+        teacher_id, subject_id = sample["sample_teacher_id"], sample["subjects"] + 1
+        db.execute(insert(subject.Subject), [{"subject_id": subject_id, "subject_name": "Benchmark subject"}])
+        add_wide_subject(db, teacher_id, subject_id, args.groups)
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    cases = {
+        "legacy (query per group)": legacy_groups_for_subject,
+        "joined query": crud_workspace.get_groups_for_subject_by_teacher,
+    }
+    rows = []
+    for label, fn in cases.items():
+        db = session_factory()
+        try:
+            run = lambda: (fn(db, teacher_id=teacher_id, subject_id=subject_id), db.expunge_all())
+            queries = count_queries(run)
+            rows.append([label, args.groups, queries, median_ms(run, repeat=args.repeat)])
+        finally:
+            db.close()
+
+    print()
+    print_table(["implementation", "groups", "queries", "median (ms)"], rows)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
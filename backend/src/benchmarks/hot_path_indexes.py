@@ -0,0 +1,115 @@
+"""
+Before/after benchmark for the hot-path indexes added in migration 0001.
+
+Seeds a synthetic dataset into a SCRATCH database, times the hottest crud
+functions without the secondary indexes, creates them, and times them again:
+
+    python -m src.benchmarks.hot_path_indexes --database-url postgresql://lab_user:...@db/lab_bench
+
+Every table in the target database is dropped and recreated.
+"""
+import argparse
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.core.config import settings
+from src.database import Base
+from src.crud import crud_workspace, crud_room, crud_dashboard, crud_activity
+from src.benchmarks import synthetic
+from src.benchmarks.runner import median_ms, print_table
+
+INDEXED_TABLES = ["bookings", "schedules", "practices", "activity_logs", "announcements"]
+
+
+def hot_path_indexes():
+    """Returns the secondary indexes declared on the hot tables (primary key indexes excluded)."""
+    return [
+        index
+        for table_name in INDEXED_TABLES
+        for index in Base.metadata.tables[table_name].indexes
+        if not all(column.primary_key for column in index.columns)
+    ]
+
+
+def benchmark_cases(sample: dict) -> dict:
+    """Maps a label to a callable that runs one hot query against a session."""
+    return {
+        "get_available_rooms": lambda db: crud_workspace.get_available_rooms(
+            db, practice_date=sample["sample_date"],
+            start_time=sample["sample_start_time"], end_time=sample["sample_end_time"]
+        ),
+        "get_bookings_for_room_on_date": lambda db: crud_room.get_bookings_for_room_on_date(
+            db, room_id=sample["sample_room_id"], target_date=sample["sample_date"]
+        ),
+        "get_next_practice_for_teacher": lambda db: crud_dashboard.get_next_practice_for_teacher(
+            db, teacher_id=sample["sample_teacher_id"]
+        ),
+        "get_recent_logs_for_teacher": lambda db: crud_dashboard.get_recent_logs_for_teacher(
+            db, teacher_id=sample["sample_teacher_id"]
+        ),
+        "get_announcements": lambda db: crud_dashboard.get_announcements(db, limit=20),
+        "get_monthly_bookings_for_teacher": lambda db: crud_activity.get_monthly_bookings_for_teacher(
+            db, teacher_id=sample["sample_teacher_id"],
+            year=sample["sample_date"].year, month=sample["sample_date"].month
+        ),
+        "get_teacher_weekly_schedule": lambda db: crud_workspace.get_teacher_weekly_schedule(
+            db, teacher_id=sample["sample_teacher_id"]
+        ),
+    }
+
+
+def run_cases(session_factory, cases: dict, repeat: int) -> dict:
+    db = session_factory()
+    try:
+        return {label: median_ms(lambda: fn(db), repeat=repeat) for label, fn in cases.items()}
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="Scratch database; all of its tables are dropped.")
+    parser.add_argument("--semesters", type=int, default=10)
+    parser.add_argument("--teachers", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    # Measure the SQL paths these indexes serve, not the in-process occupancy index.
+    settings.OCCUPANCY_INDEX_ENABLED = False
+
+    engine = create_engine(args.database_url)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    print("Seeding synthetic dataset...")
+    synthetic.reset_schema(engine)
+    db = session_factory()
+    try:
+        sample = synthetic.seed(db, teachers=args.teachers, semesters=args.semesters)
+    finally:
+        db.close()
+    print(f"Seeded {sample['bookings']} bookings, {sample['practices']} practices, {sample['schedules']} schedules.")
+
+    indexes = hot_path_indexes()
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+    cases = benchmark_cases(sample)
+    before = run_cases(session_factory, cases, args.repeat)
+
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+    after = run_cases(session_factory, cases, args.repeat)
+
+    print()
+    print_table(
+        ["query", "before (ms)", "after (ms)", "speedup"],
+        [[label, before[label], after[label], f"{before[label] / max(after[label], 1e-6):.1f}x"] for label in cases],
+    )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for crud_dashboard.get_teacher_position_stats, the home-page leaderboard.
+
+Seeds the synthetic dataset into a SCRATCH database and compares the previous
+seven-query implementation (kept below as `legacy_position_stats`) with the single
+RANK()/FILTER statement, checking that both return the same figures:
+
+    python -m src.benchmarks.position_stats --database-url postgresql://lab_user:...@db/lab_bench --semesters 10
+
+Every table in the target database is dropped and recreated.
+"""
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from src.crud import crud_dashboard
+from src.models import booking, practice
+from src.benchmarks import synthetic
+from src.benchmarks.groups_for_subject import count_queries
+from src.benchmarks.runner import median_ms, print_table
+
+
+def legacy_position_stats(db: Session, teacher_id: int):
+    """The implementation replaced by the single statement: seven queries."""
+    completed_counts_sq = select(
+        practice.Practice.teacher_id,
+        func.count(booking.Booking.booking_id).label("completed_count")
+    ).join(
+        practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+    ).where(
+        booking.Booking.ends_at < func.now()
+    ).group_by(practice.Practice.teacher_id).subquery()
+
+    my_completed_sessions = db.execute(select(completed_counts_sq.c.completed_count).where(
+        completed_counts_sq.c.teacher_id == teacher_id
+    )).scalar() or 0
+    total_completed_sessions = db.execute(select(func.sum(completed_counts_sq.c.completed_count))).scalar() or 0
+    higher_ranked_teachers = db.execute(select(func.count(completed_counts_sq.c.teacher_id)).where(
+        completed_counts_sq.c.completed_count > my_completed_sessions
+    )).scalar()
+
+    now = datetime.utcnow()
+    start_of_week = now.date() - timedelta(days=now.weekday())
+    start_of_month = now.date().replace(day=1)
+
+    def completed_since(start_date, teacher_only: bool):
+        statement = select(func.count(booking.Booking.booking_id)).where(
+            booking.Booking.practice_date >= start_date,
+            booking.Booking.ends_at < func.now()
+        )
+        if teacher_only:
+            statement = statement.join(
+                practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+            ).where(practice.Practice.teacher_id == teacher_id)
+        return db.execute(statement).scalar()
+
+    return {
+        "my_completed_sessions": my_completed_sessions,
+        "total_completed_sessions": total_completed_sessions,
+        "rank": (higher_ranked_teachers or 0) + 1,
+        "my_weekly_sessions": completed_since(start_of_week, True),
+        "total_weekly_sessions": completed_since(start_of_week, False),
+        "my_monthly_sessions": completed_since(start_of_month, True),
+        "total_monthly_sessions": completed_since(start_of_month, False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="Scratch database; all of its tables are dropped.")
+    parser.add_argument("--semesters", type=int, default=10, help="Semesters of synthetic bookings to seed.")
+    parser.add_argument("--teachers", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    print("Seeding synthetic dataset...")
+    synthetic.reset_schema(engine)
+    db = session_factory()
+    try:
+        sample = synthetic.seed(db, teachers=args.teachers, semesters=args.semesters)
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    teacher_id = sample["sample_teacher_id"]
+
+    cases = {
+        "legacy (seven queries)": legacy_position_stats,
+        "RANK() + FILTER": crud_dashboard.get_teacher_position_stats,
+    }
+    rows, results = [], {}
+    for label, fn in cases.items():
+        db = session_factory()
+        try:
+            run = lambda: fn(db, teacher_id=teacher_id)
+            results[label] = run()
+            queries = count_queries(run)
+            rows.append([label, sample["bookings"], queries, median_ms(run, repeat=args.repeat)])
+        finally:
+            db.close()
+
+    print()
+    print_table(["implementation", "bookings", "queries", "median (ms)"], rows)
+    print()
+    # The legacy weekly/monthly windows start at UTC midnight, the new ones at local
+    # midnight, so those four figures may differ slightly around the boundaries.
+    for key in results["RANK() + FILTER"]:
+        print(f"{key}: " + ", ".join(f"{label}={values[key]}" for label, values in results.items()))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
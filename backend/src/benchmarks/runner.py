@@ -0,0 +1,28 @@
+"""
+Small timing helpers shared by the benchmark scripts.
+"""
+import statistics
+import time
+from typing import Callable
+
+
+def median_ms(fn: Callable[[], object], repeat: int = 20, warmup: int = 2) -> float:
+    """Runs `fn` `warmup + repeat` times and returns the median wall time in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def print_table(headers: list[str], rows: list[list]) -> None:
+    """Prints rows as a plain, left-aligned text table."""
+    cells = [headers] + [[f"{c:.2f}" if isinstance(c, float) else str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
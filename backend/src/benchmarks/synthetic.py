@@ -0,0 +1,171 @@
+"""
+Synthetic dataset used by the benchmark scripts in this package.
+
+The generator builds a few semesters of realistic, conflict-free bookings:
+every teacher teaches a handful of (subject, group) pairs, each pair has one
+weekly PRACTICE slot, and every week a practice is registered with one lab
+session per group. NEVER point it at a real database: `reset_schema` drops
+every table before seeding.
+"""
+import random
+from datetime import date, time, timedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from src.database import Base
+from src.models import (
+    teacher, subject, group, room, schedule, practice, booking, activity_log, announcement, session_stats
+)
+
+# Practice slots used for the weekly PRACTICE schedules, as (start, end) pairs.
+PRACTICE_SLOTS = [
+    (time(7, 0), time(8, 30)),
+    (time(8, 30), time(10, 0)),
+    (time(10, 30), time(12, 0)),
+    (time(12, 0), time(13, 30)),
+    (time(14, 0), time(15, 30)),
+    (time(15, 30), time(17, 0)),
+    (time(17, 0), time(18, 30)),
+]
+WEEKS_PER_SEMESTER = 18
+CHUNK_SIZE = 5000
+
+
+def reset_schema(engine) -> None:
+    """Drops and recreates every table defined by the models."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _insert_chunked(db: Session, table, rows: list[dict]) -> None:
+    for i in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(table), rows[i:i + CHUNK_SIZE])
+
+
+def seed(
+    db: Session,
+    teachers: int = 60,
+    subjects: int = 40,
+    groups: int = 80,
+    rooms: int = 6,
+    pairs_per_teacher: int = 4,
+    semesters: int = 10,
+    random_seed: int = 42,
+) -> dict:
+    """
+    Fills an empty schema with synthetic data and returns the generated row counts
+    together with a few sample ids that the benchmarks can query with.
+    """
+    rng = random.Random(random_seed)
+
+    _insert_chunked(db, room.Room, [
+        {"room_id": i, "room_name": f"Room {i}", "capacity": 25} for i in range(1, rooms + 1)
+    ])
+    _insert_chunked(db, subject.Subject, [
+        {"subject_id": i, "subject_name": f"Subject {i:03d}"} for i in range(1, subjects + 1)
+    ])
+    _insert_chunked(db, group.Group, [
+        {"group_id": i, "group_name": f"{1 + i % 9}CM{i:03d}"} for i in range(1, groups + 1)
+    ])
+    _insert_chunked(db, teacher.Teacher, [
+        {
+            "teacher_id": i,
+            "teacher_name": f"Teacher {i:03d}",
+            "email": f"teacher{i:03d}@example.com",
+            "password_hash": "not-a-real-hash",
+            "role": teacher.UserRole.teacher,
+        }
+        for i in range(1, teachers + 1)
+    ])
+
+    # Weekly schedules: one CLASS and one PRACTICE entry per (teacher, subject, group).
+    schedule_rows = []
+    practice_slots = []  # (teacher_id, subject_id, group_id, day_of_week, start, end)
+    for teacher_id in range(1, teachers + 1):
+        for _ in range(pairs_per_teacher):
+            subject_id = rng.randint(1, subjects)
+            group_id = rng.randint(1, groups)
+            class_day, practice_day = rng.sample(range(1, 6), 2)
+            class_start, class_end = rng.choice(PRACTICE_SLOTS)
+            practice_start, practice_end = rng.choice(PRACTICE_SLOTS)
+            schedule_rows.append({
+                "teacher_id": teacher_id, "subject_id": subject_id, "group_id": group_id,
+                "day_of_week": class_day, "start_time": class_start, "end_time": class_end,
+                "schedule_type": schedule.ScheduleType.CLASS,
+            })
+            schedule_rows.append({
+                "teacher_id": teacher_id, "subject_id": subject_id, "group_id": group_id,
+                "day_of_week": practice_day, "start_time": practice_start, "end_time": practice_end,
+                "schedule_type": schedule.ScheduleType.PRACTICE,
+            })
+            practice_slots.append((teacher_id, subject_id, group_id, practice_day, practice_start, practice_end))
+    _insert_chunked(db, schedule.Schedule, schedule_rows)
+
+    # One practice per (teacher, subject) per week, booked for each of its groups.
+    today = date.today()
+    total_weeks = semesters * WEEKS_PER_SEMESTER
+    first_monday = today - timedelta(days=today.weekday()) - timedelta(weeks=total_weeks - 4)
+
+    slots_by_teacher_subject = {}
+    for teacher_id, subject_id, group_id, day, start, end in practice_slots:
+        slots_by_teacher_subject.setdefault((teacher_id, subject_id), []).append((group_id, day, start, end))
+
+    practice_rows, booking_rows, log_rows = [], [], []
+    busy_rooms, busy_groups = set(), set()
+    practice_id = 0
+    for week in range(total_weeks):
+        monday = first_monday + timedelta(weeks=week)
+        for (teacher_id, subject_id), slots in slots_by_teacher_subject.items():
+            practice_id += 1
+            title = f"Practice {week + 1} - Subject {subject_id:03d}"
+            practice_rows.append({
+                "practice_id": practice_id, "title": title, "description": "Synthetic practice",
+                "file_url": f"/app/uploads/{teacher_id}/synthetic_{practice_id}.pdf",
+                "teacher_id": teacher_id, "subject_id": subject_id,
+            })
+            log_rows.append({
+                "teacher_id": teacher_id, "activity_type": activity_log.LogType.CREATED,
+                "practice_title": title,
+            })
+            for group_id, day, start, end in slots:
+                practice_date = monday + timedelta(days=day - 1)
+                if (group_id, practice_date, start) in busy_groups:
+                    continue
+                free_rooms = [r for r in range(1, rooms + 1) if (r, practice_date, start) not in busy_rooms]
+                if not free_rooms:
+                    continue
+                room_id = rng.choice(free_rooms)
+                busy_rooms.add((room_id, practice_date, start))
+                busy_groups.add((group_id, practice_date, start))
+                booking_rows.append({
+                    "practice_id": practice_id, "group_id": group_id, "room_id": room_id,
+                    "practice_date": practice_date, "start_time": start, "end_time": end,
+                    "status": "Scheduled",
+                })
+
+    _insert_chunked(db, practice.Practice, practice_rows)
+    booking_rows.sort(key=lambda b: (b["practice_date"], b["start_time"]))
+    _insert_chunked(db, booking.Booking, booking_rows)
+    _insert_chunked(db, activity_log.ActivityLog, log_rows)
+    _insert_chunked(db, announcement.Announcement, [
+        {"teacher_id": rng.randint(1, teachers), "description": f"Synthetic announcement {i}"}
+        for i in range(teachers * 5)
+    ])
+    db.commit()
+
+    sample_booking = booking_rows[len(booking_rows) // 2]
+    return {
+        "rooms": rooms,
+        "subjects": subjects,
+        "groups": groups,
+        "teachers": teachers,
+        "schedules": len(schedule_rows),
+        "practices": len(practice_rows),
+        "bookings": len(booking_rows),
+        "sample_teacher_id": practice_slots[0][0],
+        "sample_subject_id": practice_slots[0][1],
+        "sample_group_id": sample_booking["group_id"],
+        "sample_room_id": sample_booking["room_id"],
+        "sample_date": sample_booking["practice_date"],
+        "sample_start_time": sample_booking["start_time"],
+        "sample_end_time": sample_booking["end_time"],
+    }
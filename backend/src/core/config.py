@@ -8,6 +8,82 @@ class Settings:
     Application settings loaded from environment variables.
     """
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+
+    # --- Database Connection Pool ---
+    # Applied to both the sync (psycopg2) and the async (asyncpg) engine, so the worst
+    # case per worker is twice DB_POOL_SIZE + DB_MAX_OVERFLOW connections. Size them for
+    # /dashboard/summary too (see DASHBOARD_SUMMARY_MAX_CONNECTIONS).
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    # Seconds a request waits for a free connection before failing.
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    # Connections older than this many seconds are replaced on checkout (-1 disables).
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # Server-side statement_timeout set on every new connection, in ms (0 disables).
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    # --- SQL Instrumentation ---
+    # Count statements and DB time per request (X-DB-Queries / Server-Timing headers and a log line).
+    SQL_INSTRUMENTATION_ENABLED: bool = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() in ("1", "true", "yes")
+    # A statement shape repeated this many times in one request is reported as a likely N+1 (0 disables).
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 10))
+    # Raise NPlusOneDetected instead of only logging, so a test run fails on the offending query.
+    SQL_N_PLUS_ONE_RAISE: bool = os.getenv("SQL_N_PLUS_ONE_RAISE", "false").lower() in ("1", "true", "yes")
+
+    # --- Occupancy Index ---
+    # Answer room availability checks from an in-process index of the bookings
+    # (services/booking_service.py) instead of querying every time. Another worker's
+    # bookings can take up to OCCUPANCY_INDEX_TTL_SECONDS to show up; the exclusion
+    # constraints still reject any real overlap when a session is written.
+    OCCUPANCY_INDEX_ENABLED: bool = os.getenv("OCCUPANCY_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+    # A cached date is reloaded after this many seconds, bounding staleness across workers.
+    OCCUPANCY_INDEX_TTL_SECONDS: float = float(os.getenv("OCCUPANCY_INDEX_TTL_SECONDS", 30))
+
+    # --- Dashboard Session Stats ---
+    # Seconds between sweeps that fold newly completed sessions into the leaderboard
+    # counters (services/session_stats.py). 0 disables the in-process sweeper, e.g. when
+    # `python -m src.manage sweep-session-stats` runs from cron instead.
+    SESSION_STATS_SWEEP_SECONDS: float = float(os.getenv("SESSION_STATS_SWEEP_SECONDS", 300))
+
+    # --- Dashboard Summary ---
+    # Sections of one /dashboard/summary request that may hold a pooled connection at once.
+    # Each request takes up to this many async connections (from the replica pool when one
+    # is configured), so concurrent home-page loads x this value should stay within
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    DASHBOARD_SUMMARY_MAX_CONNECTIONS: int = int(os.getenv("DASHBOARD_SUMMARY_MAX_CONNECTIONS", 2))
+
+    # --- Dashboard Cache ---
+    # Keep dashboard sections per teacher until a write or the next session start/end
+    # changes them (services/dashboard_cache.py). Workers invalidate each other via LISTEN/NOTIFY.
+    DASHBOARD_CACHE_ENABLED: bool = os.getenv("DASHBOARD_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    DASHBOARD_CACHE_MAX_ENTRIES: int = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", 5000))
+
+    # --- Activity Log ---
+    # Log entries are written in the caller's transaction. Set this above 0 to buffer them in
+    # process instead and insert them in batches this often (services/activity_log_buffer.py);
+    # buffered entries are lost if the process dies before a flush.
+    ACTIVITY_LOG_BUFFER_SECONDS: float = float(os.getenv("ACTIVITY_LOG_BUFFER_SECONDS", 0))
+    # The buffer is also flushed as soon as it holds this many entries.
+    ACTIVITY_LOG_BUFFER_MAX_ENTRIES: int = int(os.getenv("ACTIVITY_LOG_BUFFER_MAX_ENTRIES", 500))
+    # activity_logs is partitioned by month (services/activity_log_partitions.py). `manage migrate`
+    # and `manage log-partitions` keep this many months created ahead of the current one.
+    ACTIVITY_LOG_PARTITIONS_AHEAD: int = int(os.getenv("ACTIVITY_LOG_PARTITIONS_AHEAD", 3))
+    # `manage archive-logs` keeps this many months (including the current one) and moves older
+    # partitions to gzip-compressed CSV files in ACTIVITY_LOG_ARCHIVE_DIR.
+    ACTIVITY_LOG_RETENTION_MONTHS: int = int(os.getenv("ACTIVITY_LOG_RETENTION_MONTHS", 12))
+    ACTIVITY_LOG_ARCHIVE_DIR: str = os.getenv("ACTIVITY_LOG_ARCHIVE_DIR", "/app/archive/activity_logs")
+
+    # --- Metrics ---
+    # Prometheus text endpoint at /metrics (unauthenticated; meant for local scraping).
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # --- Read Replica ---
+    # Optional streaming replica for read-only endpoints. Unset means every read uses DATABASE_URL.
+    DATABASE_REPLICA_URL: str | None = os.getenv("DATABASE_REPLICA_URL") or None
+    # After a successful write, a client's reads stay on the primary for this many seconds,
+    # so it always sees its own changes even if the replica lags behind.
+    REPLICA_STALENESS_SECONDS: int = int(os.getenv("REPLICA_STALENESS_SECONDS", 5))
     
     # --- JWT Settings ---
     # To generate a good secret key, run this in a Python shell:
@@ -16,6 +92,15 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Wall-clock timezone of the lab. Booking dates and times are stored as local
+    # values; the generated bookings.starts_at/ends_at columns are derived with it, so it
+    # must be set before the first `manage migrate` and not changed afterwards.
+    APP_TIMEZONE: str = os.getenv("APP_TIMEZONE", "America/Mexico_City")
+
+    # Chat assistant and PDF analysis (langchain, FAISS, Ollama, PyMuPDF). They load lazily
+    # on first use; set to false to never load them, and their endpoints answer 503.
+    AI_FEATURES_ENABLED: bool = os.getenv("AI_FEATURES_ENABLED", "true").lower() in ("1", "true", "yes")
+
     SMTP_SERVER: str = os.getenv("SMTP_SERVER")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
     EMAIL_ADDRESS: str = os.getenv("EMAIL_ADDRESS")
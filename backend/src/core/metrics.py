@@ -0,0 +1,171 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format at /metrics.
+
+Counters and histograms live in this worker's memory; every uvicorn worker exposes its
+own values. Gauges are read at scrape time through callbacks.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the duration of the `with` block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class CallbackGauge:
+    """Gauge whose samples come from `collect()` at scrape time, as [(label values, value)]."""
+    def __init__(self, name: str, documentation: str, labelnames: tuple, collect):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- HTTP ---
+http_requests_total = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status")))
+http_request_duration_seconds = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")))
+
+# --- AI subsystems ---
+ollama_request_duration_seconds = REGISTRY.register(Histogram(
+    "ollama_request_duration_seconds", "Latency of Ollama LLM calls.", ("operation",), SLOW_BUCKETS))
+ollama_tokens_total = REGISTRY.register(Counter(
+    "ollama_tokens_total", "Tokens processed by Ollama, by kind (prompt or completion).", ("operation", "kind")))
+faiss_retrieval_duration_seconds = REGISTRY.register(Histogram(
+    "faiss_retrieval_duration_seconds", "Time spent retrieving documents from the FAISS vector store."))
+pdf_extraction_duration_seconds = REGISTRY.register(Histogram(
+    "pdf_extraction_duration_seconds", "Time spent extracting text from uploaded PDFs."))
+
+# --- Email ---
+smtp_send_duration_seconds = REGISTRY.register(Histogram(
+    "smtp_send_duration_seconds", "Time spent connecting to the SMTP server and sending one email.", ("kind",), SLOW_BUCKETS))
+smtp_send_total = REGISTRY.register(Counter(
+    "smtp_send_total", "Emails sent, by kind and outcome.", ("kind", "outcome")))
+
+
+def record_ollama_tokens(operation: str, prompt_tokens, completion_tokens):
+    if prompt_tokens:
+        ollama_tokens_total.inc(prompt_tokens, operation=operation, kind="prompt")
+    if completion_tokens:
+        ollama_tokens_total.inc(completion_tokens, operation=operation, kind="completion")
+
+
+def register_pool_gauges(engines: dict):
+    """DB pool occupancy and counters for {name: engine}, read from pool_metrics at scrape time."""
+    from src.core.pool_metrics import get_pool_stats
+
+    fields = {
+        "checked_out": ("db_pool_checked_out", "Connections currently checked out of the pool."),
+        "idle": ("db_pool_idle", "Idle connections held by the pool."),
+        "overflow": ("db_pool_overflow", "Connections open beyond pool_size."),
+        "pool_size": ("db_pool_size", "Configured pool size."),
+        "timeouts": ("db_pool_timeouts", "Checkouts that timed out waiting for a connection since startup."),
+        "wait_count": ("db_pool_waits", "Timed pool checkouts since startup."),
+        "wait_time_total_ms": ("db_pool_wait_time_ms", "Total time spent waiting for pool checkouts since startup."),
+        "wait_time_max_ms": ("db_pool_wait_time_max_ms", "Longest single wait for a pool checkout since startup."),
+    }
+    for field, (name, documentation) in fields.items():
+        REGISTRY.register(CallbackGauge(
+            name, documentation, ("pool",),
+            lambda field=field: [((stats["name"],), stats[field]) for stats in get_pool_stats(engines)]
+        ))
@@ -0,0 +1,115 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Counters for one connection pool, fed by SQLAlchemy pool events.
+    Wait time is the time a caller spent inside pool.connect(): queueing for a free
+    connection plus, when the pool grows, opening and pre-pinging a new one.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_seconds += seconds
+            self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        """Live pool occupancy plus the accumulated counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # QueuePool reports overflow as negative until all pool_size slots are open.
+                "overflow": max(pool.overflow(), 0),
+                "connections_created": self.connections_created,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_time_total_ms": round(self.wait_total_seconds * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_total_seconds * 1000 / self.wait_count, 3) if self.wait_count else 0.0,
+                "wait_time_max_ms": round(self.wait_max_seconds * 1000, 3),
+            }
+
+
+# One PoolMetrics per engine, keyed by name ("primary", "async", ...).
+POOL_METRICS: dict[str, PoolMetrics] = {}
+
+
+class _TimedConnectMixin:
+    """Times every pool.connect() call. recreate() keeps the subclass, so timing survives dispose()."""
+    metrics_name: str = ""
+
+    def connect(self):
+        metrics = POOL_METRICS.get(self.metrics_name)
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if metrics:
+                metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if metrics:
+            metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedConnectMixin, QueuePool):
+    metrics_name = "primary"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedConnectMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+class TimedReplicaQueuePool(_TimedConnectMixin, QueuePool):
+    metrics_name = "replica"
+
+
+class TimedAsyncReplicaQueuePool(_TimedConnectMixin, AsyncAdaptedQueuePool):
+    metrics_name = "replica_async"
+
+
+def register_pool_metrics(engine, name: str) -> PoolMetrics:
+    """Attaches the pool event listeners of `engine` (a sync Engine) to a new PoolMetrics."""
+    metrics = POOL_METRICS[name] = PoolMetrics(name)
+
+    event.listen(engine, "connect", lambda dbapi_connection, record: metrics.increment("connections_created"))
+    event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda dbapi_connection, record: metrics.increment("checkins"))
+    event.listen(engine, "invalidate", lambda dbapi_connection, record, exception: metrics.increment("invalidations"))
+    return metrics
+
+
+def get_pool_stats(engines: dict) -> list[dict]:
+    """Snapshots for every registered engine, given as {name: engine}."""
+    return [
+        POOL_METRICS[name].snapshot(engine.pool)
+        for name, engine in engines.items()
+        if name in POOL_METRICS
+    ]
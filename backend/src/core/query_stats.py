@@ -0,0 +1,98 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor-execute listeners on every Engine (the async engines included, through their
+sync_engine) add each statement to the RequestQueryStats of the request being served.
+The middleware in main.py opens and closes that scope and reports the totals. Outside
+a request (CLI commands, scripts) the listeners do nothing.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.core.config import settings
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|:\w+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneDetected(Exception):
+    """Raised (when SQL_N_PLUS_ONE_RAISE is on) as soon as a statement shape repeats too often in one request."""
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with parameters, literals and IN-list lengths erased, so repeats of one query compare equal."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.reported_shapes: set = set()
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_seconds * 1000
+
+    def record(self, statement: str, seconds: float) -> int:
+        """Adds one executed statement and returns how many times its shape has run in this request."""
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.shapes[shape] += 1
+            return self.shapes[shape]
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most repeated first."""
+        if threshold <= 0:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def start_request():
+    """Opens a stats scope for the current request; returns (stats, token for end_request)."""
+    stats = RequestQueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_stats() -> RequestQueryStats | None:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or not conn.info.get("query_start_time"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    repeats = stats.record(statement, elapsed)
+    threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+    if settings.SQL_N_PLUS_ONE_RAISE and threshold > 0 and repeats == threshold:
+        raise NPlusOneDetected(
+            f"Statement executed {repeats} times in one request (threshold {threshold}): {statement_shape(statement)[:300]}"
+        )
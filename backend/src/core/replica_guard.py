@@ -0,0 +1,43 @@
+import hashlib
+import threading
+import time
+from fastapi import Request
+from src.core.config import settings
+
+# Clients that wrote recently, keyed by a hash of their bearer token, with the time of
+# their last successful write. Per worker process: a client whose next read lands on
+# another worker is only protected by the replica's own lag being small.
+_recent_writes: dict[str, float] = {}
+_lock = threading.Lock()
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def _client_key(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def mark_write(request: Request):
+    """Remembers that this client just changed data, so its next reads go to the primary."""
+    key = _client_key(request)
+    if key is None:
+        return
+    now = time.monotonic()
+    with _lock:
+        _recent_writes[key] = now
+        expired = [k for k, at in _recent_writes.items() if now - at > settings.REPLICA_STALENESS_SECONDS]
+        for k in expired:
+            del _recent_writes[k]
+
+
+def recently_wrote(request: Request) -> bool:
+    """True while the client's last write is younger than REPLICA_STALENESS_SECONDS."""
+    key = _client_key(request)
+    if key is None:
+        return False
+    with _lock:
+        written_at = _recent_writes.get(key)
+    return written_at is not None and time.monotonic() - written_at <= settings.REPLICA_STALENESS_SECONDS
@@ -1,14 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import extract, select
 from collections import defaultdict
 from src.models import booking, practice, group, room, subject
 
-def get_monthly_bookings_for_teacher(db: Session, teacher_id: int, year: int, month: int):
-    """
-    Fetches all bookings for a specific teacher for a given month and year.
-    """
-    bookings_query = (
-        db.query(
+def _monthly_bookings_statement(teacher_id: int, year: int, month: int):
+    return (
+        select(
             practice.Practice.title.label("practice_title"),
             group.Group.group_name,
             room.Room.room_name,
@@ -21,15 +19,15 @@ def get_monthly_bookings_for_teacher(db: Session, teacher_id: int, year: int, mo
         .join(group.Group, booking.Booking.group_id == group.Group.group_id)
         .join(room.Room, booking.Booking.room_id == room.Room.room_id)
         .join(subject.Subject, practice.Practice.subject_id == subject.Subject.subject_id)
-        .filter(
+        .where(
             practice.Practice.teacher_id == teacher_id,
             extract('year', booking.Booking.practice_date) == year,
             extract('month', booking.Booking.practice_date) == month
         )
         .order_by(booking.Booking.practice_date, booking.Booking.start_time)
-        .all()
     )
 
+def _group_by_date(bookings_query):
     activities_by_date = defaultdict(list)
     for activity in bookings_query:
         activities_by_date[activity.practice_date].append(activity)
@@ -39,4 +37,13 @@ def get_monthly_bookings_for_teacher(db: Session, teacher_id: int, year: int, mo
         for day, activities in activities_by_date.items()
     ]
     
-    return result
\ No newline at end of file
+    return result
+
+def get_monthly_bookings_for_teacher(db: Session, teacher_id: int, year: int, month: int):
+    """
+    Fetches all bookings for a specific teacher for a given month and year.
+    """
+    return _group_by_date(db.execute(_monthly_bookings_statement(teacher_id, year, month)).all())
+
+async def get_monthly_bookings_for_teacher_async(db: AsyncSession, teacher_id: int, year: int, month: int):
+    return _group_by_date((await db.execute(_monthly_bookings_statement(teacher_id, year, month))).all())
\ No newline at end of file
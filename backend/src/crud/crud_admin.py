@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func
+from collections import defaultdict
 from src.models import teacher, schedule, subject, group, practice, room, booking, announcement, activity_log
 from src.crud import crud_workspace, crud_subject, crud_group
+from src.services import schedule_projection
 from src.schemas import admin as admin_schema
 import os
 
@@ -13,33 +16,77 @@ def get_all_teachers_for_admin(db: Session):
 def get_full_teacher_details_for_admin(db: Session, teacher_id: int):
     """
     Aggregates all information for a single teacher for the admin detail view,
-    now including detailed subject and group info.
+    including detailed subject and group info.
+    Uses at most four queries however many subjects, groups or practices the teacher has:
+    the teacher, their schedule slots (cached per schedule version), practice counts per
+    subject and the practice list. Everything else is assembled in memory.
     """
     db_teacher = db.query(teacher.Teacher).filter(teacher.Teacher.teacher_id == teacher_id).first()
     if not db_teacher:
         return None
 
-    teacher_schedule = crud_workspace.get_teacher_weekly_schedule(db, teacher_id=teacher_id)
-    teacher_practices = crud_workspace.get_practices_for_teacher(db, teacher_id=teacher_id)
-
-    simple_subjects = crud_workspace.get_subjects_by_teacher(db, teacher_id=teacher_id)
-    simple_groups = crud_workspace.get_groups_by_teacher(db, teacher_id=teacher_id)
-
-    detailed_subjects = [
-        crud_workspace.get_subject_details_for_teacher(db, teacher_id=teacher_id, subject_id=s.subject_id)
-        for s in simple_subjects
-    ]
-    detailed_groups = [
-        crud_workspace.get_group_details_for_teacher(db, teacher_id=teacher_id, group_id=g.group_id)
-        for g in simple_groups
-    ]
+    projection = schedule_projection.get_schedule_projection(db, teacher_id, version=db_teacher.schedule_version)
+    schedule_rows = projection.rows
+
+    practice_counts = dict(
+        db.query(practice.Practice.subject_id, func.count(practice.Practice.practice_id))
+        .filter(practice.Practice.teacher_id == teacher_id)
+        .group_by(practice.Practice.subject_id)
+        .all()
+    )
+
+    def schedule_detail(row):
+        return {
+            "day_of_week": row.day_of_week,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "schedule_type": row.schedule_type,
+        }
+
+    # Same orderings as the per-subject and per-group detail queries in crud_workspace.
+    by_subject = sorted(schedule_rows, key=lambda r: (r.subject_name, r.group_name, r.day_of_week))
+    subjects = {}
+    for row in by_subject:
+        detail = subjects.setdefault(row.subject_id, {
+            "subject_id": row.subject_id,
+            "subject_name": row.subject_name,
+            "total_practice_count": practice_counts.get(row.subject_id, 0),
+            "groups": defaultdict(list),
+        })
+        detail["groups"][row.group_name].append(schedule_detail(row))
+
+    by_group = sorted(schedule_rows, key=lambda r: (r.group_name, r.subject_name, r.day_of_week))
+    groups = {}
+    for row in by_group:
+        detail = groups.setdefault(row.group_id, {
+            "group_id": row.group_id,
+            "group_name": row.group_name,
+            "subject_ids": set(),
+            "subjects": defaultdict(list),
+        })
+        detail["subject_ids"].add(row.subject_id)
+        detail["subjects"][row.subject_name].append(schedule_detail(row))
 
     return {
         "teacher": db_teacher,
-        "schedule": teacher_schedule,
-        "subjects": [s for s in detailed_subjects if s],
-        "groups": [g for g in detailed_groups if g],     
-        "practices": teacher_practices,
+        "schedule": projection.weekly,
+        "subjects": [
+            {
+                **detail,
+                "groups": [{"group_name": name, "schedules": entries} for name, entries in detail["groups"].items()],
+            }
+            for detail in subjects.values()
+        ],
+        "groups": [
+            {
+                "group_id": detail["group_id"],
+                "group_name": detail["group_name"],
+                "total_practice_count": sum(practice_counts.get(s_id, 0) for s_id in detail["subject_ids"]),
+                "subjects": [{"subject_name": name, "schedules": entries} for name, entries in detail["subjects"].items()],
+            }
+            for detail in groups.values()
+        ],
+        "practices": crud_workspace.get_practices_for_teacher(db, teacher_id=teacher_id),
     }
 
 def delete_teacher_and_all_data(db: Session, teacher_id: int):
@@ -170,6 +217,7 @@ def update_teacher_by_admin(db: Session, teacher_id: int, update_data: admin_sch
                 )
                 db.add(new_db_schedule)
     
+    schedule_projection.bump_schedule_version(db, teacher_id)
     db.commit()
     return db_teacher
 
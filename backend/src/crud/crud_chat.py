@@ -4,30 +4,28 @@ from sqlalchemy import func
 from src.models import subject, schedule, group, practice, booking, teacher
 from datetime import date
 import yaml 
+from src.services import schedule_projection
 
 def get_schedule_for_subject_by_teacher(db: Session, teacher_id: int, subject_name: str | None) -> str:
     """
     Finds the complete schedule. If subject_name is provided, it filters for that subject.
     If subject_name is None, it returns the full weekly schedule for the teacher.
     """
-    query = db.query(schedule.Schedule).join(group.Group).join(subject.Subject).filter(
-        schedule.Schedule.teacher_id == teacher_id
-    )
-    
+    schedules_result = schedule_projection.get_schedule_projection(db, teacher_id).rows
+
     if subject_name:
-        db_subject_obj = db.query(subject.Subject).filter(func.lower(subject.Subject.subject_name) == func.lower(subject_name)).first()
-        if not db_subject_obj:
-            return f"The teacher does not seem to be associated with a subject named '{subject_name}'."
-        query = query.filter(schedule.Schedule.subject_id == db_subject_obj.subject_id)
-    
-    schedules_result = query.order_by(schedule.Schedule.day_of_week, schedule.Schedule.start_time).all()
+        schedules_result = [s for s in schedules_result if s.subject_name.lower() == subject_name.lower()]
+        if not schedules_result:
+            db_subject_obj = db.query(subject.Subject.subject_id).filter(func.lower(subject.Subject.subject_name) == func.lower(subject_name)).first()
+            if not db_subject_obj:
+                return f"The teacher does not seem to be associated with a subject named '{subject_name}'."
 
     if not schedules_result:
         return f"No schedule found." if not subject_name else f"No schedule found for the subject '{subject_name}'."
     
     day_map = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday", 5: "Friday"}
     schedule_lines = [
-        f"- {s.subject.subject_name}: {day_map.get(s.day_of_week, 'Unknown Day')} from {s.start_time.strftime('%H:%M')} to {s.end_time.strftime('%H:%M')} with {s.group.group_name}"
+        f"- {s.subject_name}: {day_map.get(s.day_of_week, 'Unknown Day')} from {s.start_time.strftime('%H:%M')} to {s.end_time.strftime('%H:%M')} with {s.group_name}"
         for s in schedules_result
     ]
     
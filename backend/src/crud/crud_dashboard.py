@@ -1,42 +1,88 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, TIMESTAMP
-from datetime import datetime, timedelta
-from src.models import booking, practice, group, subject, activity_log, teacher, announcement, room
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, cast, func, insert, select, union_all
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from src.models import booking, practice, group, subject, activity_log, teacher, announcement, room, session_stats
+from src.core.config import settings
+from src.services import activity_log_buffer
 
-APP_TIMEZONE = 'America/Mexico_City'
+APP_TIMEZONE = settings.APP_TIMEZONE
 
-def create_log_entry(db: Session, teacher_id: int, activity_type: activity_log.LogType, practice_title: str):
-    log_entry = activity_log.ActivityLog(teacher_id=teacher_id, activity_type=activity_type, practice_title=practice_title)
-    db.add(log_entry)
-    db.commit()
+def create_log_entry(db: Session, teacher_id: int, activity_type: activity_log.LogType, practice_title: str, commit: bool = False):
+    """
+    Records an activity in the caller's transaction, so it is written by the caller's commit
+    atomically with the change it describes. commit=True commits right away.
+    """
+    create_log_entries(db, [{"teacher_id": teacher_id, "activity_type": activity_type, "practice_title": practice_title}], commit=commit)
 
-def get_recent_logs_for_teacher(db: Session, teacher_id: int, limit: int = 5):
-    return db.query(activity_log.ActivityLog).filter(
+def create_log_entries(db: Session, entries: list[dict], commit: bool = False):
+    """
+    Records many activities (dicts of teacher_id, activity_type, practice_title) with one
+    multi-row INSERT in the caller's transaction. With ACTIVITY_LOG_BUFFER_SECONDS set they
+    are handed to the in-process buffer when the caller commits instead.
+    """
+    if entries:
+        if settings.ACTIVITY_LOG_BUFFER_SECONDS > 0:
+            activity_log_buffer.stage(db, entries)
+        else:
+            db.execute(insert(activity_log.ActivityLog), entries)
+    if commit:
+        db.commit()
+
+def _recent_logs_statement(teacher_id: int, limit: int):
+    return select(activity_log.ActivityLog).where(
         activity_log.ActivityLog.teacher_id == teacher_id
-    ).order_by(activity_log.ActivityLog.timestamp.desc()).limit(limit).all()
+    ).order_by(activity_log.ActivityLog.timestamp.desc()).limit(limit)
 
-def get_announcements(db: Session, limit: int = 20):
-    return db.query(announcement.Announcement).join(
-        teacher.Teacher
-    ).outerjoin(room.Room).outerjoin(group.Group).order_by(announcement.Announcement.created_at.desc()).limit(limit).all()
+def get_recent_logs_for_teacher(db: Session, teacher_id: int, limit: int = 5):
+    return db.execute(_recent_logs_statement(teacher_id, limit)).scalars().all()
 
-def get_top_subjects(db: Session, teacher_id: int, limit: int = 3):
+async def get_recent_logs_for_teacher_async(db: AsyncSession, teacher_id: int, limit: int = 5):
+    return (await db.execute(_recent_logs_statement(teacher_id, limit))).scalars().all()
+
+def _announcements_statement(limit: int):
     """
-    Retrieves the subjects with the most associated practices,
-    scoped to the current teacher.
+    Announcements with their teacher, room and group loaded from the same joins,
+    so serializing them never triggers a lazy load.
     """
-    return db.query(
+    return select(announcement.Announcement).join(
+        announcement.Announcement.teacher
+    ).outerjoin(announcement.Announcement.room).outerjoin(announcement.Announcement.group).options(
+        contains_eager(announcement.Announcement.teacher),
+        contains_eager(announcement.Announcement.room),
+        contains_eager(announcement.Announcement.group)
+    ).order_by(announcement.Announcement.created_at.desc()).limit(limit)
+
+def get_announcements(db: Session, limit: int = 20):
+    return db.execute(_announcements_statement(limit)).scalars().all()
+
+async def get_announcements_async(db: AsyncSession, limit: int = 20):
+    return (await db.execute(_announcements_statement(limit))).scalars().all()
+
+def _top_subjects_statement(teacher_id: int, limit: int):
+    stats = session_stats.SubjectPracticeStats
+    return select(
         subject.Subject.subject_name,
-        func.count(practice.Practice.practice_id).label("practice_count")
+        stats.practice_count
     ).join(
-        subject.Subject, practice.Practice.subject_id == subject.Subject.subject_id
-    ).filter(
-        practice.Practice.teacher_id == teacher_id  # <-- ADD THIS FILTER
-    ).group_by(
-        subject.Subject.subject_name
+        subject.Subject, stats.subject_id == subject.Subject.subject_id
+    ).where(
+        stats.teacher_id == teacher_id,
+        stats.practice_count > 0
     ).order_by(
-        func.count(practice.Practice.practice_id).desc()
-    ).limit(limit).all()
+        stats.practice_count.desc()
+    ).limit(limit)
+
+def get_top_subjects(db: Session, teacher_id: int, limit: int = 3):
+    """
+    Retrieves the subjects with the most associated practices,
+    scoped to the current teacher, from the trigger-maintained practice counters.
+    """
+    return db.execute(_top_subjects_statement(teacher_id, limit)).all()
+
+async def get_top_subjects_async(db: AsyncSession, teacher_id: int, limit: int = 3):
+    return (await db.execute(_top_subjects_statement(teacher_id, limit))).all()
 
 def create_announcement(db: Session, teacher_id: int, description: str, room_id: int | None, group_id: int | None):
     new_ad = announcement.Announcement(teacher_id=teacher_id, description=description, room_id=room_id, group_id=group_id)
@@ -45,104 +91,167 @@ def create_announcement(db: Session, teacher_id: int, description: str, room_id:
     db.refresh(new_ad)
     return new_ad
 
-def get_next_practice_for_teacher(db: Session, teacher_id: int):
-    """
-    Finds the very next upcoming practice using a timezone-aware comparison.
-    """
-    naive_timestamp = booking.Booking.practice_date + booking.Booking.start_time
-    aware_timestamp = func.timezone(APP_TIMEZONE, naive_timestamp)
-    
-    next_booking = db.query(
+def _next_practice_statement(teacher_id: int):
+    return select(
         booking.Booking.practice_date, booking.Booking.start_time,
-        practice.Practice.title, group.Group.group_name, practice.Practice.practice_id
+        practice.Practice.title, group.Group.group_name, practice.Practice.practice_id,
+        booking.Booking.starts_at
     ).join(
         practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
     ).join(
         group.Group, booking.Booking.group_id == group.Group.group_id
-    ).filter(
+    ).where(
         practice.Practice.teacher_id == teacher_id,
-        aware_timestamp > func.now() 
+        booking.Booking.starts_at > func.now()
     ).order_by(
-        booking.Booking.practice_date.asc(),
-        booking.Booking.start_time.asc()
-    ).first()
-    return next_booking
+        booking.Booking.starts_at.asc()
+    ).limit(1)
 
-def get_top_performing_groups(db: Session, teacher_id: int, limit: int = 3):
+def get_next_practice_for_teacher(db: Session, teacher_id: int):
     """
-    Finds top groups based on completed sessions using a timezone-aware comparison.
+    Finds the very next upcoming practice using the stored, timezone-aware start time.
     """
-    naive_end_timestamp = booking.Booking.practice_date + booking.Booking.end_time
-    aware_end_timestamp = func.timezone(APP_TIMEZONE, naive_end_timestamp)
+    return db.execute(_next_practice_statement(teacher_id)).first()
 
-    return db.query(
-        group.Group.group_name,
-        func.count(booking.Booking.booking_id).label("completed_sessions")
+async def get_next_practice_for_teacher_async(db: AsyncSession, teacher_id: int):
+    return (await db.execute(_next_practice_statement(teacher_id))).first()
+
+def _next_session_end_statement(teacher_id: int | None):
+    statement = select(func.min(booking.Booking.ends_at)).where(booking.Booking.ends_at >= func.now())
+    if teacher_id is not None:
+        statement = statement.join(
+            practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+        ).where(practice.Practice.teacher_id == teacher_id)
+    return statement
+
+async def get_next_session_end_async(db: AsyncSession, teacher_id: int | None = None):
+    """
+    When the next session (the teacher's, or anyone's) ends: the next moment completed-session
+    figures can change without a write. None if no session is pending.
+    """
+    return (await db.execute(_next_session_end_statement(teacher_id))).scalar()
+
+def _watermark():
+    return select(session_stats.SessionStatsWatermark.completed_through).scalar_subquery()
+
+def _ended_since_watermark(*columns):
+    """
+    Per-`columns` counts of the sessions that ended after the counters' watermark: the
+    part of the completed sessions the sweeper has not folded into the counters yet.
+    """
+    return select(
+        *columns, func.count(booking.Booking.booking_id).label("completed")
     ).join(
         practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+    ).where(
+        booking.Booking.ends_at > _watermark(),
+        booking.Booking.ends_at < func.now()
+    ).group_by(*columns)
+
+def _top_groups_statement(teacher_id: int, limit: int):
+    stats = session_stats.GroupSessionStats
+    completed = union_all(
+        select(stats.group_id, stats.completed_sessions.label("completed")).where(stats.teacher_id == teacher_id),
+        _ended_since_watermark(booking.Booking.group_id).where(practice.Practice.teacher_id == teacher_id)
+    ).subquery("completed")
+    completed_sessions = cast(func.sum(completed.c.completed), Integer)
+    return select(
+        group.Group.group_name,
+        completed_sessions.label("completed_sessions")
     ).join(
-        group.Group, booking.Booking.group_id == group.Group.group_id
-    ).filter(
-        practice.Practice.teacher_id == teacher_id,
-        aware_end_timestamp < func.now()
-    ).group_by(group.Group.group_name).order_by(
-        func.count(booking.Booking.booking_id).desc()
-    ).limit(limit).all()
+        group.Group, completed.c.group_id == group.Group.group_id
+    ).group_by(group.Group.group_name).having(
+        completed_sessions > 0
+    ).order_by(
+        completed_sessions.desc()
+    ).limit(limit)
 
-def get_teacher_position_stats(db: Session, teacher_id: int):
+def get_top_performing_groups(db: Session, teacher_id: int, limit: int = 3):
     """
-    Calculates teacher rank and stats based on individual completed lab sessions.
-    Includes overall, weekly, and monthly totals.
+    Finds top groups based on completed sessions: the group counters plus the sessions
+    that ended since their last sweep.
+    """
+    return db.execute(_top_groups_statement(teacher_id, limit)).all()
+
+async def get_top_performing_groups_async(db: AsyncSession, teacher_id: int, limit: int = 3):
+    return (await db.execute(_top_groups_statement(teacher_id, limit))).all()
+
+def next_period_start(now: datetime | None = None) -> datetime:
+    """Local midnight starting the next week or month, whichever comes first: when the periodic position figures reset."""
+    local_now = (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(APP_TIMEZONE))
+    next_week = local_now.date() - timedelta(days=local_now.weekday()) + timedelta(weeks=1)
+    next_month = (local_now.date().replace(day=1) + timedelta(days=32)).replace(day=1)
+    return datetime.combine(min(next_week, next_month), time(0), tzinfo=ZoneInfo(APP_TIMEZONE))
+
+def _position_stats_statement(teacher_id: int):
     """
-    aware_end_timestamp = func.timezone('America/Mexico_City', booking.Booking.practice_date + booking.Booking.end_time)
+    All seven position figures in one statement. Overall completed sessions come from the
+    per-teacher counters plus the sessions that ended since their last sweep, and are
+    ranked with RANK(). The current week and month are FILTER aggregates over one range
+    scan of starts_at, starting at local midnight, so no statement reads the full history.
 
-    completed_counts_sq = db.query(
+    A teacher without completed sessions has no ranked row and is placed right after
+    every teacher who has some.
+    """
+    local_now = func.timezone(APP_TIMEZONE, func.now())
+    start_of_week = func.timezone(APP_TIMEZONE, func.date_trunc("week", local_now))
+    start_of_month = func.timezone(APP_TIMEZONE, func.date_trunc("month", local_now))
+    stats = session_stats.TeacherSessionStats
+
+    completed = union_all(
+        select(stats.teacher_id, stats.completed_sessions.label("completed")),
+        _ended_since_watermark(practice.Practice.teacher_id)
+    ).subquery("completed")
+    per_teacher = select(
+        completed.c.teacher_id,
+        func.sum(completed.c.completed).label("completed")
+    ).group_by(completed.c.teacher_id).having(func.sum(completed.c.completed) > 0).cte("completed_per_teacher")
+
+    recent = select(
         practice.Practice.teacher_id,
-        func.count(booking.Booking.booking_id).label("completed_count")
-    ).join(practice.Practice).filter(
-        aware_end_timestamp < func.now()
-    ).group_by(practice.Practice.teacher_id).subquery()
-    
-    my_stats = db.query(completed_counts_sq).filter(completed_counts_sq.c.teacher_id == teacher_id).first()
-    my_completed_sessions = my_stats.completed_count if my_stats else 0
-    total_completed_sessions = db.query(func.sum(completed_counts_sq.c.completed_count)).scalar() or 0
-    higher_ranked_teachers = db.query(func.count(completed_counts_sq.c.teacher_id)).filter(
-        completed_counts_sq.c.completed_count > my_completed_sessions
-    ).scalar()
-    my_rank = (higher_ranked_teachers or 0) + 1
-
-    now = datetime.utcnow()
-    start_of_week = now.date() - timedelta(days=now.weekday())
-    start_of_month = now.date().replace(day=1)
-
-    my_weekly_sessions = db.query(func.count(booking.Booking.booking_id)).join(practice.Practice).filter(
-        practice.Practice.teacher_id == teacher_id,
-        booking.Booking.practice_date >= start_of_week,
-        aware_end_timestamp < func.now()
-    ).scalar()
+        func.count(booking.Booking.booking_id).filter(booking.Booking.starts_at >= start_of_week).label("weekly"),
+        func.count(booking.Booking.booking_id).filter(booking.Booking.starts_at >= start_of_month).label("monthly"),
+    ).join(
+        practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+    ).where(
+        booking.Booking.starts_at >= func.least(start_of_week, start_of_month),
+        booking.Booking.ends_at < func.now()
+    ).group_by(practice.Practice.teacher_id).subquery("recent")
 
-    total_weekly_sessions = db.query(func.count(booking.Booking.booking_id)).filter(
-        booking.Booking.practice_date >= start_of_week,
-        aware_end_timestamp < func.now()
-    ).scalar()
+    ranked = select(
+        per_teacher.c.teacher_id,
+        per_teacher.c.completed,
+        func.coalesce(recent.c.weekly, 0).label("weekly"),
+        func.coalesce(recent.c.monthly, 0).label("monthly"),
+        func.rank().over(order_by=per_teacher.c.completed.desc()).label("teacher_rank")
+    ).select_from(
+        per_teacher.outerjoin(recent, per_teacher.c.teacher_id == recent.c.teacher_id)
+    ).subquery("ranked")
 
-    my_monthly_sessions = db.query(func.count(booking.Booking.booking_id)).join(practice.Practice).filter(
-        practice.Practice.teacher_id == teacher_id,
-        booking.Booking.practice_date >= start_of_month,
-        aware_end_timestamp < func.now()
-    ).scalar()
-
-    total_monthly_sessions = db.query(func.count(booking.Booking.booking_id)).filter(
-        booking.Booking.practice_date >= start_of_month,
-        aware_end_timestamp < func.now()
-    ).scalar()
-
-    return {
-        "my_completed_sessions": my_completed_sessions,
-        "total_completed_sessions": total_completed_sessions,
-        "rank": my_rank,
-        "my_weekly_sessions": my_weekly_sessions,
-        "total_weekly_sessions": total_weekly_sessions,
-        "my_monthly_sessions": my_monthly_sessions,
-        "total_monthly_sessions": total_monthly_sessions
-    }
\ No newline at end of file
+    is_mine = ranked.c.teacher_id == teacher_id
+
+    def mine(column):
+        return cast(func.coalesce(func.max(column).filter(is_mine), 0), Integer)
+
+    def total(column):
+        return cast(func.coalesce(func.sum(column), 0), Integer)
+
+    return select(
+        mine(ranked.c.completed).label("my_completed_sessions"),
+        total(ranked.c.completed).label("total_completed_sessions"),
+        func.coalesce(func.max(ranked.c.teacher_rank).filter(is_mine), func.count() + 1).label("rank"),
+        mine(ranked.c.weekly).label("my_weekly_sessions"),
+        total(ranked.c.weekly).label("total_weekly_sessions"),
+        mine(ranked.c.monthly).label("my_monthly_sessions"),
+        total(ranked.c.monthly).label("total_monthly_sessions"),
+    )
+
+def get_teacher_position_stats(db: Session, teacher_id: int):
+    """
+    Calculates teacher rank and stats based on individual completed lab sessions.
+    Includes overall, weekly, and monthly totals.
+    """
+    return dict(db.execute(_position_stats_statement(teacher_id)).one()._mapping)
+
+async def get_teacher_position_stats_async(db: AsyncSession, teacher_id: int):
+    return dict((await db.execute(_position_stats_statement(teacher_id))).one()._mapping)
\ No newline at end of file
@@ -1,13 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from src.models import practice, teacher, subject, room
 
-def get_recent_activities(db: Session, limit: int = 10):
-    """
-    Retrieves the most recent activities (currently just practice uploads).
-    """
-    recent_practices = (
-        db.query(
+def _recent_activities_statement(limit: int):
+    return (
+        select(
             practice.Practice.title,
             teacher.Teacher.teacher_name,
             practice.Practice.created_at
@@ -15,9 +13,9 @@ def get_recent_activities(db: Session, limit: int = 10):
         .join(teacher.Teacher, practice.Practice.teacher_id == teacher.Teacher.teacher_id)
         .order_by(practice.Practice.created_at.desc())
         .limit(limit)
-        .all()
     )
 
+def _format_recent_activities(recent_practices):
     activities = []
     for p_title, t_name, p_date in recent_practices:
         activities.append({
@@ -28,5 +26,14 @@ def get_recent_activities(db: Session, limit: int = 10):
         })
     return activities
 
+def get_recent_activities(db: Session, limit: int = 10):
+    """
+    Retrieves the most recent activities (currently just practice uploads).
+    """
+    return _format_recent_activities(db.execute(_recent_activities_statement(limit)).all())
+
+async def get_recent_activities_async(db: AsyncSession, limit: int = 10):
+    return _format_recent_activities((await db.execute(_recent_activities_statement(limit))).all())
+
 def get_rooms(db: Session):
     return db.query(room.Room).order_by(room.Room.room_name).all()
\ No newline at end of file
@@ -6,11 +6,8 @@ from datetime import date
 def get_completed_practices_query(db: Session):
     """
     Creates the base SQLAlchemy query to fetch all completed practice sessions.
-    A session is considered completed if its combined date and end_time is in the past.
-    This query is timezone-aware, making it more accurate.
+    A session is considered completed if its stored, timezone-aware end time is in the past.
     """
-    aware_end_timestamp = func.timezone('America/Mexico_City', booking.Booking.practice_date + booking.Booking.end_time)
-    
     return (
         db.query(
             booking.Booking.practice_date,
@@ -33,7 +30,7 @@ def get_completed_practices_query(db: Session):
         .join(subject.Subject, practice.Practice.subject_id == subject.Subject.subject_id)
         .join(group.Group, booking.Booking.group_id == group.Group.group_id)
         .join(room.Room, booking.Booking.room_id == room.Room.room_id)
-        .filter(aware_end_timestamp < func.now()) 
+        .filter(booking.Booking.ends_at < func.now())
         .order_by(booking.Booking.practice_date.desc())
     )
 
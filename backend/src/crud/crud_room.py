@@ -1,45 +1,51 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select
 from datetime import date, timedelta
 from collections import defaultdict
 from src.models import booking, practice, teacher, group
 import math
 from src.models import room
 
-def get_bookings_for_room_on_date(db: Session, room_id: int, target_date: date):
+def _room_bookings_statement(room_id: int, target_date: date):
     return (
-        db.query(booking.Booking)
+        select(booking.Booking)
         .options(
             joinedload(booking.Booking.practice).joinedload(practice.Practice.teacher),
             joinedload(booking.Booking.practice).joinedload(practice.Practice.subject),
             joinedload(booking.Booking.group),
         )
-        .filter(
+        .where(
             booking.Booking.room_id == room_id,
             booking.Booking.practice_date == target_date
         )
         .order_by(booking.Booking.start_time)
-        .all()
     )
 
-def get_monthly_availability_for_room(db: Session, room_id: int, year: int, month: int):
+def get_bookings_for_room_on_date(db: Session, room_id: int, target_date: date):
+    return db.execute(_room_bookings_statement(room_id, target_date)).scalars().all()
+
+async def get_bookings_for_room_on_date_async(db: AsyncSession, room_id: int, target_date: date):
+    return (await db.execute(_room_bookings_statement(room_id, target_date))).scalars().all()
+
+def _monthly_room_bookings_statement(room_id: int, year: int, month: int):
     query_filter = text(
         f"EXTRACT(YEAR FROM practice_date) = {year} AND EXTRACT(MONTH FROM practice_date) = {month}"
     )
 
-    bookings_in_month = (
-        db.query(
+    return (
+        select(
             booking.Booking.practice_date,
             booking.Booking.start_time,
             booking.Booking.end_time
         )
-        .filter(
+        .where(
             booking.Booking.room_id == room_id,
             query_filter
         )
-        .all()
     )
 
+def _count_daily_slots(bookings_in_month):
     daily_slot_counts = defaultdict(int)
 
     for b in bookings_in_month:
@@ -54,6 +60,12 @@ def get_monthly_availability_for_room(db: Session, room_id: int, year: int, mont
             
     return dict(daily_slot_counts)
 
+def get_monthly_availability_for_room(db: Session, room_id: int, year: int, month: int):
+    return _count_daily_slots(db.execute(_monthly_room_bookings_statement(room_id, year, month)).all())
+
+async def get_monthly_availability_for_room_async(db: AsyncSession, room_id: int, year: int, month: int):
+    return _count_daily_slots((await db.execute(_monthly_room_bookings_statement(room_id, year, month))).all())
+
 def get_room_by_id(db: Session, room_id: int) -> room.Room | None:
     """Retrieves a single room by its ID."""
     return db.query(room.Room).filter(room.Room.room_id == room_id).first()
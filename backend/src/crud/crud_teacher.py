@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from src.models.teacher import Teacher
 from src.schemas.teacher import TeacherCreate
 from src.auth.security import get_password_hash
@@ -9,6 +11,12 @@ def get_teacher_by_email(db: Session, email: str) -> Teacher | None:
     """
     return db.query(Teacher).filter(Teacher.email == email).first()
 
+async def get_teacher_by_email_async(db: AsyncSession, email: str) -> Teacher | None:
+    """
+    Async version of get_teacher_by_email, used by get_current_teacher_async.
+    """
+    return (await db.execute(select(Teacher).where(Teacher.email == email))).scalars().first()
+
 def create_teacher(db: Session, teacher: TeacherCreate) -> Teacher:
     """
     Creates a new teacher object and adds it to the session.
@@ -1,9 +1,14 @@
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct
-from src.models import schedule, subject, group, practice, room, booking
+from sqlalchemy import func, distinct, insert, or_, tuple_, exists, values, column, true, Integer, Date, Time
+from sqlalchemy.exc import IntegrityError
+from src.models import schedule, subject, group, practice, room, booking, activity_log
+from src.core.config import settings
+from src.services import booking_service, schedule_projection
+from src.crud import crud_dashboard
 from collections import defaultdict
 from calendar import monthrange
+import base64
 
 def get_subjects_by_teacher(db: Session, teacher_id: int):
     """
@@ -127,81 +132,239 @@ def get_group_details_for_teacher(db: Session, teacher_id: int, group_id: int):
 def get_groups_for_subject_by_teacher(db: Session, teacher_id: int, subject_id: int):
     """
     Finds all groups a teacher has for a specific subject and includes their schedules.
+    One joined query, grouped in memory into plain dicts (ORM objects are not touched).
     """
-    group_ids_query = db.query(distinct(schedule.Schedule.group_id)).filter(
-        schedule.Schedule.teacher_id == teacher_id,
-        schedule.Schedule.subject_id == subject_id
-    ).all()
-    group_ids = [g_id for g_id, in group_ids_query]
+    rows = (
+        db.query(
+            group.Group.group_id,
+            group.Group.group_name,
+            schedule.Schedule.day_of_week,
+            schedule.Schedule.start_time,
+            schedule.Schedule.end_time,
+            schedule.Schedule.schedule_type,
+        )
+        .join(schedule.Schedule, schedule.Schedule.group_id == group.Group.group_id)
+        .filter(
+            schedule.Schedule.teacher_id == teacher_id,
+            schedule.Schedule.subject_id == subject_id
+        )
+        .order_by(group.Group.group_name, group.Group.group_id, schedule.Schedule.day_of_week, schedule.Schedule.start_time)
+        .all()
+    )
 
-    groups_list = db.query(group.Group).filter(group.Group.group_id.in_(group_ids)).all()
+    groups_by_id = {}
+    for row in rows:
+        entry = groups_by_id.setdefault(row.group_id, {
+            "group_id": row.group_id,
+            "group_name": row.group_name,
+            "schedules": []
+        })
+        entry["schedules"].append({
+            "day_of_week": row.day_of_week,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "schedule_type": row.schedule_type
+        })
+    return list(groups_by_id.values())
 
-    for g in groups_list:
-        g.schedules = db.query(schedule.Schedule).filter(
-            schedule.Schedule.teacher_id == teacher_id,
-            schedule.Schedule.subject_id == subject_id,
-            schedule.Schedule.group_id == g.group_id
-        ).all()
-        
-    return groups_list
 
+def _room_is_busy(practice_date, start_time, end_time):
+    """EXISTS clause: the room in the outer query has a booking overlapping the given slot."""
+    return exists().where(
+        booking.Booking.room_id == room.Room.room_id,
+        booking.Booking.practice_date == practice_date,
+        booking.Booking.start_time < end_time,
+        booking.Booking.end_time > start_time
+    )
 
 def get_available_rooms(db: Session, practice_date: date, start_time: time, end_time: time):
     """
     Finds all rooms that are NOT booked during a specific date and time interval.
+    Served from the occupancy index when it is enabled.
     """
-    busy_room_ids = db.query(booking.Booking.room_id).filter(
-        booking.Booking.practice_date == practice_date,
-        booking.Booking.start_time < end_time,
-        booking.Booking.end_time > start_time
-    ).all()
-    busy_room_ids = [r_id for r_id, in busy_room_ids]
+    if settings.OCCUPANCY_INDEX_ENABLED:
+        return booking_service.occupancy.available_rooms(db, practice_date, start_time, end_time)
+    return db.query(room.Room).filter(
+        ~_room_is_busy(practice_date, start_time, end_time)
+    ).order_by(room.Room.room_id).all()
 
-    return db.query(room.Room).filter(room.Room.room_id.notin_(busy_room_ids)).all()
+def get_available_rooms_for_slots(db: Session, slots: list[dict]):
+    """
+    Free rooms for each of several (practice_date, start_time, end_time) slots, in one query:
+    the slots are sent as a VALUES list, crossed with the rooms and anti-joined with the
+    overlapping bookings. Returns one list of rooms per slot, in the order of `slots`.
+    Served from the occupancy index when it is enabled, like get_available_rooms.
+    """
+    if not slots:
+        return []
+    if settings.OCCUPANCY_INDEX_ENABLED:
+        return [
+            [
+                {"room_id": r["room_id"], "room_name": r["room_name"]}
+                for r in booking_service.occupancy.available_rooms(db, slot["practice_date"], slot["start_time"], slot["end_time"])
+            ]
+            for slot in slots
+        ]
 
-def get_practices_for_teacher(db: Session, teacher_id: int):
-    practices_query = (
+    slot_values = values(
+        column("slot_index", Integer),
+        column("practice_date", Date),
+        column("start_time", Time),
+        column("end_time", Time),
+        name="slots"
+    ).data([
+        (index, slot["practice_date"], slot["start_time"], slot["end_time"])
+        for index, slot in enumerate(slots)
+    ])
+
+    rows = db.query(
+        slot_values.c.slot_index, room.Room.room_id, room.Room.room_name
+    ).select_from(slot_values).join(room.Room, true()).filter(
+        ~_room_is_busy(slot_values.c.practice_date, slot_values.c.start_time, slot_values.c.end_time)
+    ).order_by(slot_values.c.slot_index, room.Room.room_id).all()
+
+    rooms_per_slot = [[] for _ in slots]
+    for row in rows:
+        rooms_per_slot[row.slot_index].append({"room_id": row.room_id, "room_name": row.room_name})
+    return rooms_per_slot
+
+PRACTICE_STATUSES = ("upcoming", "past")
+
+# Aggregates over a practice's bookings, for queries grouped by practice. They compare the
+# timezone-aware starts_at/ends_at with the database clock, so the lab's local time is used.
+# A practice with no sessions is both editable and deletable.
+def _practice_editable():
+    """True while the last session has not ended."""
+    return or_(func.max(booking.Booking.ends_at).is_(None), func.max(booking.Booking.ends_at) > func.now())
+
+def _practice_deletable():
+    """True while the first session has not started."""
+    return or_(func.min(booking.Booking.starts_at).is_(None), func.min(booking.Booking.starts_at) > func.now())
+
+def encode_practice_cursor(created_at: datetime, practice_id: int) -> str:
+    """Opaque keyset cursor pointing just after the given practice in the newest-first list."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{practice_id}".encode()).decode()
+
+def decode_practice_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, practice_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(practice_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid pagination cursor.")
+
+def _practice_list_query(db: Session, teacher_id: int, subject_id: int | None = None,
+                         status: str | None = None, search: str | None = None):
+    """
+    One grouped query over practices and their bookings. The session window is the
+    min/max of the typed local timestamps (practice_date + time), not of concatenated strings.
+    """
+    query = (
         db.query(
             practice.Practice.practice_id,
             practice.Practice.title,
             subject.Subject.subject_name,
-            practice.Practice.created_at
+            practice.Practice.created_at,
+            func.min(booking.Booking.practice_date + booking.Booking.start_time).label("earliest_session_start"),
+            func.max(booking.Booking.practice_date + booking.Booking.end_time).label("latest_session_end"),
+            _practice_editable().label("editable"),
+            _practice_deletable().label("deletable"),
         )
         .join(subject.Subject, practice.Practice.subject_id == subject.Subject.subject_id)
+        .outerjoin(booking.Booking, booking.Booking.practice_id == practice.Practice.practice_id)
         .filter(practice.Practice.teacher_id == teacher_id)
-        .order_by(practice.Practice.created_at.desc())
-        .all()
+        .group_by(practice.Practice.practice_id, subject.Subject.subject_name)
     )
-    results = []
-    for p_id, p_title, s_name, p_date in practices_query:
-        earliest_start = db.query(
-            func.min(func.concat(booking.Booking.practice_date, ' ', booking.Booking.start_time))
-        ).filter(booking.Booking.practice_id == p_id).scalar()
-
-        latest_end = db.query(
-            func.max(func.concat(booking.Booking.practice_date, ' ', booking.Booking.end_time))
-        ).filter(booking.Booking.practice_id == p_id).scalar()
-
-        results.append({
-            "practice_id": p_id,
-            "title": p_title,
-            "subject_name": s_name,
-            "created_at": p_date,
-            "earliest_session_start": earliest_start, # e.g., "2025-08-28 09:00:00" or None
-            "latest_session_end": latest_end,       # e.g., "2025-09-02 15:30:00" or None
-        })
-    return results
+    if subject_id is not None:
+        query = query.filter(practice.Practice.subject_id == subject_id)
+    if search:
+        pattern = f"%{search}%"
+        query = query.filter(or_(practice.Practice.title.ilike(pattern), subject.Subject.subject_name.ilike(pattern)))
+    # "upcoming" is exactly the editable practices: a practice without sessions still counts as upcoming.
+    if status == "upcoming":
+        query = query.having(_practice_editable())
+    elif status == "past":
+        query = query.having(~_practice_editable())
+    return query
+
+def _practice_list_item(row) -> dict:
+    return {
+        "practice_id": row.practice_id,
+        "title": row.title,
+        "subject_name": row.subject_name,
+        "created_at": row.created_at,
+        "earliest_session_start": row.earliest_session_start, # local datetime or None
+        "latest_session_end": row.latest_session_end,         # local datetime or None
+        "editable": row.editable,
+        "deletable": row.deletable,
+    }
 
-def get_practice_details(db: Session, practice_id: int, teacher_id: int):
-    db_practice = db.query(practice.Practice).filter(
-        practice.Practice.practice_id == practice_id,
+def get_practices_for_teacher(db: Session, teacher_id: int, subject_id: int | None = None,
+                              status: str | None = None, search: str | None = None):
+    """
+    All practices of a teacher, newest first, with their first session start and
+    last session end. Runs a single query regardless of how many practices exist.
+    """
+    rows = _practice_list_query(db, teacher_id, subject_id, status, search).order_by(
+        practice.Practice.created_at.desc(), practice.Practice.practice_id.desc()
+    ).all()
+    return [_practice_list_item(row) for row in rows]
+
+def get_practice_page_for_teacher(db: Session, teacher_id: int, limit: int, cursor: str | None = None,
+                                  subject_id: int | None = None, status: str | None = None, search: str | None = None):
+    """
+    One page of get_practices_for_teacher using keyset pagination on (created_at, practice_id).
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    query = _practice_list_query(db, teacher_id, subject_id, status, search)
+    if cursor:
+        cursor_created_at, cursor_practice_id = decode_practice_cursor(cursor)
+        query = query.filter(
+            tuple_(practice.Practice.created_at, practice.Practice.practice_id) < tuple_(cursor_created_at, cursor_practice_id)
+        )
+    rows = query.order_by(
+        practice.Practice.created_at.desc(), practice.Practice.practice_id.desc()
+    ).limit(limit + 1).all()
+
+    items = [_practice_list_item(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_practice_cursor(last.created_at, last.practice_id)
+    return items, next_cursor
+
+def count_practices_for_teacher(db: Session, teacher_id: int) -> int:
+    """Number of practices a teacher has created."""
+    return db.query(func.count(practice.Practice.practice_id)).filter(
         practice.Practice.teacher_id == teacher_id
-    ).first()
+    ).scalar()
 
-    if not db_practice:
+def get_practice_details(db: Session, practice_id: int, teacher_id: int):
+    """
+    A practice of the teacher with its subject name, editable/deletable flags and sessions,
+    in two queries. Returns None if the teacher has no such practice.
+    """
+    practice_row = (
+        db.query(
+            practice.Practice,
+            subject.Subject.subject_name,
+            _practice_editable().label("editable"),
+            _practice_deletable().label("deletable"),
+        )
+        .join(subject.Subject, practice.Practice.subject_id == subject.Subject.subject_id)
+        .outerjoin(booking.Booking, booking.Booking.practice_id == practice.Practice.practice_id)
+        .filter(
+            practice.Practice.practice_id == practice_id,
+            practice.Practice.teacher_id == teacher_id
+        )
+        .group_by(practice.Practice.practice_id, subject.Subject.subject_name)
+        .first()
+    )
+
+    if not practice_row:
         return None
 
-    subj_name = db.query(subject.Subject.subject_name).filter(subject.Subject.subject_id == db_practice.subject_id).scalar()
+    db_practice, subj_name = practice_row.Practice, practice_row.subject_name
     
     bookings_query = (
         db.query(
@@ -227,25 +390,205 @@ def get_practice_details(db: Session, practice_id: int, teacher_id: int):
         "created_at": db_practice.created_at,
         "file_url": db_practice.file_url,
         "teacher_id": db_practice.teacher_id,
+        "editable": practice_row.editable,
+        "deletable": practice_row.deletable,
         "bookings": [
             { "group_name": b.group_name, "room_name": b.room_name, "room_id": b.room_id, "practice_date": b.practice_date, "start_time": b.start_time, "end_time": b.end_time } 
             for b in bookings_query
         ]
     }
 
-def check_group_booking_conflict(db: Session, group_id: int, practice_date: date, start_time: time, end_time: time):
+class BookingConflictError(Exception):
     """
-    Checks if a booking already exists for a given group that overlaps with the specified time.
-    Returns the conflicting booking if found, otherwise None.
+    Raised when a session overlaps an existing booking of the same room or group.
+    `resource` is "room" or "group", `name` is that room's or group's display name.
     """
-    conflict = db.query(booking.Booking).join(group.Group).filter(
-        booking.Booking.group_id == group_id,
-        booking.Booking.practice_date == practice_date,
-        booking.Booking.start_time < end_time,
-        booking.Booking.end_time > start_time
-    ).first()
-    
-    return conflict
+    def __init__(self, resource: str, booking_info: dict, name: str):
+        self.resource = resource
+        self.booking_info = booking_info
+        self.name = name
+        super().__init__(f"Schedule conflict for {resource} '{name}' on {booking_info['practice_date']}.")
+
+def _sessions_overlap(a: dict, b: dict) -> bool:
+    return a["practice_date"] == b["practice_date"] and a["start_time"] < b["end_time"] and b["start_time"] < a["end_time"]
+
+def _find_conflicting_session(db: Session, column: str, rows: list):
+    """
+    Only used after the exclusion constraint fired: finds the first requested session that
+    overlaps either an existing booking or an earlier session of the same request.
+    """
+    for index, row in enumerate(rows):
+        if any(other[column] == row[column] and _sessions_overlap(other, row) for other in rows[:index]):
+            return row
+        existing = db.query(booking.Booking.booking_id).filter(
+            getattr(booking.Booking, column) == row[column],
+            booking.Booking.practice_date == row["practice_date"],
+            booking.Booking.start_time < row["end_time"],
+            booking.Booking.end_time > row["start_time"]
+        ).first()
+        if existing:
+            return row
+    return rows[0]
+
+def create_bookings(db: Session, practice_id: int, bookings_data: list):
+    """
+    Inserts every session of a practice with a single multi-row INSERT.
+    Overlaps are rejected by the room/group exclusion constraints, so no per-session
+    pre-check is needed and concurrent requests cannot double-book. On a violation the
+    statement is rolled back to a savepoint and a BookingConflictError is raised.
+    """
+    insert_bookings(db, [{**b, "practice_id": practice_id} for b in bookings_data])
+
+def insert_bookings(db: Session, bookings_data: list):
+    """
+    Same as create_bookings for sessions that may belong to several practices: every
+    item carries its own practice_id. All of them go into one multi-row INSERT.
+    """
+    if not bookings_data:
+        return
+
+    rows = [
+        {
+            "practice_id": b["practice_id"],
+            "group_id": b["group_id"],
+            "room_id": b["room_id"],
+            "practice_date": b["practice_date"],
+            "start_time": b["start_time"],
+            "end_time": b["end_time"],
+            "status": "Scheduled",
+        }
+        for b in bookings_data
+    ]
+
+    try:
+        with db.begin_nested():
+            db.execute(insert(booking.Booking).values(rows))
+        booking_service.stage_added_bookings(db, rows)
+    except IntegrityError as e:
+        constraint_name = getattr(getattr(e.orig, "diag", None), "constraint_name", None)
+        if constraint_name == booking.ROOM_OVERLAP_CONSTRAINT:
+            row = _find_conflicting_session(db, "room_id", rows)
+            name = db.query(room.Room.room_name).filter(room.Room.room_id == row["room_id"]).scalar()
+            raise BookingConflictError("room", row, name) from e
+        if constraint_name == booking.GROUP_OVERLAP_CONSTRAINT:
+            row = _find_conflicting_session(db, "group_id", rows)
+            name = db.query(group.Group.group_name).filter(group.Group.group_id == row["group_id"]).scalar()
+            raise BookingConflictError("group", row, name) from e
+        raise
+
+class InvalidSessionError(Exception):
+    """Raised when a requested session is malformed or names a group or room the teacher cannot book."""
+
+def validate_session_times(sessions: list):
+    """
+    Raises InvalidSessionError for the first session that does not end after it starts
+    (the session_range column of bookings cannot hold a reversed range).
+    """
+    for session_data in sessions:
+        if session_data["end_time"] <= session_data["start_time"]:
+            raise InvalidSessionError(
+                f"Session on {session_data['practice_date']} must end after it starts."
+            )
+
+def validate_sessions(db: Session, teacher_id: int, sessions: list):
+    """
+    Checks every requested session (subject_id, group_id, room_id, practice_date, start_time,
+    end_time) with one query: the room must exist and the teacher must have the group
+    scheduled for that subject. Raises InvalidSessionError for the first invalid session.
+    """
+    validate_session_times(sessions)
+    if not sessions:
+        return
+
+    requested = values(
+        column("session_index", Integer),
+        column("subject_id", Integer),
+        column("group_id", Integer),
+        column("room_id", Integer),
+        name="requested"
+    ).data([
+        (index, s["subject_id"], s["group_id"], s["room_id"])
+        for index, s in enumerate(sessions)
+    ])
+    teaches_group = exists().where(
+        schedule.Schedule.teacher_id == teacher_id,
+        schedule.Schedule.subject_id == requested.c.subject_id,
+        schedule.Schedule.group_id == requested.c.group_id
+    )
+    problems = db.query(
+        requested.c.session_index,
+        room.Room.room_id.label("known_room_id"),
+        teaches_group.label("teaches_group"),
+    ).select_from(requested).outerjoin(
+        room.Room, room.Room.room_id == requested.c.room_id
+    ).filter(
+        or_(room.Room.room_id.is_(None), ~teaches_group)
+    ).order_by(requested.c.session_index).first()
+
+    if problems:
+        session_data = sessions[problems.session_index]
+        if problems.known_room_id is None:
+            raise InvalidSessionError(f"Room {session_data['room_id']} does not exist.")
+        raise InvalidSessionError(
+            f"Group {session_data['group_id']} is not scheduled with this teacher for subject {session_data['subject_id']}."
+        )
+
+def create_practices_with_bookings(db: Session, teacher_id: int, practices_data: list) -> list[int]:
+    """
+    Registers several practices with their sessions in the caller's transaction, in a
+    fixed number of statements: one validation query for all sessions, one multi-row
+    INSERT for the practices, one for the bookings and one for the activity log entries.
+    Each item has title, description, file_url, subject_id and `bookings` (session dicts).
+    Returns the new practice ids in input order. Nothing is committed.
+    Raises InvalidSessionError or BookingConflictError.
+    """
+    validate_sessions(db, teacher_id, [
+        {**b, "subject_id": p["subject_id"]} for p in practices_data for b in p["bookings"]
+    ])
+
+    practice_ids = db.execute(
+        insert(practice.Practice).returning(practice.Practice.practice_id, sort_by_parameter_order=True),
+        [
+            {
+                "title": p["title"],
+                "description": p["description"],
+                "file_url": p["file_url"],
+                "teacher_id": teacher_id,
+                "subject_id": p["subject_id"],
+            }
+            for p in practices_data
+        ]
+    ).scalars().all()
+
+    insert_bookings(db, [
+        {**b, "practice_id": practice_id}
+        for practice_id, p in zip(practice_ids, practices_data)
+        for b in p["bookings"]
+    ])
+
+    crud_dashboard.create_log_entries(db, [
+        {"teacher_id": teacher_id, "activity_type": activity_log.LogType.CREATED, "practice_title": p["title"]}
+        for p in practices_data
+    ])
+    return practice_ids
+
+def filter_retained_bookings(db: Session, practice_id: int, bookings_data: list) -> list:
+    """
+    Drops requested sessions that are identical to bookings the practice still holds
+    (past sessions survive delete_future_bookings_for_practice), so an edit does not
+    re-insert them and collide with itself.
+    """
+    retained = {
+        (b.group_id, b.room_id, b.practice_date, b.start_time, b.end_time)
+        for b in db.query(
+            booking.Booking.group_id, booking.Booking.room_id, booking.Booking.practice_date,
+            booking.Booking.start_time, booking.Booking.end_time
+        ).filter(booking.Booking.practice_id == practice_id).all()
+    }
+    return [
+        b for b in bookings_data
+        if (b["group_id"], b["room_id"], b["practice_date"], b["start_time"], b["end_time"]) not in retained
+    ]
 
 def get_existing_bookings_for_subject(db: Session, teacher_id: int, subject_id: int):
     """
@@ -264,35 +607,15 @@ def delete_bookings_for_practice(db: Session, practice_id: int):
     """Deletes all bookings associated with a given practice ID."""
     db.query(booking.Booking).filter(booking.Booking.practice_id == practice_id).delete()
 
+def _practice_flag(db: Session, practice_id: int, flag) -> bool:
+    return db.query(flag).filter(booking.Booking.practice_id == practice_id).scalar()
+
 def is_practice_editable(db: Session, practice_id: int, teacher_id: int) -> bool:
     """
     Checks if a practice is editable. A practice is editable as long as the end time
     of its latest scheduled session is in the future.
     """
-    latest_booking = db.query(booking.Booking).filter(
-        booking.Booking.practice_id == practice_id
-    ).order_by(
-        booking.Booking.practice_date.desc(),
-        booking.Booking.end_time.desc()
-    ).first()
-
-    if not latest_booking:
-        return True 
-
-    now = datetime.utcnow()
-    today_utc = now.date()
-    now_time_utc = now.time()
-
-    booking_date = latest_booking.practice_date
-    booking_end_time = latest_booking.end_time
-
-    if booking_date > today_utc:
-        return True
-
-    if booking_date < today_utc:
-        return False
-
-    return booking_end_time > now_time_utc
+    return _practice_flag(db, practice_id, _practice_editable())
 
 def delete_future_bookings_for_practice(db: Session, practice_id: int):
     """
@@ -310,70 +633,14 @@ def is_practice_deletable(db: Session, practice_id: int) -> bool:
     Checks if a practice can be deleted. A practice is deletable only if the start
     time of its earliest scheduled session is in the future.
     """
-    earliest_booking = db.query(booking.Booking).filter(
-        booking.Booking.practice_id == practice_id
-    ).order_by(
-        booking.Booking.practice_date.asc(),
-        booking.Booking.start_time.asc()
-    ).first()
-
-    if not earliest_booking:
-        return True 
-
-    now = datetime.utcnow()
-    today_utc = now.date()
-    now_time_utc = now.time()
-
-    booking_date = earliest_booking.practice_date
-    booking_start_time = earliest_booking.start_time
-
-    if booking_date > today_utc:
-        return True
-    
-    if booking_date < today_utc:
-        return False
-
-    return booking_start_time > now_time_utc
+    return _practice_flag(db, practice_id, _practice_deletable())
 
 def get_teacher_weekly_schedule(db: Session, teacher_id: int):
     """
-    Fetches the full weekly schedule for a teacher, organized by day of the week.
-    NOW INCLUDES the schedule_type (CLASS or PRACTICE).
+    Fetches the full weekly schedule for a teacher, organized by day of the week,
+    including the schedule_type (CLASS or PRACTICE). Served from the versioned projection cache.
     """
-    schedules_query = (
-        db.query(
-            schedule.Schedule.day_of_week,
-            schedule.Schedule.start_time,
-            schedule.Schedule.end_time,
-            subject.Subject.subject_name,
-            group.Group.group_name,
-            group.Group.group_id,
-            schedule.Schedule.schedule_type  
-        )
-        .join(subject.Subject, schedule.Schedule.subject_id == subject.Subject.subject_id)
-        .join(group.Group, schedule.Schedule.group_id == group.Group.group_id)
-        .filter(schedule.Schedule.teacher_id == teacher_id)
-        .order_by(schedule.Schedule.day_of_week, schedule.Schedule.start_time)
-        .all()
-    )
-
-    weekly_schedule = {
-        1: [], 2: [], 3: [], 4: [], 5: []
-    }
-
-    for item in schedules_query:
-        if item.day_of_week in weekly_schedule:
-            weekly_schedule[item.day_of_week].append({
-                "start_time": item.start_time,
-                "end_time": item.end_time,
-                "subject_name": item.subject_name,
-                "group_name": item.group_name,
-                "group_id": item.group_id,
-                "schedule_type": item.schedule_type
-            })
-
-    day_map = {1: "monday", 2: "tuesday", 3: "wednesday", 4: "thursday", 5: "friday"}
-    return {day_map[day]: schedule_list for day, schedule_list in weekly_schedule.items()}
+    return schedule_projection.get_schedule_projection(db, teacher_id).weekly
 
 def count_practices_for_subject(db: Session, teacher_id: int, subject_name: str) -> str:
     """
@@ -391,82 +658,163 @@ def count_practices_for_subject(db: Session, teacher_id: int, subject_name: str)
 
     return f"The teacher has {practice_count} practices for the subject '{subject_name}'."
 
-def get_monthly_practice_progress(db: Session, teacher_id: int):
+MAX_PROGRESS_MONTHS = 24
+
+def parse_month(value: str) -> tuple[int, int]:
+    """Parses "YYYY-MM" into (year, month). Raises ValueError when malformed."""
+    try:
+        year, month = (int(part) for part in value.split("-"))
+    except ValueError:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM.")
+    if not 1 <= month <= 12 or not 1 <= year <= 9999:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM.")
+    return year, month
+
+def parse_month_span(start: str, end: str) -> tuple[tuple[int, int], tuple[int, int]]:
+    """Validates a "YYYY-MM".."YYYY-MM" span of at most MAX_PROGRESS_MONTHS months."""
+    start_month, end_month = parse_month(start), parse_month(end)
+    if end_month < start_month:
+        raise ValueError("'end' must not be before 'start'.")
+    if len(month_range(start_month, end_month)) > MAX_PROGRESS_MONTHS:
+        raise ValueError(f"A progress range can span at most {MAX_PROGRESS_MONTHS} months.")
+    return start_month, end_month
+
+def month_range(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """(year, month) pairs from `start` to `end`, both inclusive."""
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def weekday_counts(year: int, month: int) -> dict[int, int]:
+    """How many times each day_of_week (1 = Monday ... 7 = Sunday) occurs in the month."""
+    num_days = monthrange(year, month)[1]
+    first_weekday = date(year, month, 1).weekday()
+    full_weeks, extra_days = divmod(num_days, 7)
+    return {
+        day_of_week: full_weeks + (1 if (day_of_week - 1 - first_weekday) % 7 < extra_days else 0)
+        for day_of_week in range(1, 8)
+    }
+
+def get_practice_progress_by_month(db: Session, teacher_id: int, months: list[tuple[int, int]]):
     """
-    Calculates the number of completed practices vs. the total goal for the current month,
-    for each subject taught by the teacher, with a breakdown per group.
+    Completed practices vs. goal for each of the teacher's subjects, with a breakdown per
+    group, for every (year, month) in `months`. Returns {(year, month): [subject progress]}.
+
+    Runs two queries whatever the number of subjects, groups or months: the teacher's
+    schedule slots, and completed bookings counted per subject, group and month. A
+    booking is completed once its date is before today.
+    The goal of a subject is the number of dates in the month that fall on one of its
+    practice weekdays. Each weekday is credited to the first group (by name) that
+    practices on it, so group goals add up to the subject goal.
     """
-    
-    def count_specific_days_in_month(year, month, day_of_week):
-        python_day_of_week = day_of_week - 1
-        count = 0
-        num_days_in_month = monthrange(year, month)[1]
-        for day_num in range(1, num_days_in_month + 1):
-            if date(year, month, day_num).weekday() == python_day_of_week:
-                count += 1
-        return count
+    if not months:
+        return {}
+
+    slots = db.query(
+        subject.Subject.subject_id,
+        subject.Subject.subject_name,
+        group.Group.group_id,
+        group.Group.group_name,
+        schedule.Schedule.day_of_week,
+        schedule.Schedule.schedule_type,
+    ).join(
+        subject.Subject, schedule.Schedule.subject_id == subject.Subject.subject_id
+    ).join(
+        group.Group, schedule.Schedule.group_id == group.Group.group_id
+    ).filter(
+        schedule.Schedule.teacher_id == teacher_id
+    ).distinct().order_by(
+        subject.Subject.subject_name, group.Group.group_name, schedule.Schedule.day_of_week
+    ).all()
 
     today = date.today()
-    current_year = today.year
-    current_month = today.month
-    start_of_month = date(current_year, current_month, 1)
-    
-    final_results = []
-    teacher_subjects = get_subjects_by_teacher(db, teacher_id=teacher_id)
-
-    for subj in teacher_subjects:
-        groups_for_subject = db.query(group.Group).join(schedule.Schedule).filter(
-            schedule.Schedule.teacher_id == teacher_id,
-            schedule.Schedule.subject_id == subj.subject_id
-        ).distinct().all()
-
-        groups_progress_list = []
-        subject_total_goal = 0
-        subject_total_completed = 0
-        counted_practice_days_for_subject = set()
-
-        for grp in groups_for_subject:
-            group_goal = 0
-
-            practice_schedules = db.query(schedule.Schedule).filter(
-                schedule.Schedule.teacher_id == teacher_id,
-                schedule.Schedule.subject_id == subj.subject_id,
-                schedule.Schedule.group_id == grp.group_id,
-                schedule.Schedule.schedule_type == schedule.ScheduleType.PRACTICE
-            ).all()
-
-            for sched in practice_schedules:
-                if sched.day_of_week not in counted_practice_days_for_subject:
-                    num_days = count_specific_days_in_month(current_year, current_month, sched.day_of_week)
-                    group_goal += num_days
-                    counted_practice_days_for_subject.add(sched.day_of_week)
-
-            group_completed = db.query(func.count(booking.Booking.booking_id)).join(
-                practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
-            ).filter(
-                practice.Practice.teacher_id == teacher_id,
-                practice.Practice.subject_id == subj.subject_id,
-                booking.Booking.group_id == grp.group_id,
-                booking.Booking.practice_date >= start_of_month,
-                booking.Booking.practice_date < today
-            ).scalar() or 0
-            
-            subject_total_goal += group_goal 
-            subject_total_completed += group_completed
-
-            if group_goal > 0 or group_completed > 0:
-                groups_progress_list.append({
-                    "group_name": grp.group_name,
-                    "completed_count": group_completed,
-                    "total_goal": group_goal
+    first_year, first_month = months[0]
+    last_year, last_month = months[-1]
+    range_start = date(first_year, first_month, 1)
+    # Exclusive end: the day after the last month, or today. Taking the min before adding
+    # the day keeps December 9999 from overflowing date.
+    range_end = min(date(last_year, last_month, monthrange(last_year, last_month)[1]), today - timedelta(days=1)) + timedelta(days=1)
+
+    completed_counts = {}
+    if range_start < range_end:
+        booking_year = func.extract("year", booking.Booking.practice_date)
+        booking_month = func.extract("month", booking.Booking.practice_date)
+        rows = db.query(
+            practice.Practice.subject_id,
+            booking.Booking.group_id,
+            booking_year.label("year"),
+            booking_month.label("month"),
+            func.count(booking.Booking.booking_id).label("completed"),
+        ).join(
+            practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+        ).filter(
+            practice.Practice.teacher_id == teacher_id,
+            booking.Booking.practice_date >= range_start,
+            booking.Booking.practice_date < range_end,
+        ).group_by(
+            practice.Practice.subject_id, booking.Booking.group_id, booking_year, booking_month
+        ).all()
+        completed_counts = {
+            (row.subject_id, row.group_id, int(row.year), int(row.month)): row.completed for row in rows
+        }
+
+    # subject_id -> (subject_name, {group_id: (group_name, practice weekdays claimed by this group)})
+    subjects_plan = {}
+    claimed_days = defaultdict(set)
+    for row in slots:
+        _, groups_plan = subjects_plan.setdefault(row.subject_id, (row.subject_name, {}))
+        _, group_days = groups_plan.setdefault(row.group_id, (row.group_name, []))
+        if row.schedule_type == schedule.ScheduleType.PRACTICE and row.day_of_week not in claimed_days[row.subject_id]:
+            claimed_days[row.subject_id].add(row.day_of_week)
+            group_days.append(row.day_of_week)
+
+    progress = {}
+    for year, month in months:
+        days_in_month = weekday_counts(year, month)
+        month_results = []
+        for subject_id, (subject_name, groups_plan) in subjects_plan.items():
+            groups_progress_list = []
+            subject_total_goal = 0
+            subject_total_completed = 0
+            for group_id, (group_name, group_days) in groups_plan.items():
+                group_goal = sum(days_in_month[day] for day in group_days)
+                group_completed = completed_counts.get((subject_id, group_id, year, month), 0)
+                subject_total_goal += group_goal
+                subject_total_completed += group_completed
+                if group_goal > 0 or group_completed > 0:
+                    groups_progress_list.append({
+                        "group_name": group_name,
+                        "completed_count": group_completed,
+                        "total_goal": group_goal
+                    })
+
+            if subject_total_goal > 0:
+                month_results.append({
+                    "subject_name": subject_name,
+                    "total_completed": subject_total_completed,
+                    "total_goal": subject_total_goal,
+                    "groups_progress": groups_progress_list
                 })
+        progress[(year, month)] = month_results
+    return progress
 
-        if subject_total_goal > 0:
-            final_results.append({
-                "subject_name": subj.subject_name,
-                "total_completed": subject_total_completed,
-                "total_goal": subject_total_goal,
-                "groups_progress": groups_progress_list
-            })
-
-    return final_results
\ No newline at end of file
+def get_monthly_practice_progress(db: Session, teacher_id: int, year: int | None = None, month: int | None = None):
+    """
+    Calculates the number of completed practices vs. the total goal for one month
+    (the current one by default), for each subject taught by the teacher, with a
+    breakdown per group.
+    """
+    today = date.today()
+    target = (year or today.year, month or today.month)
+    return get_practice_progress_by_month(db, teacher_id, [target])[target]
+
+def get_practice_progress_series(db: Session, teacher_id: int, start: tuple[int, int], end: tuple[int, int]):
+    """Monthly progress for every month from `start` to `end` (inclusive), oldest first."""
+    progress = get_practice_progress_by_month(db, teacher_id, month_range(start, end))
+    return [
+        {"year": year, "month": month, "subjects": subjects}
+        for (year, month), subjects in progress.items()
+    ]
\ No newline at end of file
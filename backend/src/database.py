@@ -1,15 +1,70 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request
 from src.core.config import settings
+from src.core import replica_guard
+from src.core.pool_metrics import (
+    TimedQueuePool, TimedAsyncAdaptedQueuePool, TimedReplicaQueuePool, TimedAsyncReplicaQueuePool, register_pool_metrics
+)
 
-# Create the SQLAlchemy engine that will connect to our database
-# The 'pool_pre_ping=True' checks if the connection is alive before using it.
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+# statement_timeout is a per-connection server setting; each driver takes it differently.
+SYNC_CONNECT_ARGS = {}
+ASYNC_CONNECT_ARGS = {}
+if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    SYNC_CONNECT_ARGS["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    ASYNC_CONNECT_ARGS["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+# Create the SQLAlchemy engine that will connect to our database.
+# Pool sizing, recycling and pre-ping come from Settings (see DB_POOL_* in config.py).
+engine = create_engine(settings.DATABASE_URL, poolclass=TimedQueuePool, connect_args=SYNC_CONNECT_ARGS, **POOL_OPTIONS)
+register_pool_metrics(engine, "primary")
 
 # Create a SessionLocal class. Each instance of this class will be a new database session.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The same database reached through asyncpg, for endpoints declared with `async def`.
+# Their queries then wait on the event loop instead of holding a threadpool worker.
+ASYNC_DATABASE_URL = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, connect_args=ASYNC_CONNECT_ARGS, **POOL_OPTIONS)
+register_pool_metrics(async_engine.sync_engine, "async")
+
+# expire_on_commit=False keeps loaded objects usable after the session is closed,
+# since async code cannot lazy-load expired attributes.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica. Without DATABASE_REPLICA_URL the read sessions are bound to the
+# primary engines, so get_read_db behaves exactly like get_db.
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, poolclass=TimedReplicaQueuePool, connect_args=SYNC_CONNECT_ARGS, **POOL_OPTIONS)
+    register_pool_metrics(replica_engine, "replica")
+    async_replica_engine = create_async_engine(
+        make_url(settings.DATABASE_REPLICA_URL).set(drivername="postgresql+asyncpg"),
+        poolclass=TimedAsyncReplicaQueuePool, connect_args=ASYNC_CONNECT_ARGS, **POOL_OPTIONS
+    )
+    register_pool_metrics(async_replica_engine.sync_engine, "replica_async")
+else:
+    replica_engine = engine
+    async_replica_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
+# Every engine of this process by pool name, for the admin pool report.
+ENGINES = {"primary": engine, "async": async_engine.sync_engine}
+if settings.DATABASE_REPLICA_URL:
+    ENGINES.update({"replica": replica_engine, "replica_async": async_replica_engine.sync_engine})
+
 # Create a Base class. Our database model classes will inherit from this.
 Base = declarative_base()
 
@@ -21,4 +76,28 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async counterpart of get_db, to be used only from `async def` endpoints.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Read-only dependencies. They use the replica unless this client wrote within the
+# last REPLICA_STALENESS_SECONDS, in which case the read goes to the primary.
+# Never write through these sessions.
+def get_read_db(request: Request):
+    factory = SessionLocal if replica_guard.recently_wrote(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_async_read_sessionmaker(request: Request):
+    """The factory behind get_async_read_db, for endpoints that run several sessions concurrently."""
+    return AsyncSessionLocal if replica_guard.recently_wrote(request) else AsyncReadSessionLocal
+
+async def get_async_read_db(request: Request):
+    async with get_async_read_sessionmaker(request)() as db:
+        yield db
\ No newline at end of file
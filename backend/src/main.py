@@ -1,28 +1,46 @@
-from fastapi import FastAPI
+import asyncio
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from src.database import engine, Base, SessionLocal
+from src.database import engine, async_engine, ENGINES, SessionLocal
 from src.models import (
-    teacher, subject, group, room, schedule, practice, booking, activity_log, announcement
+    teacher, subject, group, room, schedule, practice, booking, activity_log, announcement, session_stats
 )
 from src.api.api import api_router
-from src.initial_data import seed_initial_data 
-
-# This creates the database tables
-Base.metadata.create_all(bind=engine)
+from src.core import replica_guard, query_stats, metrics
+from src.core.config import settings
+from src.services import session_stats as session_stats_service, dashboard_cache, activity_log_buffer
 
-# --- RUN THE SEEDING SCRIPT ---
-# We create a temporary database session to run our seeding logic.
-db = SessionLocal()
-try:
-    seed_initial_data(db)
-finally:
-    db.close()
-# -----------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # No DDL and no seeding here: the schema is managed by `python -m src.manage migrate`
+    # and `python -m src.manage seed`, which run once per deploy instead of once per worker.
+    background_tasks = []
+    if settings.SESSION_STATS_SWEEP_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(session_stats_service.run_periodically(SessionLocal)))
+    if settings.DASHBOARD_CACHE_ENABLED:
+        background_tasks.append(asyncio.create_task(dashboard_cache.listen_for_changes()))
+    if settings.ACTIVITY_LOG_BUFFER_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(activity_log_buffer.run_periodically(SessionLocal)))
+    print(f"Application startup complete in {(time.perf_counter() - _import_started) * 1000:.0f} ms.")
+    yield
+    for task in background_tasks:
+        task.cancel()
+    # Lets the tasks finish their shutdown work (the activity log buffer's last flush).
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    engine.dispose()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Computer Lab Management API",
     description="API for managing lab schedules, practices, and bookings.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 development_origin_regex = r"http://(localhost|127\.0\.0\.1|192.168\..*|10\..*|172\..*):5173"
@@ -33,9 +51,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"]
+    expose_headers=["Content-Disposition", "Server-Timing", "X-DB-Queries", "X-DB-Time-Ms", "X-Next-Cursor", "ETag"]
 )
 
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    @app.middleware("http")
+    async def instrument_sql(request: Request, call_next):
+        stats, token = query_stats.start_request()
+        try:
+            response = await call_next(request)
+        finally:
+            query_stats.end_request(token)
+
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_ms:.1f}"
+        response.headers["Server-Timing"] = f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+        if stats.count:
+            print(f"SQL: {request.method} {request.url.path} -> {stats.count} queries in {stats.total_ms:.1f} ms")
+        for shape, repeats in stats.repeated_shapes(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            print(f"WARNING: possible N+1 in {request.method} {request.url.path}: statement ran {repeats} times: {shape[:300]}")
+        return response
+
+if settings.DATABASE_REPLICA_URL:
+    @app.middleware("http")
+    async def route_reads_after_writes_to_primary(request: Request, call_next):
+        # A successful write pins this client's read-only endpoints to the primary
+        # for REPLICA_STALENESS_SECONDS, so it never reads its own change from a lagging replica.
+        response = await call_next(request)
+        if request.method in replica_guard.WRITE_METHODS and response.status_code < 400:
+            replica_guard.mark_write(request)
+        return response
+
+if settings.METRICS_ENABLED:
+    metrics.register_pool_gauges(ENGINES)
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Label by route template (/api/practices/{practice_id}), not the raw path, to keep series bounded.
+            route = request.scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            metrics.http_request_duration_seconds.observe(time.perf_counter() - started, method=request.method, route=route_path)
+            metrics.http_requests_total.inc(method=request.method, route=route_path, status=str(status_code))
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "Welcome to the new Computer Lab Management API!"}
@@ -0,0 +1,229 @@
+"""
+Operational commands for the backend. Run them from /app (the backend root):
+
+    python -m src.manage migrate        # create or upgrade the schema to the latest migration
+    python -m src.manage seed           # insert the initial data (idempotent)
+    python -m src.manage sweep-session-stats  # fold newly completed sessions into the dashboard counters
+    python -m src.manage log-partitions # create the upcoming monthly activity_logs partitions
+    python -m src.manage archive-logs   # archive and drop activity_logs partitions past retention
+        [--keep-months 12 --archive-dir /app/archive/activity_logs --dry-run]
+    python -m src.manage startup-time   # measure how long `src.main` takes to become ready
+        [--max-import-ms 1500 --max-rss-mb 150]  # ...and fail if it is over budget
+
+The API process itself never touches the schema; run `migrate` and `seed` once per
+deploy, before starting uvicorn.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import textwrap
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "alembic.ini")
+
+# Held while migrating or seeding so concurrent deploys (or several containers) queue
+# up instead of racing each other on DDL and on the seed rows.
+SCHEMA_LOCK_ID = 727_001
+
+
+def _alembic_config(connection):
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    return config
+
+
+def migrate():
+    """
+    Brings the database to the latest schema.
+    - Empty database: creates every table from the models and stamps it at head.
+    - Database created before migrations existed (tables but no alembic_version):
+      runs every migration; they are written to be idempotent against such a schema.
+    - Otherwise: upgrades to head.
+    """
+    from alembic import command
+    from sqlalchemy import inspect, text
+    from src.core.config import settings
+    from src.database import engine, Base
+    from src.services import activity_log_partitions
+    from src.models import (
+        teacher, subject, group, room, schedule, practice, booking, activity_log, announcement, session_stats
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        try:
+            config = _alembic_config(connection)
+            tables = set(inspect(connection).get_table_names())
+            if not tables & set(Base.metadata.tables):
+                print("Empty database. Creating schema from models...")
+                Base.metadata.create_all(bind=connection)
+                connection.commit()
+                command.stamp(config, "head")
+            else:
+                if "alembic_version" not in tables:
+                    print("Existing schema without migration history. Applying all migrations...")
+                command.upgrade(config, "head")
+            connection.commit()
+            created = activity_log_partitions.ensure_partitions(connection, settings.ACTIVITY_LOG_PARTITIONS_AHEAD)
+            connection.commit()
+            if created:
+                print(f"Created activity log partitions: {', '.join(created)}")
+            print("Database schema is up to date.")
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SCHEMA_LOCK_ID})
+            connection.commit()
+
+
+def seed():
+    """Runs seed_initial_data once, serialized with other migrate/seed runs."""
+    from sqlalchemy import text
+    from src.database import SessionLocal
+    from src.initial_data import seed_initial_data
+
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        seed_initial_data(db)
+    finally:
+        db.close()
+
+
+def sweep_session_stats():
+    """Runs one sweep of the dashboard's completed-session counters (for cron, or with the in-process sweeper off)."""
+    from src.database import SessionLocal
+    from src.services import session_stats
+
+    db = SessionLocal()
+    try:
+        swept = session_stats.sweep(db)
+    finally:
+        db.close()
+    if swept is None:
+        print("Another sweep is running; nothing to do.")
+    else:
+        print(f"Folded {swept} newly completed session(s) into the dashboard counters.")
+
+
+def log_partitions():
+    """Creates the monthly activity_logs partitions for the next ACTIVITY_LOG_PARTITIONS_AHEAD months."""
+    from src.core.config import settings
+    from src.database import engine
+    from src.services import activity_log_partitions
+
+    with engine.begin() as connection:
+        created = activity_log_partitions.ensure_partitions(connection, settings.ACTIVITY_LOG_PARTITIONS_AHEAD)
+    print(f"Created: {', '.join(created)}" if created else "All activity log partitions already exist.")
+
+
+def archive_logs(keep_months: int, archive_dir: str, dry_run: bool):
+    """Archives activity_logs partitions older than `keep_months` months to compressed CSV and drops them."""
+    from src.database import engine
+    from src.services import activity_log_partitions
+
+    archived = activity_log_partitions.archive_old_partitions(engine, keep_months, archive_dir, dry_run=dry_run)
+    for name, path in archived:
+        print(f"{'Would archive' if dry_run else 'Archived'} {name} -> {path}")
+    if not archived:
+        print(f"No activity log partitions older than {keep_months} month(s).")
+
+
+# Executed in a fresh interpreter so every run pays the real cold-import cost.
+# Prints: import ms, lifespan startup ms, peak RSS in MB, heavy AI packages loaded (or "-").
+STARTUP_PROBE = textwrap.dedent("""
+    import asyncio, resource, sys, time
+    started = time.perf_counter()
+    import src.main
+    from src.services.ai_stack import HEAVY_MODULES
+    imported = time.perf_counter()
+
+    async def run_lifespan():
+        async with src.main.app.router.lifespan_context(src.main.app):
+            return time.perf_counter()
+
+    ready = asyncio.run(run_lifespan())
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"{(imported - started) * 1000:.1f} {(ready - imported) * 1000:.1f} {rss_mb:.1f} {','.join(loaded) or '-'}")
+""")
+
+
+def startup_time(runs: int, max_import_ms: float | None, max_rss_mb: float | None) -> int:
+    """
+    Imports src.main and runs its lifespan startup in `runs` fresh processes and reports
+    the timings and peak memory. Returns a non-zero exit code when a budget is exceeded
+    or when starting the API imported any of the lazily loaded AI packages.
+    """
+    backend_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    import_ms, lifespan_ms, rss_mb, heavy_loaded = [], [], [], set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE], cwd=backend_root, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(result.stderr, file=sys.stderr)
+            return result.returncode
+        imported, ready, rss, loaded = result.stdout.strip().splitlines()[-1].split()
+        import_ms.append(float(imported))
+        lifespan_ms.append(float(ready))
+        rss_mb.append(float(rss))
+        if loaded != "-":
+            heavy_loaded.update(loaded.split(","))
+
+    median_import = statistics.median(import_ms)
+    median_rss = statistics.median(rss_mb)
+    print(f"Startup over {runs} run(s): median import {median_import:.1f} ms "
+          f"(min {min(import_ms):.1f}), median lifespan startup {statistics.median(lifespan_ms):.1f} ms, "
+          f"median peak RSS {median_rss:.1f} MB")
+
+    failures = []
+    if heavy_loaded:
+        failures.append(f"AI packages imported at startup: {', '.join(sorted(heavy_loaded))}")
+    if max_import_ms is not None and median_import > max_import_ms:
+        failures.append(f"import time {median_import:.1f} ms exceeds the {max_import_ms:.0f} ms budget")
+    if max_rss_mb is not None and median_rss > max_rss_mb:
+        failures.append(f"peak RSS {median_rss:.1f} MB exceeds the {max_rss_mb:.0f} MB budget")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.manage", description="Backend management commands.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("migrate", help="Create or upgrade the database schema.")
+    subcommands.add_parser("seed", help="Insert the initial data if it is missing.")
+    subcommands.add_parser("sweep-session-stats", help="Fold newly completed sessions into the dashboard counters.")
+    subcommands.add_parser("log-partitions", help="Create the upcoming monthly activity_logs partitions.")
+    archive_parser = subcommands.add_parser("archive-logs", help="Archive and drop activity_logs partitions past retention.")
+    archive_parser.add_argument("--keep-months", type=int, help="Months to keep, including the current one (default: ACTIVITY_LOG_RETENTION_MONTHS).")
+    archive_parser.add_argument("--archive-dir", help="Where the .csv.gz archives go (default: ACTIVITY_LOG_ARCHIVE_DIR).")
+    archive_parser.add_argument("--dry-run", action="store_true", help="Only list the partitions that would be archived.")
+    startup_parser = subcommands.add_parser("startup-time", help="Measure application import and startup time.")
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.add_argument("--max-import-ms", type=float, help="Fail if the median import time is above this.")
+    startup_parser.add_argument("--max-rss-mb", type=float, help="Fail if the median peak RSS is above this.")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate()
+    elif args.command == "seed":
+        seed()
+    elif args.command == "sweep-session-stats":
+        sweep_session_stats()
+    elif args.command == "log-partitions":
+        log_partitions()
+    elif args.command == "archive-logs":
+        from src.core.config import settings
+        keep_months = args.keep_months or settings.ACTIVITY_LOG_RETENTION_MONTHS
+        if keep_months < 1:
+            parser.error("--keep-months must be at least 1")
+        archive_logs(keep_months, args.archive_dir or settings.ACTIVITY_LOG_ARCHIVE_DIR, args.dry_run)
+    elif args.command == "startup-time":
+        sys.exit(startup_time(args.runs, args.max_import_ms, args.max_rss_mb))
+
+
+if __name__ == "__main__":
+    main()
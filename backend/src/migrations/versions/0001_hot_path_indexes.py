@@ -0,0 +1,40 @@
+"""Add composite and BRIN indexes for the booking, schedule and dashboard hot paths.
+
+The base tables are created from the models by `Base.metadata.create_all`, so this
+revision only adds the secondary indexes. Every index is created with IF NOT EXISTS
+because databases bootstrapped after this change already get them from the models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns, extra keyword arguments)
+INDEXES = [
+    ("ix_bookings_room_id_practice_date_start_time", "bookings", ["room_id", "practice_date", "start_time"], {}),
+    ("ix_bookings_group_id_practice_date_start_time", "bookings", ["group_id", "practice_date", "start_time"], {}),
+    ("ix_bookings_practice_id", "bookings", ["practice_id"], {}),
+    ("ix_bookings_practice_date_brin", "bookings", ["practice_date"], {"postgresql_using": "brin"}),
+    ("ix_schedules_teacher_id_day_of_week_start_time", "schedules", ["teacher_id", "day_of_week", "start_time"], {}),
+    ("ix_schedules_group_id_day_of_week", "schedules", ["group_id", "day_of_week"], {}),
+    ("ix_practices_teacher_id_subject_id", "practices", ["teacher_id", "subject_id"], {}),
+    ("ix_practices_subject_id", "practices", ["subject_id"], {}),
+    ("ix_activity_logs_teacher_id_timestamp", "activity_logs", ["teacher_id", "timestamp"], {}),
+    ("ix_announcements_created_at", "announcements", ["created_at"], {}),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table, _columns, _kwargs in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,58 @@
+"""Add generated, indexed starts_at/ends_at columns to bookings.
+
+Both columns are STORED generated columns derived from the local practice date and
+times in the lab's timezone (settings.APP_TIMEZONE, the same value the model's Computed
+expressions use), so adding them backfills every existing row.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+from sqlalchemy import text
+from src.core.config import settings
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+APP_TIMEZONE = settings.APP_TIMEZONE
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _existing_expression(conn, column: str) -> str | None:
+    return conn.execute(text(
+        "SELECT pg_get_expr(d.adbin, d.adrelid) FROM pg_attrdef d "
+        "JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+        "WHERE d.adrelid = to_regclass('bookings') AND a.attname = :column"
+    ), {"column": column}).scalar()
+
+
+def upgrade() -> None:
+    if not _is_offline():
+        # ADD COLUMN IF NOT EXISTS would silently keep columns generated with another timezone.
+        for column in ("starts_at", "ends_at"):
+            expression = _existing_expression(op.get_bind(), column)
+            if expression is not None and f"'{APP_TIMEZONE}'" not in expression:
+                raise RuntimeError(
+                    f"bookings.{column} is generated as {expression}, which does not use "
+                    f"APP_TIMEZONE={APP_TIMEZONE}. Drop the column or fix APP_TIMEZONE, then migrate again."
+                )
+    op.execute(
+        "ALTER TABLE bookings "
+        f"ADD COLUMN IF NOT EXISTS starts_at TIMESTAMP WITH TIME ZONE GENERATED ALWAYS AS (timezone('{APP_TIMEZONE}', practice_date + start_time)) STORED, "
+        f"ADD COLUMN IF NOT EXISTS ends_at TIMESTAMP WITH TIME ZONE GENERATED ALWAYS AS (timezone('{APP_TIMEZONE}', practice_date + end_time)) STORED"
+    )
+    op.create_index("ix_bookings_starts_at", "bookings", ["starts_at"], if_not_exists=True)
+    op.create_index("ix_bookings_ends_at", "bookings", ["ends_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_ends_at", table_name="bookings", if_exists=True)
+    op.drop_index("ix_bookings_starts_at", table_name="bookings", if_exists=True)
+    op.drop_column("bookings", "ends_at")
+    op.drop_column("bookings", "starts_at")
@@ -0,0 +1,74 @@
+"""Enforce non-overlapping bookings per room and per group with GiST exclusion constraints.
+
+Adds a generated tsrange column covering each session and two exclusion constraints,
+(room_id WITH =, session_range WITH &&) and (group_id WITH =, session_range WITH &&).
+The upgrade refuses to run while overlapping bookings exist, listing how many
+pairs collide so they can be cleaned up first.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+CONSTRAINTS = {
+    "ex_bookings_room_overlap": "room_id",
+    "ex_bookings_group_overlap": "group_id",
+}
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _count_overlapping_pairs(conn, column: str) -> int:
+    return conn.execute(sa.text(
+        "SELECT count(*) FROM bookings a JOIN bookings b "
+        f"ON a.booking_id < b.booking_id AND a.{column} = b.{column} "
+        "AND a.practice_date = b.practice_date "
+        "AND a.start_time < b.end_time AND b.start_time < a.end_time"
+    )).scalar()
+
+
+def _constraint_exists(conn, name: str) -> bool:
+    return conn.execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": name}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE bookings ADD COLUMN IF NOT EXISTS session_range TSRANGE "
+        "GENERATED ALWAYS AS (tsrange(practice_date + start_time, practice_date + end_time)) STORED"
+    )
+
+    if not _is_offline():
+        overlaps = {column: _count_overlapping_pairs(conn, column) for column in CONSTRAINTS.values()}
+        if any(overlaps.values()):
+            raise RuntimeError(
+                "Cannot add booking overlap constraints: found "
+                f"{overlaps['room_id']} overlapping room booking pair(s) and "
+                f"{overlaps['group_id']} overlapping group booking pair(s). "
+                "Resolve them before upgrading."
+            )
+
+    for name, column in CONSTRAINTS.items():
+        if _is_offline() or not _constraint_exists(conn, name):
+            op.execute(
+                f"ALTER TABLE bookings ADD CONSTRAINT {name} "
+                f"EXCLUDE USING gist ({column} WITH =, session_range WITH &&)"
+            )
+
+
+def downgrade() -> None:
+    for name in CONSTRAINTS:
+        op.execute(f"ALTER TABLE bookings DROP CONSTRAINT IF EXISTS {name}")
+    op.drop_column("bookings", "session_range")
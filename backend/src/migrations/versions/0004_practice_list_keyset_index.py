@@ -0,0 +1,23 @@
+"""Index the newest-first practice list used by keyset pagination.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_practices_teacher_id_created_at_practice_id", "practices",
+        ["teacher_id", "created_at", "practice_id"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_practices_teacher_id_created_at_practice_id", table_name="practices", if_exists=True)
@@ -0,0 +1,22 @@
+"""Add teachers.schedule_version, bumped whenever a teacher's weekly schedule changes.
+
+The cached weekly-schedule projection and its ETag are keyed by this version.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE teachers ADD COLUMN IF NOT EXISTS schedule_version INTEGER NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    op.drop_column("teachers", "schedule_version")
@@ -0,0 +1,139 @@
+"""Add trigger-maintained completed-session and practice counters for the dashboard.
+
+Creates teacher_session_stats, group_session_stats and subject_practice_stats, the
+single-row session_stats_watermark, and the triggers on bookings and practices that keep
+them current. Existing data is backfilled up to the watermark, which starts at now().
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION session_stats_apply(p_practice_id integer, p_group_id integer, p_delta integer)
+RETURNS void AS $$
+DECLARE
+    v_teacher_id integer;
+BEGIN
+    SELECT teacher_id INTO v_teacher_id FROM practices WHERE practice_id = p_practice_id;
+    IF v_teacher_id IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO teacher_session_stats AS s (teacher_id, completed_sessions) VALUES (v_teacher_id, p_delta)
+    ON CONFLICT (teacher_id) DO UPDATE SET completed_sessions = s.completed_sessions + EXCLUDED.completed_sessions;
+    IF p_group_id IS NOT NULL THEN
+        INSERT INTO group_session_stats AS s (teacher_id, group_id, completed_sessions) VALUES (v_teacher_id, p_group_id, p_delta)
+        ON CONFLICT (teacher_id, group_id) DO UPDATE SET completed_sessions = s.completed_sessions + EXCLUDED.completed_sessions;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BOOKINGS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION bookings_session_stats() RETURNS trigger AS $$
+DECLARE
+    v_completed_through timestamptz;
+BEGIN
+    SELECT completed_through INTO v_completed_through FROM session_stats_watermark FOR SHARE;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.ends_at <= v_completed_through THEN
+        PERFORM session_stats_apply(OLD.practice_id, OLD.group_id, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.ends_at <= v_completed_through THEN
+        PERFORM session_stats_apply(NEW.practice_id, NEW.group_id, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PRACTICES_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION practices_session_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE subject_practice_stats SET practice_count = practice_count - 1
+        WHERE teacher_id = OLD.teacher_id AND subject_id = OLD.subject_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.teacher_id IS NOT NULL AND NEW.subject_id IS NOT NULL THEN
+        INSERT INTO subject_practice_stats AS s (teacher_id, subject_id, practice_count) VALUES (NEW.teacher_id, NEW.subject_id, 1)
+        ON CONFLICT (teacher_id, subject_id) DO UPDATE SET practice_count = s.practice_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS teacher_session_stats ("
+        "teacher_id INTEGER PRIMARY KEY, completed_sessions INTEGER NOT NULL DEFAULT 0)"
+    )
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS group_session_stats ("
+        "teacher_id INTEGER NOT NULL, group_id INTEGER NOT NULL, completed_sessions INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (teacher_id, group_id))"
+    )
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS subject_practice_stats ("
+        "teacher_id INTEGER NOT NULL, subject_id INTEGER NOT NULL, practice_count INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (teacher_id, subject_id))"
+    )
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS session_stats_watermark ("
+        "id SMALLINT PRIMARY KEY DEFAULT 1, completed_through TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+        "CONSTRAINT ck_session_stats_watermark_single_row CHECK (id = 1))"
+    )
+
+    # Blocks booking and practice writes until the backfill commits with the triggers.
+    op.execute("LOCK TABLE bookings, practices IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("TRUNCATE teacher_session_stats, group_session_stats, subject_practice_stats, session_stats_watermark")
+    op.execute("INSERT INTO session_stats_watermark (id, completed_through) VALUES (1, now())")
+    op.execute(
+        "INSERT INTO teacher_session_stats (teacher_id, completed_sessions) "
+        "SELECT p.teacher_id, count(*) FROM bookings b JOIN practices p ON b.practice_id = p.practice_id "
+        "WHERE b.ends_at <= now() AND p.teacher_id IS NOT NULL GROUP BY p.teacher_id"
+    )
+    op.execute(
+        "INSERT INTO group_session_stats (teacher_id, group_id, completed_sessions) "
+        "SELECT p.teacher_id, b.group_id, count(*) FROM bookings b JOIN practices p ON b.practice_id = p.practice_id "
+        "WHERE b.ends_at <= now() AND p.teacher_id IS NOT NULL AND b.group_id IS NOT NULL GROUP BY p.teacher_id, b.group_id"
+    )
+    op.execute(
+        "INSERT INTO subject_practice_stats (teacher_id, subject_id, practice_count) "
+        "SELECT teacher_id, subject_id, count(*) FROM practices "
+        "WHERE teacher_id IS NOT NULL AND subject_id IS NOT NULL GROUP BY teacher_id, subject_id"
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(BOOKINGS_TRIGGER_FUNCTION)
+    op.execute(PRACTICES_TRIGGER_FUNCTION)
+    op.execute("DROP TRIGGER IF EXISTS trg_bookings_session_stats ON bookings")
+    op.execute(
+        "CREATE TRIGGER trg_bookings_session_stats "
+        "AFTER INSERT OR DELETE OR UPDATE OF practice_id, group_id, practice_date, end_time ON bookings "
+        "FOR EACH ROW EXECUTE FUNCTION bookings_session_stats()"
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_practices_session_stats ON practices")
+    op.execute(
+        "CREATE TRIGGER trg_practices_session_stats "
+        "AFTER INSERT OR DELETE OR UPDATE OF teacher_id, subject_id ON practices "
+        "FOR EACH ROW EXECUTE FUNCTION practices_session_stats()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_practices_session_stats ON practices")
+    op.execute("DROP TRIGGER IF EXISTS trg_bookings_session_stats ON bookings")
+    op.execute("DROP FUNCTION IF EXISTS practices_session_stats()")
+    op.execute("DROP FUNCTION IF EXISTS bookings_session_stats()")
+    op.execute("DROP FUNCTION IF EXISTS session_stats_apply(integer, integer, integer)")
+    op.execute("DROP TABLE IF EXISTS session_stats_watermark")
+    op.execute("DROP TABLE IF EXISTS subject_practice_stats")
+    op.execute("DROP TABLE IF EXISTS group_session_stats")
+    op.execute("DROP TABLE IF EXISTS teacher_session_stats")
@@ -0,0 +1,121 @@
+"""Partition activity_logs by month.
+
+Rebuilds activity_logs as a table range-partitioned on timestamp, with one partition per
+UTC month (activity_logs_YYYY_MM) and activity_logs_default for rows outside them. The
+primary key becomes (log_id, timestamp), log_id keeps its sequence, and the
+(teacher_id, timestamp) index is recreated as (teacher_id, timestamp DESC) on every
+partition. Existing rows are copied into the partitions of their months.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+from sqlalchemy import text
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_activity_log_partition(p_month date) RETURNS boolean AS $$
+DECLARE
+    v_month date := date_trunc('month', p_month)::date;
+    v_name text := 'activity_logs_' || to_char(v_month, 'YYYY_MM');
+    v_from timestamptz := v_month::timestamp AT TIME ZONE 'UTC';
+    v_to timestamptz := (v_month + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(v_name) || ' (LIKE activity_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)';
+    IF to_regclass('activity_logs_default') IS NOT NULL THEN
+        EXECUTE 'WITH moved AS (DELETE FROM activity_logs_default WHERE timestamp >= $1 AND timestamp < $2 RETURNING *) '
+            || 'INSERT INTO ' || quote_ident(v_name) || ' SELECT * FROM moved' USING v_from, v_to;
+    END IF;
+    EXECUTE 'ALTER TABLE activity_logs ATTACH PARTITION ' || quote_ident(v_name)
+        || ' FOR VALUES FROM (' || quote_literal(v_from) || ') TO (' || quote_literal(v_to) || ')';
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COLUMNS = "log_id, teacher_id, activity_type, practice_title, timestamp"
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _is_partitioned(conn) -> bool:
+    return conn.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('activity_logs')"
+    )).scalar() or False
+
+
+def upgrade() -> None:
+    if not _is_offline() and _is_partitioned(op.get_bind()):
+        return
+
+    # Blocks log writes until the copy commits with the new table.
+    op.execute("LOCK TABLE activity_logs IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER SEQUENCE activity_logs_log_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_legacy")
+    op.execute("ALTER TABLE activity_logs_legacy RENAME CONSTRAINT activity_logs_pkey TO activity_logs_legacy_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_teacher_id_timestamp")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_log_id")
+
+    op.execute(
+        "CREATE TABLE activity_logs ("
+        "log_id INTEGER NOT NULL DEFAULT nextval('activity_logs_log_id_seq'), "
+        "teacher_id INTEGER NOT NULL REFERENCES teachers (teacher_id), "
+        "activity_type logtype NOT NULL, "
+        "practice_title VARCHAR NOT NULL, "
+        "timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+        "CONSTRAINT activity_logs_pkey PRIMARY KEY (log_id, timestamp)"
+        ") PARTITION BY RANGE (timestamp)"
+    )
+    op.execute("ALTER SEQUENCE activity_logs_log_id_seq OWNED BY activity_logs.log_id")
+    op.execute("CREATE INDEX ix_activity_logs_teacher_id_timestamp ON activity_logs (teacher_id, timestamp DESC)")
+    op.execute("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT")
+    op.execute(ENSURE_PARTITION_FUNCTION)
+
+    # Every month from the oldest entry through three months ahead, so the copy below
+    # lands in monthly partitions rather than the default one.
+    op.execute(
+        "SELECT ensure_activity_log_partition(month::date) FROM generate_series("
+        "date_trunc('month', least(coalesce((SELECT min(timestamp) FROM activity_logs_legacy), now()), now()) AT TIME ZONE 'UTC'), "
+        "date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months', "
+        "interval '1 month') AS month"
+    )
+    op.execute(
+        f"INSERT INTO activity_logs ({COLUMNS}) "
+        "SELECT log_id, teacher_id, activity_type, practice_title, coalesce(timestamp, now()) FROM activity_logs_legacy"
+    )
+    op.execute("DROP TABLE activity_logs_legacy")
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE activity_logs IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER SEQUENCE activity_logs_log_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_partitioned")
+    op.execute("ALTER TABLE activity_logs_partitioned RENAME CONSTRAINT activity_logs_pkey TO activity_logs_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_teacher_id_timestamp")
+
+    op.execute(
+        "CREATE TABLE activity_logs ("
+        "log_id INTEGER NOT NULL DEFAULT nextval('activity_logs_log_id_seq'), "
+        "teacher_id INTEGER NOT NULL REFERENCES teachers (teacher_id), "
+        "activity_type logtype NOT NULL, "
+        "practice_title VARCHAR NOT NULL, "
+        "timestamp TIMESTAMP WITH TIME ZONE DEFAULT now(), "
+        "CONSTRAINT activity_logs_pkey PRIMARY KEY (log_id)"
+        ")"
+    )
+    op.execute("ALTER SEQUENCE activity_logs_log_id_seq OWNED BY activity_logs.log_id")
+    op.execute("CREATE INDEX ix_activity_logs_log_id ON activity_logs (log_id)")
+    op.execute("CREATE INDEX ix_activity_logs_teacher_id_timestamp ON activity_logs (teacher_id, timestamp)")
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_partitioned")
+    op.execute("DROP TABLE activity_logs_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS ensure_activity_log_partition(date)")
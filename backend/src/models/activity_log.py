@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, DDL, event
 from sqlalchemy.sql import func
 from src.database import Base
 import enum
@@ -10,8 +10,53 @@ class LogType(str, enum.Enum):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
-    log_id = Column(Integer, primary_key=True, index=True)
+    log_id = Column(Integer, primary_key=True, autoincrement=True)
     teacher_id = Column(Integer, ForeignKey("teachers.teacher_id"), nullable=False)
     activity_type = Column(Enum(LogType), nullable=False)
     practice_title = Column(String, nullable=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    # Part of the primary key because the table is partitioned by it.
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+
+    __table_args__ = (
+        # Recent activity of one teacher, newest first; built on every partition.
+        Index("ix_activity_logs_teacher_id_timestamp", teacher_id, timestamp.desc()),
+        # One partition per UTC month (activity_logs_YYYY_MM) plus activity_logs_default for
+        # rows outside them. services/activity_log_partitions.py creates upcoming months and
+        # archives old ones.
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+# Creates the partition for the month containing `p_month` if it is missing, moving any of
+# its rows out of the default partition first. Returns whether it was created.
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_activity_log_partition(p_month date) RETURNS boolean AS $$
+DECLARE
+    v_month date := date_trunc('month', p_month)::date;
+    v_name text := 'activity_logs_' || to_char(v_month, 'YYYY_MM');
+    v_from timestamptz := v_month::timestamp AT TIME ZONE 'UTC';
+    v_to timestamptz := (v_month + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(v_name) || ' (LIKE activity_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)';
+    IF to_regclass('activity_logs_default') IS NOT NULL THEN
+        EXECUTE 'WITH moved AS (DELETE FROM activity_logs_default WHERE timestamp >= $1 AND timestamp < $2 RETURNING *) '
+            || 'INSERT INTO ' || quote_ident(v_name) || ' SELECT * FROM moved' USING v_from, v_to;
+    END IF;
+    EXECUTE 'ALTER TABLE activity_logs ATTACH PARTITION ' || quote_ident(v_name)
+        || ' FOR VALUES FROM (' || quote_literal(v_from) || ') TO (' || quote_literal(v_to) || ')';
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Fresh databases are created from the models, so the default partition and the partitions
+# for the current and next three months are created here as well as in migration 0007.
+for _statement in (
+    "CREATE TABLE IF NOT EXISTS activity_logs_default PARTITION OF activity_logs DEFAULT",
+    ENSURE_PARTITION_FUNCTION,
+    "SELECT ensure_activity_log_partition((date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => n))::date) "
+    "FROM generate_series(0, 3) AS n",
+):
+    event.listen(ActivityLog.__table__, "after_create", DDL(_statement))
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database import Base
@@ -15,4 +15,8 @@ class Announcement(Base):
     
     teacher = relationship("Teacher")
     room = relationship("Room")
-    group = relationship("Group")
\ No newline at end of file
+    group = relationship("Group")
+
+    __table_args__ = (
+        Index("ix_announcements_created_at", "created_at"),
+    )
\ No newline at end of file
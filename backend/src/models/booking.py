@@ -1,6 +1,11 @@
-from sqlalchemy import Column, Integer, Date, Time, String, ForeignKey
+from sqlalchemy import Column, Integer, Date, Time, DateTime, String, ForeignKey, Index, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
 from sqlalchemy.orm import relationship
 from src.database import Base
+from src.core.config import settings
+
+ROOM_OVERLAP_CONSTRAINT = "ex_bookings_room_overlap"
+GROUP_OVERLAP_CONSTRAINT = "ex_bookings_group_overlap"
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -12,8 +17,35 @@ class Booking(Base):
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
     status = Column(String, default='Scheduled') # e.g., 'Scheduled', 'Completed', 'Cancelled'
+
+    # Timezone-aware session boundaries, generated by the database from the local
+    # date and times so that "upcoming" and "completed" filters are index range scans.
+    starts_at = Column(DateTime(timezone=True), Computed(f"timezone('{settings.APP_TIMEZONE}', practice_date + start_time)", persisted=True))
+    ends_at = Column(DateTime(timezone=True), Computed(f"timezone('{settings.APP_TIMEZONE}', practice_date + end_time)", persisted=True))
+    # Half-open [start, end) local session range used by the overlap exclusion constraints.
+    session_range = Column(TSRANGE, Computed("tsrange(practice_date + start_time, practice_date + end_time)", persisted=True))
     
     # Relationships
     practice = relationship("Practice", back_populates="bookings")
     group = relationship("Group", back_populates="bookings")
-    room = relationship("Room", back_populates="bookings")
\ No newline at end of file
+    room = relationship("Room", back_populates="bookings")
+
+    __table_args__ = (
+        # Room availability, lab-status timelines and group conflict checks all
+        # filter on (room|group, date) and then compare start/end times.
+        Index("ix_bookings_room_id_practice_date_start_time", "room_id", "practice_date", "start_time"),
+        Index("ix_bookings_group_id_practice_date_start_time", "group_id", "practice_date", "start_time"),
+        Index("ix_bookings_practice_id", "practice_id"),
+        # Bookings are inserted roughly in date order, so a BRIN index keeps
+        # historical range scans cheap at a fraction of a B-tree's size.
+        Index("ix_bookings_practice_date_brin", "practice_date", postgresql_using="brin"),
+        Index("ix_bookings_starts_at", "starts_at"),
+        Index("ix_bookings_ends_at", "ends_at"),
+        # A room or a group can never hold two overlapping sessions. The database
+        # enforces it, so concurrent requests cannot double-book between check and commit.
+        ExcludeConstraint(("room_id", "="), ("session_range", "&&"), name=ROOM_OVERLAP_CONSTRAINT, using="gist"),
+        ExcludeConstraint(("group_id", "="), ("session_range", "&&"), name=GROUP_OVERLAP_CONSTRAINT, using="gist"),
+    )
+
+# The exclusion constraints mix integer equality and range overlap in one GiST index.
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database import Base
@@ -16,4 +16,11 @@ class Practice(Base):
     # Relationships
     teacher = relationship("Teacher", back_populates="practices")
     subject = relationship("Subject", back_populates="practices")
-    bookings = relationship("Booking", back_populates="practice", cascade="all, delete-orphan")
\ No newline at end of file
+    bookings = relationship("Booking", back_populates="practice", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_practices_teacher_id_subject_id", "teacher_id", "subject_id"),
+        Index("ix_practices_subject_id", "subject_id"),
+        # Newest-first practice list and its keyset pagination (created_at, practice_id).
+        Index("ix_practices_teacher_id_created_at_practice_id", "teacher_id", "created_at", "practice_id"),
+    )
\ No newline at end of file
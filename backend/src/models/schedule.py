@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Time, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Time, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 import enum
@@ -23,4 +23,9 @@ class Schedule(Base):
     # Relationships
     teacher = relationship("Teacher", back_populates="schedules")
     subject = relationship("Subject", back_populates="schedules")
-    group = relationship("Group", back_populates="schedules")
\ No newline at end of file
+    group = relationship("Group", back_populates="schedules")
+
+    __table_args__ = (
+        Index("ix_schedules_teacher_id_day_of_week_start_time", "teacher_id", "day_of_week", "start_time"),
+        Index("ix_schedules_group_id_day_of_week", "group_id", "day_of_week"),
+    )
\ No newline at end of file
@@ -0,0 +1,113 @@
+from sqlalchemy import Column, Integer, SmallInteger, DateTime, CheckConstraint, DDL, event, text
+from src.database import Base
+
+# Completed-session counters for the dashboard leaderboard. A booking is counted once its
+# ends_at is at or before session_stats_watermark.completed_through: the triggers below
+# keep the counters right when bookings are written, and the sweeper in
+# services/session_stats.py advances the watermark over sessions that have since ended.
+# Readers add the few bookings that ended after the watermark, so results are always exact.
+
+class TeacherSessionStats(Base):
+    __tablename__ = "teacher_session_stats"
+    teacher_id = Column(Integer, primary_key=True)
+    completed_sessions = Column(Integer, nullable=False, server_default="0")
+
+class GroupSessionStats(Base):
+    __tablename__ = "group_session_stats"
+    teacher_id = Column(Integer, primary_key=True)
+    group_id = Column(Integer, primary_key=True)
+    completed_sessions = Column(Integer, nullable=False, server_default="0")
+
+class SubjectPracticeStats(Base):
+    __tablename__ = "subject_practice_stats"
+    teacher_id = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, primary_key=True)
+    practice_count = Column(Integer, nullable=False, server_default="0")
+
+class SessionStatsWatermark(Base):
+    __tablename__ = "session_stats_watermark"
+    id = Column(SmallInteger, primary_key=True, server_default="1")
+    completed_through = Column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_session_stats_watermark_single_row"),
+    )
+
+# Adds `delta` completed sessions to the practice's teacher and to the group. Sessions are
+# counted under their practice's teacher; practices are never moved to another teacher.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION session_stats_apply(p_practice_id integer, p_group_id integer, p_delta integer)
+RETURNS void AS $$
+DECLARE
+    v_teacher_id integer;
+BEGIN
+    SELECT teacher_id INTO v_teacher_id FROM practices WHERE practice_id = p_practice_id;
+    IF v_teacher_id IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO teacher_session_stats AS s (teacher_id, completed_sessions) VALUES (v_teacher_id, p_delta)
+    ON CONFLICT (teacher_id) DO UPDATE SET completed_sessions = s.completed_sessions + EXCLUDED.completed_sessions;
+    IF p_group_id IS NOT NULL THEN
+        INSERT INTO group_session_stats AS s (teacher_id, group_id, completed_sessions) VALUES (v_teacher_id, p_group_id, p_delta)
+        ON CONFLICT (teacher_id, group_id) DO UPDATE SET completed_sessions = s.completed_sessions + EXCLUDED.completed_sessions;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Only bookings that already ended before the watermark are counted here; the rest are
+# picked up by the sweeper. FOR SHARE waits for a running sweep, so a booking is never
+# missed by both.
+BOOKINGS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION bookings_session_stats() RETURNS trigger AS $$
+DECLARE
+    v_completed_through timestamptz;
+BEGIN
+    SELECT completed_through INTO v_completed_through FROM session_stats_watermark FOR SHARE;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.ends_at <= v_completed_through THEN
+        PERFORM session_stats_apply(OLD.practice_id, OLD.group_id, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.ends_at <= v_completed_through THEN
+        PERFORM session_stats_apply(NEW.practice_id, NEW.group_id, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BOOKINGS_TRIGGER = """
+CREATE TRIGGER trg_bookings_session_stats
+AFTER INSERT OR DELETE OR UPDATE OF practice_id, group_id, practice_date, end_time ON bookings
+FOR EACH ROW EXECUTE FUNCTION bookings_session_stats()
+"""
+
+# Practices per (teacher, subject), for the top-subjects card.
+PRACTICES_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION practices_session_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE subject_practice_stats SET practice_count = practice_count - 1
+        WHERE teacher_id = OLD.teacher_id AND subject_id = OLD.subject_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.teacher_id IS NOT NULL AND NEW.subject_id IS NOT NULL THEN
+        INSERT INTO subject_practice_stats AS s (teacher_id, subject_id, practice_count) VALUES (NEW.teacher_id, NEW.subject_id, 1)
+        ON CONFLICT (teacher_id, subject_id) DO UPDATE SET practice_count = s.practice_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PRACTICES_TRIGGER = """
+CREATE TRIGGER trg_practices_session_stats
+AFTER INSERT OR DELETE OR UPDATE OF teacher_id, subject_id ON practices
+FOR EACH ROW EXECUTE FUNCTION practices_session_stats()
+"""
+
+# Fresh databases are created from the models, so the functions, triggers and the
+# watermark row are installed here as well as in migration 0006.
+event.listen(SessionStatsWatermark.__table__, "after_create", DDL(
+    "INSERT INTO session_stats_watermark (id, completed_through) VALUES (1, now()) ON CONFLICT DO NOTHING"
+))
+for _statement in (APPLY_FUNCTION, BOOKINGS_TRIGGER_FUNCTION, BOOKINGS_TRIGGER, PRACTICES_TRIGGER_FUNCTION, PRACTICES_TRIGGER):
+    event.listen(Base.metadata, "after_create", DDL(_statement))
\ No newline at end of file
@@ -14,6 +14,9 @@ class Teacher(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.teacher)
+    # Incremented on every change to the teacher's weekly schedule; keys the cached
+    # schedule projection and its ETag (see services/schedule_projection.py).
+    schedule_version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     schedules = relationship("Schedule", back_populates="teacher")
@@ -31,4 +31,20 @@ class TeacherUpdateByAdmin(BaseModel):
 
 class RoomUpdate(BaseModel):
     room_name: str
-    capacity: int
\ No newline at end of file
+    capacity: int
+
+class PoolStats(BaseModel):
+    name: str
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    connections_created: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    timeouts: int
+    wait_count: int
+    wait_time_total_ms: float
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
\ No newline at end of file
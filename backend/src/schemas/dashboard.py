@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime, time
+from src.models.activity_log import LogType
 
 class RecentActivity(BaseModel):
     """
@@ -70,4 +71,40 @@ class TopGroup(BaseModel):
         from_attributes = True
 
 class AnnouncementUpdate(BaseModel):
-    description: str
\ No newline at end of file
+    description: str
+
+class ActivityLogEntry(BaseModel):
+    log_id: int
+    teacher_id: int
+    activity_type: LogType
+    practice_title: str
+    timestamp: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class NextPractice(BaseModel):
+    practice_date: date
+    start_time: time
+    title: str
+    group_name: str
+    practice_id: int
+
+class SummaryMeta(BaseModel):
+    sections: List[str]
+    # Wall time of each section and of the whole summary, in milliseconds.
+    timings_ms: Dict[str, float]
+    total_ms: float
+
+class DashboardSummary(BaseModel):
+    """
+    Home-page sections computed in one request. Sections that were not requested are null.
+    """
+    recent_activities: Optional[List[RecentActivity]] = None
+    top_subjects: Optional[List[TopSubject]] = None
+    activity_log: Optional[List[ActivityLogEntry]] = None
+    next_practice: Optional[NextPractice] = None
+    top_groups: Optional[List[TopGroup]] = None
+    announcements: Optional[List[Announcement]] = None
+    position_stats: Optional[PositionStats] = None
+    meta: SummaryMeta
\ No newline at end of file
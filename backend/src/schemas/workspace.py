@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import date, datetime, time
 from src.models.schedule import ScheduleType
@@ -71,14 +71,24 @@ class AvailableRoom(BaseModel):
     class Config:
         from_attributes = True
 
+class RoomAvailabilityBatchRequest(BaseModel):
+    slots: List[RoomAvailabilityRequest] = Field(..., min_length=1, max_length=50)
+
+class SlotAvailability(RoomAvailabilityRequest):
+    rooms: List[AvailableRoom]
+
 class PracticeListItem(BaseModel):
     practice_id: int
     title: str
     subject_name: str
     created_at: datetime
 
-    earliest_session_start: Optional[str] = None
-    latest_session_end: Optional[str] = None
+    # Local wall-clock time of the first session start and the last session end.
+    earliest_session_start: Optional[datetime] = None
+    latest_session_end: Optional[datetime] = None
+    # Editable until the last session ends; deletable until the first one starts.
+    editable: bool
+    deletable: bool
 
     class Config:
         from_attributes = True
@@ -100,6 +110,9 @@ class PracticeDetail(BaseModel):
     created_at: datetime
     file_url: str
     teacher_id: int
+    # Editable until the last session ends; deletable until the first one starts.
+    editable: bool
+    deletable: bool
     bookings: List[BookingDetail]
 
 class BookingUpdate(BaseModel):
@@ -139,4 +152,9 @@ class MonthlyProgress(BaseModel):
     subject_name: str
     total_completed: int
     total_goal: int
-    groups_progress: List[GroupProgress]
\ No newline at end of file
+    groups_progress: List[GroupProgress]
+
+class MonthlyProgressSeriesItem(BaseModel):
+    year: int
+    month: int
+    subjects: List[MonthlyProgress]
\ No newline at end of file
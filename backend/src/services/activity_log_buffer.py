@@ -0,0 +1,98 @@
+"""
+Optional in-process buffer for activity log entries.
+
+By default crud_dashboard.create_log_entry/create_log_entries write entries in the
+caller's transaction. With ACTIVITY_LOG_BUFFER_SECONDS > 0 they are staged on the Session
+instead. They join this worker's buffer when the Session commits and are dropped if it
+rolls back. The buffer is written with one multi-row INSERT every ACTIVITY_LOG_BUFFER_SECONDS,
+as soon as it holds ACTIVITY_LOG_BUFFER_MAX_ENTRIES, and at shutdown.
+
+The trade-off: entries still in the buffer are lost if the process dies. Keep it off where
+every log entry must survive a crash.
+"""
+import asyncio
+import threading
+from datetime import datetime, timezone
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from src.core.config import settings
+from src.models import activity_log
+
+_STAGED_KEY = "activity_log_staged"
+
+
+class ActivityLogBuffer:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Serializes flushes so entries are inserted in the order they were committed.
+        self._flush_lock = threading.Lock()
+        self._entries: list[dict] = []
+
+    def add(self, entries: list[dict]) -> bool:
+        """Appends committed entries. Returns True when the buffer is full and should be flushed."""
+        with self._lock:
+            self._entries.extend(entries)
+            return len(self._entries) >= self.max_entries
+
+    def flush(self, session_factory) -> int:
+        """Writes every buffered entry with one multi-row INSERT. Returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._entries = self._entries, []
+            if not entries:
+                return 0
+            db = session_factory()
+            try:
+                db.execute(insert(activity_log.ActivityLog), entries)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Put them back in front so the next flush retries them.
+                with self._lock:
+                    self._entries[:0] = entries
+                raise
+            finally:
+                db.close()
+            return len(entries)
+
+
+buffer = ActivityLogBuffer(max_entries=settings.ACTIVITY_LOG_BUFFER_MAX_ENTRIES)
+
+
+def stage(db: Session, entries: list[dict]):
+    """Adds entries to the buffer once `db` commits, stamped with the current time."""
+    now = datetime.now(timezone.utc)
+    db.info.setdefault(_STAGED_KEY, []).extend({**entry, "timestamp": now} for entry in entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _buffer_on_commit(session):
+    staged = session.info.pop(_STAGED_KEY, None)
+    if staged and buffer.add(staged):
+        from src.database import SessionLocal
+        try:
+            buffer.flush(SessionLocal)
+        except Exception as e:
+            print(f"WARNING: Could not flush the activity log buffer: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_STAGED_KEY, None)
+
+
+async def run_periodically(session_factory, interval_seconds: float = settings.ACTIVITY_LOG_BUFFER_SECONDS):
+    """Flushes the buffer every `interval_seconds`, and once more when cancelled at shutdown."""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(buffer.flush, session_factory)
+            except Exception as e:
+                print(f"WARNING: Could not flush the activity log buffer: {e}")
+    finally:
+        try:
+            buffer.flush(session_factory)
+        except Exception as e:
+            print(f"WARNING: Could not flush the activity log buffer at shutdown: {e}")
@@ -0,0 +1,121 @@
+"""
+Monthly partitions and retention for activity_logs.
+
+activity_logs is range-partitioned by timestamp into one table per UTC month
+(activity_logs_YYYY_MM), with activity_logs_default catching rows for months that have
+no partition yet. The database function ensure_activity_log_partition creates a month and
+moves its rows out of the default partition.
+
+- ensure_partitions: creates the upcoming months, plus any month that rows in the
+  default partition belong to. It runs on every `manage migrate` and from
+  `manage log-partitions`.
+- archive_old_partitions: writes every partition older than the retention window to a
+  gzip-compressed CSV file, then detaches and drops it. It runs from `manage archive-logs`.
+
+Dropping whole partitions keeps vacuum and backup costs bounded by the retention window.
+It also caps how many partitions a teacher's recent-activity lookup has to visit.
+"""
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+
+PARTITION_NAME = re.compile(r"^activity_logs_(\d{4})_(\d{2})$")
+
+
+def _month_start(months_from_now: int, today: date | None = None) -> date:
+    today = today or datetime.now(timezone.utc).date()
+    index = today.year * 12 + today.month - 1 + months_from_now
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_partitions(connection, months_ahead: int) -> list[str]:
+    """
+    Creates the partitions for the current month, the next `months_ahead` months and every
+    month still held in the default partition. Returns the names created. The caller commits.
+    """
+    months = {_month_start(n) for n in range(months_ahead + 1)}
+    months.update(
+        month for month, in connection.execute(text(
+            "SELECT DISTINCT date_trunc('month', timestamp AT TIME ZONE 'UTC')::date FROM activity_logs_default"
+        ))
+    )
+    created = []
+    for month in sorted(months):
+        if connection.execute(text("SELECT ensure_activity_log_partition(:month)"), {"month": month}).scalar():
+            created.append(f"activity_logs_{month:%Y_%m}")
+    return created
+
+
+def list_partitions(connection) -> list[tuple[str, date]]:
+    """(name, month) of every monthly partition, oldest first. The default partition is not included."""
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'activity_logs'::regclass"
+    )).scalars().all()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _archive_path(archive_dir: str, name: str) -> str:
+    """<name>.csv.gz, or a timestamped variant if a month archived earlier got new rows since."""
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    if os.path.exists(path):
+        path = os.path.join(archive_dir, f"{name}.{datetime.now(timezone.utc):%Y%m%d%H%M%S}.csv.gz")
+    return path
+
+
+def _export_partition(raw_connection, name: str, path: str) -> None:
+    """Writes the partition as gzip-compressed CSV with a header row, creating `path` atomically."""
+    partial_path = path + ".partial"
+    with open(partial_path, "wb") as file:
+        with gzip.GzipFile(fileobj=file, mode="wb") as archive:
+            with raw_connection.cursor() as cursor:
+                cursor.copy_expert(f'COPY (SELECT * FROM "{name}" ORDER BY timestamp, log_id) TO STDOUT WITH (FORMAT csv, HEADER)', archive)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(partial_path, path)
+
+
+def archive_old_partitions(engine, keep_months: int, archive_dir: str, dry_run: bool = False) -> list[tuple[str, str]]:
+    """
+    Archives and drops every monthly partition that ends before the last `keep_months`
+    months (the current month counts as one). Each partition is exported to
+    `archive_dir`/<name>.csv.gz before it is dropped, in its own transaction, so an
+    interrupted run can simply be repeated. Returns (partition, archive path) pairs.
+    """
+    cutoff = _month_start(-(keep_months - 1))
+    with engine.begin() as connection:
+        if not dry_run:
+            # Old rows that landed in the default partition get their own month first.
+            ensure_partitions(connection, months_ahead=0)
+        expired = [(name, month) for name, month in list_partitions(connection) if month < cutoff]
+
+    archived = []
+    for name, _ in expired:
+        if dry_run:
+            archived.append((name, os.path.join(archive_dir, f"{name}.csv.gz")))
+            continue
+        os.makedirs(archive_dir, exist_ok=True)
+        path = _archive_path(archive_dir, name)
+        raw_connection = engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            # Blocks writes to the partition so the export and the drop see the same rows.
+            cursor.execute(f'LOCK TABLE "{name}" IN SHARE MODE')
+            _export_partition(raw_connection, name, path)
+            cursor.execute(f'ALTER TABLE activity_logs DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+        archived.append((name, path))
+    return archived
@@ -0,0 +1,146 @@
+"""
+Lazy facade over the optional AI stack: langchain, FAISS, Ollama and PyMuPDF.
+
+Importing this module is cheap. Each heavy library is imported the first time a
+feature needs it and is then cached for the life of the worker, so processes that
+never serve /chat or /analysis never pay for it. With AI_FEATURES_ENABLED=false
+nothing is ever loaded and callers get AIFeaturesDisabled.
+"""
+import os
+import threading
+from src.core import metrics
+from src.core.config import settings
+
+LLM_MODEL_NAME = "llama3.2"
+OLLAMA_BASE_URL = "http://host.docker.internal:11434"
+VECTOR_STORE_PATH = "/app/vector_store"
+EMBEDDING_MODEL_NAME = "nomic-embed-text"
+
+# Top-level packages that must never be imported just by starting the API.
+HEAVY_MODULES = ("langchain", "langchain_core", "langchain_community", "langchain_ollama", "faiss", "fitz", "ollama")
+
+
+class AIFeaturesDisabled(Exception):
+    """Raised when an AI feature is used while AI_FEATURES_ENABLED is off."""
+
+
+# Guards _build_locks only. Each cached object is built under its own lock, so a factory
+# may itself use cached() for another name (the chat chain needs the LLM, the vector
+# store needs the embeddings) without deadlocking.
+_lock = threading.Lock()
+_build_locks: dict[str, threading.Lock] = {}
+_cache: dict = {}
+# (index file mtime, FAISS store or None) of the last load attempt.
+_vector_store_state: tuple | None = None
+
+
+def ensure_enabled():
+    if not settings.AI_FEATURES_ENABLED:
+        raise AIFeaturesDisabled("AI features are disabled on this server.")
+
+
+def cached(name: str, factory):
+    """Builds an object with `factory` once per worker and returns the same instance afterwards."""
+    ensure_enabled()
+    if name not in _cache:
+        with _build_lock(name):
+            if name not in _cache:
+                _cache[name] = factory()
+    return _cache[name]
+
+
+def _build_lock(name: str) -> threading.Lock:
+    with _lock:
+        return _build_locks.setdefault(name, threading.Lock())
+
+
+def get_llm():
+    def build():
+        from langchain_ollama.llms import OllamaLLM
+        return OllamaLLM(model=LLM_MODEL_NAME, base_url=OLLAMA_BASE_URL)
+    return cached("llm", build)
+
+
+def get_embeddings():
+    def build():
+        from langchain_ollama.embeddings import OllamaEmbeddings
+        return OllamaEmbeddings(model=EMBEDDING_MODEL_NAME, base_url=OLLAMA_BASE_URL)
+    return cached("embeddings", build)
+
+
+def _index_mtime() -> float | None:
+    try:
+        return os.path.getmtime(os.path.join(VECTOR_STORE_PATH, "index.faiss"))
+    except OSError:
+        return None
+
+
+def get_vector_store():
+    """
+    Returns the FAISS store, loading it on first use and again whenever the index on
+    disk has been rebuilt (so every worker picks up a reindex without a restart).
+    Returns None when no index can be loaded; chat then runs without retrieval.
+    """
+    global _vector_store_state
+    ensure_enabled()
+    mtime = _index_mtime()
+    state = _vector_store_state
+    if state is not None and state[0] == mtime:
+        return state[1]
+
+    with _build_lock("vector_store"):
+        if _vector_store_state is not None and _vector_store_state[0] == mtime:
+            return _vector_store_state[1]
+        vector_store = None
+        try:
+            print("Attempting to load FAISS vector store...")
+            from langchain_community.vectorstores import FAISS
+            vector_store = FAISS.load_local(
+                VECTOR_STORE_PATH,
+                get_embeddings(),
+                allow_dangerous_deserialization=True
+            )
+            print("FAISS vector store loaded successfully.")
+        except Exception as e:
+            print(f"WARNING: Could not load FAISS vector store from '{VECTOR_STORE_PATH}'. The chat assistant will function without retrieval capabilities. Error: {e}")
+        _vector_store_state = (mtime, vector_store)
+        return vector_store
+
+
+def ollama_chat(operation: str, **kwargs):
+    """ollama.chat, imported on first use, with its latency and token counts recorded under `operation`."""
+    ensure_enabled()
+    import ollama
+    with metrics.ollama_request_duration_seconds.time(operation=operation):
+        response = ollama.chat(**kwargs)
+    metrics.record_ollama_tokens(operation, response.get("prompt_eval_count"), response.get("eval_count"))
+    return response
+
+
+def ollama_token_callback(operation: str):
+    """
+    A langchain callback handler that records the prompt/completion token counts
+    Ollama reports for every LLM call of a chain.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class OllamaTokenCallback(BaseCallbackHandler):
+        def on_llm_end(self, response, **kwargs):
+            for generations in response.generations:
+                for generation in generations:
+                    info = generation.generation_info or {}
+                    metrics.record_ollama_tokens(operation, info.get("prompt_eval_count"), info.get("eval_count"))
+
+    return OllamaTokenCallback()
+
+
+def extract_pdf_text(file_bytes: bytes) -> str:
+    """Concatenated text of every page of a PDF, using PyMuPDF imported on first use."""
+    ensure_enabled()
+    import fitz
+    full_text = ""
+    with metrics.pdf_extraction_duration_seconds.time():
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            for page in doc:
+                full_text += page.get_text()
+    return full_text
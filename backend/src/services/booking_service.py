@@ -0,0 +1,194 @@
+"""
+In-process occupancy index of the bookings table.
+
+For every date that has been asked about, the index keeps each room's sessions as
+sorted, non-overlapping [start, end) intervals, so "is this room free?" is answered with
+a bisect instead of a query. Group conflicts are left to the exclusion constraint on
+bookings, which already reports them when a session is written.
+
+- Dates are loaded lazily with one query each and kept for OCCUPANCY_INDEX_TTL_SECONDS,
+  which bounds how stale a worker can be after writes made by other workers/processes.
+- Writes made through a Session of this worker are applied when that session commits:
+  rows staged by create_bookings are added in place, other booking writes (ORM flushes,
+  bulk UPDATE/DELETE) invalidate the affected dates, and changes to rooms, groups,
+  practices or teachers drop the whole index. On rollback the touched dates are reloaded.
+- The index only answers read-side checks. The exclusion constraints on bookings remain
+  the authority when a session is actually written.
+"""
+import threading
+import time as time_module
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+from datetime import date, time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.core.config import settings
+from src.models import booking, room, group, practice, teacher
+
+# Deleting one of these removes its bookings too.
+_CASCADING_CLASSES = (group.Group, practice.Practice, teacher.Teacher)
+_PENDING_KEY = "occupancy_pending"
+
+
+class _DayOccupancy:
+    """Sessions of one date, per room: sorted lists of (start, end, booking_id)."""
+    def __init__(self, loaded_at: float):
+        self.loaded_at = loaded_at
+        self.rooms: dict[int, list] = defaultdict(list)
+
+    def add(self, room_id: int, start_time: time, end_time: time, booking_id: int | None):
+        insort(self.rooms[room_id], (start_time, end_time, booking_id))
+
+    @staticmethod
+    def find_overlap(intervals: list, start_time: time, end_time: time):
+        """The interval overlapping [start_time, end_time), or None. Intervals never overlap each other."""
+        # Every interval before `index` starts before end_time; since they are disjoint and
+        # sorted, only the last of them can still be running at start_time.
+        index = bisect_left(intervals, (end_time,))
+        if index and intervals[index - 1][1] > start_time:
+            return intervals[index - 1]
+        return None
+
+
+class OccupancyIndex:
+    def __init__(self, ttl_seconds: float, max_days: int = 400):
+        self.ttl_seconds = ttl_seconds
+        self.max_days = max_days
+        self._lock = threading.Lock()
+        self._days: OrderedDict[date, _DayOccupancy] = OrderedDict()
+        self._rooms: tuple[float, list[dict]] | None = None
+        # Bumped by every write that invalidates the whole index, and per date by writes to
+        # that date. A load only stores what it read if neither moved while it was reading,
+        # so a commit landing mid-load is never overwritten by the older snapshot.
+        self._generation = 0
+        self._date_versions: dict[date, int] = defaultdict(int)
+
+    # --- Reads ---
+
+    def _day(self, db: Session, practice_date: date) -> _DayOccupancy:
+        now = time_module.monotonic()
+        with self._lock:
+            day = self._days.get(practice_date)
+            if day is not None and now - day.loaded_at < self.ttl_seconds:
+                self._days.move_to_end(practice_date)
+                return day
+            versions = (self._generation, self._date_versions.get(practice_date, 0))
+
+        rows = db.query(
+            booking.Booking.booking_id, booking.Booking.room_id, booking.Booking.start_time, booking.Booking.end_time
+        ).filter(booking.Booking.practice_date == practice_date).all()
+        day = _DayOccupancy(now)
+        for row in rows:
+            day.add(row.room_id, row.start_time, row.end_time, row.booking_id)
+
+        with self._lock:
+            if versions != (self._generation, self._date_versions.get(practice_date, 0)):
+                # Written since the read began: answer from it once, but don't keep it.
+                return day
+            self._days[practice_date] = day
+            self._days.move_to_end(practice_date)
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+        return day
+
+    def _all_rooms(self, db: Session) -> list[dict]:
+        now = time_module.monotonic()
+        with self._lock:
+            cached = self._rooms
+            generation = self._generation
+        if cached is not None and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+        rooms = [
+            {"room_id": r.room_id, "room_name": r.room_name, "capacity": r.capacity}
+            for r in db.query(room.Room.room_id, room.Room.room_name, room.Room.capacity).order_by(room.Room.room_id)
+        ]
+        with self._lock:
+            if generation == self._generation:
+                self._rooms = (now, rooms)
+        return rooms
+
+    def available_rooms(self, db: Session, practice_date: date, start_time: time, end_time: time) -> list[dict]:
+        day = self._day(db, practice_date)
+        return [
+            r for r in self._all_rooms(db)
+            if _DayOccupancy.find_overlap(day.rooms.get(r["room_id"], []), start_time, end_time) is None
+        ]
+
+    # --- Writes ---
+
+    def apply(self, added: list[dict], dates: set, everything: bool):
+        with self._lock:
+            if everything:
+                self._generation += 1
+                self._date_versions.clear()
+                self._days.clear()
+                self._rooms = None
+                return
+            for practice_date in dates | {row["practice_date"] for row in added}:
+                self._date_versions[practice_date] += 1
+            for practice_date in dates:
+                self._days.pop(practice_date, None)
+            for row in added:
+                day = self._days.get(row["practice_date"])
+                if day is None:
+                    continue
+                if _DayOccupancy.find_overlap(day.rooms.get(row["room_id"], []), row["start_time"], row["end_time"]):
+                    # Already there (the date was loaded inside the writing transaction): reload it.
+                    self._days.pop(row["practice_date"], None)
+                    continue
+                day.add(row["room_id"], row["start_time"], row["end_time"], None)
+
+    def invalidate(self):
+        self.apply([], set(), everything=True)
+
+
+occupancy = OccupancyIndex(ttl_seconds=settings.OCCUPANCY_INDEX_TTL_SECONDS)
+
+
+def _pending(db: Session) -> dict:
+    return db.info.setdefault(_PENDING_KEY, {"added": [], "dates": set(), "everything": False})
+
+
+def stage_added_bookings(db: Session, rows: list[dict]):
+    """Records bookings inserted in `db`'s transaction; they enter the index when it commits."""
+    _pending(db)["added"].extend(rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_changes(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, booking.Booking):
+            pending = _pending(session)
+            pending["dates"].add(obj.practice_date)
+            # An update may have moved the session away from another date.
+            pending["dates"].update(d for d in inspect(obj).attrs.practice_date.history.deleted if d is not None)
+        elif isinstance(obj, room.Room) or (obj in session.deleted and isinstance(obj, _CASCADING_CLASSES)):
+            _pending(session)["everything"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    if mapper.class_ in (booking.Booking, room.Room) or (orm_execute_state.is_delete and mapper.class_ in _CASCADING_CLASSES):
+        _pending(orm_execute_state.session)["everything"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and settings.OCCUPANCY_INDEX_ENABLED:
+        occupancy.apply(pending["added"], pending["dates"], pending["everything"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    # A rollback can also undo a savepoint whose rows were already staged, so the
+    # dates they touched are reloaded rather than trusted.
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and settings.OCCUPANCY_INDEX_ENABLED:
+        dates = pending["dates"] | {row["practice_date"] for row in pending["added"]}
+        occupancy.apply([], dates, pending["everything"])
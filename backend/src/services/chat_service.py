@@ -17,8 +17,8 @@ def get_all_subjects_for_teacher(db: Session, teacher_id: int):
 
 def count_all_practices_for_teacher(db: Session, teacher_id: int):
     """Counts the total number of practices the teacher has created."""
-    practices = crud_workspace.get_practices_for_teacher(db, teacher_id)
-    return f"The teacher has created a total of {len(practices)} practices."
+    total = crud_workspace.count_practices_for_teacher(db, teacher_id)
+    return f"The teacher has created a total of {total} practices."
 
 def general_profile_query(db: Session, teacher_id: int):
     """
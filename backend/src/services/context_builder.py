@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session, joinedload
 from collections import defaultdict
 from src.models import teacher, subject, group, room, schedule, practice, booking
 from datetime import date
+from src.services import schedule_projection
 
 TRANSLATIONS = {
     'en': {
@@ -175,21 +176,18 @@ def build_teacher_context_string(db: Session, teacher_id: int, lang: str = 'en')
 
     # 2. Weekly Schedule
     day_map_keys = {1: "day_monday", 2: "day_tuesday", 3: "day_wednesday", 4: "day_thursday", 5: "day_friday"}
-    teacher_schedules = db.query(schedule.Schedule).options(
-        joinedload(schedule.Schedule.subject),
-        joinedload(schedule.Schedule.group)
-    ).filter(schedule.Schedule.teacher_id == teacher_id).order_by(
-        schedule.Schedule.day_of_week, schedule.Schedule.start_time
-    ).all()
+    teacher_schedules = schedule_projection.get_schedule_projection(
+        db, teacher_id, version=db_teacher.schedule_version
+    ).rows
     
     weekly_schedule_by_day = defaultdict(list)
     for s in teacher_schedules:
         schedule_type_translation = t.get('type_class', 'Class') if s.schedule_type.value == 'CLASS' else t.get('type_practice', 'Practice')
         entry = f"--- " + t['schedule_entry'].format(
-            group_name=s.group.group_name,
+            group_name=s.group_name,
             start_time=s.start_time.strftime('%H:%M'),
             end_time=s.end_time.strftime('%H:%M'),
-            subject_name=s.subject.subject_name,
+            subject_name=s.subject_name,
             schedule_type=schedule_type_translation
         )
         weekly_schedule_by_day[t[day_map_keys[s.day_of_week]]].append(entry)
@@ -208,12 +206,12 @@ def build_teacher_context_string(db: Session, teacher_id: int, lang: str = 'en')
     subjects_by_name = defaultdict(list)
     for s in teacher_schedules:
         entry = f"--- " + t['subject_entry'].format(
-            group_name=s.group.group_name,
+            group_name=s.group_name,
             day_name=t[day_map_keys[s.day_of_week]],
             start_time=s.start_time.strftime('%H:%M'),
             end_time=s.end_time.strftime('%H:%M')
         )
-        subjects_by_name[s.subject.subject_name].append(entry)
+        subjects_by_name[s.subject_name].append(entry)
 
     subjects_lines = [f"{t['subjects_header']}:"]
     for subject_name, entries in sorted(subjects_by_name.items()):
@@ -225,12 +223,12 @@ def build_teacher_context_string(db: Session, teacher_id: int, lang: str = 'en')
     groups_by_name = defaultdict(list)
     for s in teacher_schedules:
         entry = f"--- " + t['group_entry'].format(
-            subject_name=s.subject.subject_name,
+            subject_name=s.subject_name,
             day_name=t[day_map_keys[s.day_of_week]],
             start_time=s.start_time.strftime('%H:%M'),
             end_time=s.end_time.strftime('%H:%M')
         )
-        groups_by_name[s.group.group_name].append(entry)
+        groups_by_name[s.group_name].append(entry)
     
     groups_lines = [f"{t['groups_header']}:"]
     for group_name, entries in sorted(groups_by_name.items()):
@@ -0,0 +1,223 @@
+"""
+Per-teacher cache of the dashboard sections.
+
+Dashboard figures only change when something is written or when a session starts or
+ends. Each cached section therefore carries the moment it can next change on its own (the
+next practice's start, the next session's end, the next week or month) and is dropped
+then, or as soon as a write touches what it was computed from.
+
+- Writes made through any Session are tracked with session events. On commit they
+  invalidate this worker's cache and are announced on the DASHBOARD_CHANNEL with
+  NOTIFY, inside the same transaction, so every other worker drops its entries too.
+- Every worker LISTENs on that channel (`listen_for_changes`, a lifespan task). The cache
+  only serves entries while the listener is connected, and starts empty after reconnecting.
+- Only results read from the primary are stored: a lagging replica could otherwise
+  cache data older than an invalidation that already arrived.
+"""
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from src.core.config import settings
+from src.database import async_engine
+from src.models import activity_log, announcement, booking, group, practice, room, subject, teacher
+
+DASHBOARD_CHANNEL = "dashboard_changes"
+# NOTIFY payloads must stay below 8000 bytes; larger change sets drop everything.
+MAX_PAYLOAD_BYTES = 7000
+EVERYTHING = "*"
+_PENDING_KEY = "dashboard_pending"
+
+# Sections derived from practices and bookings. Ranks and totals span every teacher, so a
+# booking written by anyone invalidates them for all teachers.
+SESSION_SECTIONS = ("next_practice", "top_groups", "position_stats", "top_subjects", "recent_activities")
+# Names shown on the dashboard come from these tables; they change rarely, so any write
+# drops the whole cache.
+_NAMED_CLASSES = (teacher.Teacher, group.Group, subject.Subject, room.Room)
+
+
+class DashboardCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.listening = False
+        self.generation = 0
+        self._lock = threading.Lock()
+        # (section, teacher_id or None) -> (expires_at or None, value)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+
+    @property
+    def active(self) -> bool:
+        return settings.DASHBOARD_CACHE_ENABLED and self.listening
+
+    def get(self, section: str, teacher_id: int | None):
+        """(True, value) for a live entry, else (False, None)."""
+        key = (section, teacher_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at is not None and datetime.now(timezone.utc) >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, section: str, teacher_id: int | None, value, expires_at: datetime | None, generation: int):
+        """Stores `value` unless something was invalidated since `generation` was read."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[(section, teacher_id)] = (expires_at, value)
+            self._entries.move_to_end((section, teacher_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, changes):
+        """Drops the entries named by `changes`: (section, teacher_id) pairs, a None teacher meaning every teacher, or EVERYTHING."""
+        with self._lock:
+            self.generation += 1
+            if changes == EVERYTHING:
+                self._entries.clear()
+                return
+            for section, teacher_id in changes:
+                if teacher_id is not None:
+                    self._entries.pop((section, teacher_id), None)
+                else:
+                    for key in [key for key in self._entries if key[0] == section]:
+                        del self._entries[key]
+
+    def clear(self):
+        self.invalidate(EVERYTHING)
+
+
+cache = DashboardCache(max_entries=settings.DASHBOARD_CACHE_MAX_ENTRIES)
+
+
+async def cached(section: str, teacher_id: int | None, db, load):
+    """
+    The section's value from the cache, or from `await load()`, which returns
+    (value, expires_at or None) and is stored when it was read from the primary.
+    """
+    if not cache.active:
+        value, _ = await load()
+        return value
+    hit, value = cache.get(section, teacher_id)
+    if hit:
+        return value
+    generation = cache.generation
+    value, expires_at = await load()
+    if db.bind is async_engine:
+        cache.put(section, teacher_id, value, expires_at, generation)
+    return value
+
+
+# --- Tracking writes ---
+
+def _pending(session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {"changes": set(), "everything": False})
+
+
+def _record(session, cls, obj=None):
+    pending = _pending(session)
+    if issubclass(cls, (booking.Booking, practice.Practice)):
+        pending["changes"].update((section, None) for section in SESSION_SECTIONS)
+    elif issubclass(cls, activity_log.ActivityLog):
+        pending["changes"].add(("activity_log", getattr(obj, "teacher_id", None)))
+    elif issubclass(cls, announcement.Announcement):
+        pending["changes"].add(("announcements", None))
+    elif issubclass(cls, _NAMED_CLASSES):
+        pending["everything"] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_changes(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _record(session, type(obj), obj)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _record(orm_execute_state.session, mapper.class_)
+
+
+def _payload(pending: dict) -> str:
+    if pending["everything"]:
+        return EVERYTHING
+    payload = json.dumps(sorted(pending["changes"], key=lambda change: (change[0], change[1] or 0)))
+    return payload if len(payload) < MAX_PAYLOAD_BYTES else EVERYTHING
+
+
+@event.listens_for(Session, "before_commit")
+def _announce_changes(session):
+    if not settings.DASHBOARD_CACHE_ENABLED:
+        return
+    # Flush now so changes still pending in the session are part of the announcement.
+    session.flush()
+    pending = session.info.get(_PENDING_KEY)
+    if pending and (pending["changes"] or pending["everything"]):
+        session.connection().execute(select(func.pg_notify(DASHBOARD_CHANNEL, _payload(pending))))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and (pending["changes"] or pending["everything"]):
+        cache.invalidate(EVERYTHING if pending["everything"] else pending["changes"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --- Listening to other workers ---
+
+def _on_notification(connection, pid, channel, payload):
+    if payload == EVERYTHING:
+        cache.clear()
+    else:
+        cache.invalidate([(section, teacher_id) for section, teacher_id in json.loads(payload)])
+
+
+async def listen_for_changes(ping_seconds: float = 30, retry_seconds: float = 5):
+    """
+    Keeps a LISTEN connection on DASHBOARD_CHANNEL and applies every notification to the
+    cache. Meant to run as a lifespan task; the cache serves entries only while connected.
+    """
+    import asyncpg
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(DASHBOARD_CHANNEL, _on_notification)
+            cache.clear()
+            cache.listening = True
+            print("Dashboard cache: listening for changes.")
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=ping_seconds)
+                except asyncio.TimeoutError:
+                    await connection.execute("SELECT 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"WARNING: Dashboard cache listener disconnected, serving uncached until it reconnects: {e}")
+        finally:
+            cache.listening = False
+            cache.clear()
+            if connection is not None and not connection.is_closed():
+                connection.terminate()
+        await asyncio.sleep(retry_seconds)
@@ -0,0 +1,124 @@
+"""
+The home-page dashboard in one request.
+
+Each section below produces exactly what its own /dashboard/<section> endpoint returns,
+through the per-teacher cache in services/dashboard_cache.py.
+`build_summary` runs the requested sections concurrently, each on its own AsyncSession
+(one session cannot run two statements at once), with at most
+DASHBOARD_SUMMARY_MAX_CONNECTIONS of them holding a pooled connection at a time.
+"""
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.crud import crud_data, crud_dashboard
+from src.services import dashboard_cache
+
+
+async def recent_activities(db: AsyncSession, teacher_id: int):
+    async def load():
+        return await crud_data.get_recent_activities_async(db=db, limit=10), None
+    return await dashboard_cache.cached("recent_activities", None, db, load)
+
+
+async def top_subjects(db: AsyncSession, teacher_id: int):
+    async def load():
+        rows = await crud_dashboard.get_top_subjects_async(db=db, teacher_id=teacher_id, limit=3)
+        return [{"subject_name": item.subject_name, "practice_count": item.practice_count} for item in rows], None
+    return await dashboard_cache.cached("top_subjects", teacher_id, db, load)
+
+
+async def activity_log(db: AsyncSession, teacher_id: int):
+    async def load():
+        return await crud_dashboard.get_recent_logs_for_teacher_async(db, teacher_id=teacher_id), None
+    return await dashboard_cache.cached("activity_log", teacher_id, db, load)
+
+
+async def next_practice(db: AsyncSession, teacher_id: int):
+    async def load():
+        row = await crud_dashboard.get_next_practice_for_teacher_async(db, teacher_id=teacher_id)
+        if not row:
+            return None, None
+        # Once it starts, the following practice becomes the next one.
+        return {
+            "practice_date": row.practice_date,
+            "start_time": row.start_time,
+            "title": row.title,
+            "group_name": row.group_name,
+            "practice_id": row.practice_id
+        }, row.starts_at
+    return await dashboard_cache.cached("next_practice", teacher_id, db, load)
+
+
+async def top_groups(db: AsyncSession, teacher_id: int):
+    async def load():
+        rows = await crud_dashboard.get_top_performing_groups_async(db, teacher_id=teacher_id)
+        expires_at = await crud_dashboard.get_next_session_end_async(db, teacher_id=teacher_id)
+        return [{"group_name": item.group_name, "completed_sessions": item.completed_sessions} for item in rows], expires_at
+    return await dashboard_cache.cached("top_groups", teacher_id, db, load)
+
+
+async def announcements(db: AsyncSession, teacher_id: int):
+    async def load():
+        return await crud_dashboard.get_announcements_async(db, limit=1), None
+    return await dashboard_cache.cached("announcements", None, db, load)
+
+
+async def position_stats(db: AsyncSession, teacher_id: int):
+    async def load():
+        stats = await crud_dashboard.get_teacher_position_stats_async(db, teacher_id=teacher_id)
+        # Ranks and totals change whenever anyone's session ends, and the weekly and
+        # monthly figures reset at the start of the next week or month.
+        next_end = await crud_dashboard.get_next_session_end_async(db)
+        next_period = crud_dashboard.next_period_start()
+        return stats, min(next_end, next_period) if next_end else next_period
+    return await dashboard_cache.cached("position_stats", teacher_id, db, load)
+
+
+SECTIONS = {
+    "recent_activities": recent_activities,
+    "top_subjects": top_subjects,
+    "activity_log": activity_log,
+    "next_practice": next_practice,
+    "top_groups": top_groups,
+    "announcements": announcements,
+    "position_stats": position_stats,
+}
+
+
+def parse_sections(sections: str | None) -> list[str]:
+    """Section names from a comma-separated list; every section when empty. Raises ValueError on unknown names."""
+    if not sections:
+        return list(SECTIONS)
+    requested = list(dict.fromkeys(name.strip() for name in sections.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown dashboard section(s): {', '.join(unknown)}. Valid sections: {', '.join(SECTIONS)}.")
+    return requested
+
+
+async def build_summary(session_factory, teacher_id: int, sections: list[str]) -> dict:
+    """
+    Runs `sections` concurrently and returns {section: result, ..., "meta": {...}} with the
+    wall time of each section and of the whole summary in milliseconds.
+    """
+    started = time.perf_counter()
+    limit = asyncio.Semaphore(max(1, settings.DASHBOARD_SUMMARY_MAX_CONNECTIONS))
+    timings_ms = {}
+
+    async def run(name: str):
+        async with limit:
+            section_started = time.perf_counter()
+            async with session_factory() as db:
+                result = await SECTIONS[name](db, teacher_id)
+            timings_ms[name] = round((time.perf_counter() - section_started) * 1000, 1)
+            return result
+
+    results = await asyncio.gather(*(run(name) for name in sections))
+    summary = dict(zip(sections, results))
+    summary["meta"] = {
+        "sections": sections,
+        "timings_ms": timings_ms,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return summary
@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from src.core.config import settings
+from src.core import metrics
 from datetime import date
 from typing import List
 
@@ -100,12 +101,15 @@ def send_password_reset_email(recipient_email: str, new_password: str, lang: str
     message.attach(part2)
 
     try:
-        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-        server.starttls()
-        server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
-        server.sendmail(settings.EMAIL_ADDRESS, recipient_email, message.as_string())
+        with metrics.smtp_send_duration_seconds.time(kind="password_reset"):
+            server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
+            server.starttls()
+            server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
+            server.sendmail(settings.EMAIL_ADDRESS, recipient_email, message.as_string())
+        metrics.smtp_send_total.inc(kind="password_reset", outcome="sent")
         print(f"Password reset email sent successfully to {recipient_email} in language: {lang}")
     except Exception as e:
+        metrics.smtp_send_total.inc(kind="password_reset", outcome="failed")
         print(f"Failed to send email: {e}")
     finally:
         if 'server' in locals() and server:
@@ -191,12 +195,15 @@ def send_export_email(
     message.attach(part)
 
     try:
-        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-        server.starttls()
-        server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
-        server.sendmail(settings.EMAIL_ADDRESS, recipients, message.as_string())
+        with metrics.smtp_send_duration_seconds.time(kind="export"):
+            server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
+            server.starttls()
+            server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
+            server.sendmail(settings.EMAIL_ADDRESS, recipients, message.as_string())
+        metrics.smtp_send_total.inc(kind="export", outcome="sent")
         print(f"Data export email sent successfully to {recipients}")
     except Exception as e:
+        metrics.smtp_send_total.inc(kind="export", outcome="failed")
         print(f"Failed to send email: {e}")
         raise e
     finally:
@@ -0,0 +1,133 @@
+"""
+Cached, versioned projection of a teacher's weekly schedule.
+
+The schedule only changes through onboarding and the admin teacher editor, both of
+which call bump_schedule_version. Every read first fetches teachers.schedule_version
+(a primary-key lookup) and reuses the projection cached for that version, so workers
+never serve a stale schedule and the three-table join runs once per change. The
+version also makes a cheap ETag for /workspace/schedule.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+from sqlalchemy.orm import Session
+from src.models import schedule, subject, group, teacher
+
+MAX_CACHED_TEACHERS = 1000
+
+
+class ScheduleRow(NamedTuple):
+    day_of_week: int
+    start_time: object
+    end_time: object
+    schedule_type: schedule.ScheduleType
+    subject_id: int
+    subject_name: str
+    group_id: int
+    group_name: str
+
+
+class ScheduleProjection(NamedTuple):
+    teacher_id: int
+    version: int
+    # Ordered by day of week and start time.
+    rows: tuple[ScheduleRow, ...]
+    # WeeklySchedule shape (monday..friday).
+    weekly: dict
+
+    @property
+    def etag(self) -> str:
+        return schedule_etag(self.teacher_id, self.version)
+
+
+_lock = threading.Lock()
+_cache: OrderedDict[int, ScheduleProjection] = OrderedDict()
+
+
+def schedule_etag(teacher_id: int, version: int) -> str:
+    return f'W/"schedule-{teacher_id}-{version}"'
+
+
+def build_weekly_schedule(schedule_rows):
+    """
+    Arranges schedule rows (day_of_week, start_time, end_time, subject_name, group_name,
+    group_id, schedule_type), already ordered by day and start time, into the WeeklySchedule shape.
+    """
+    weekly_schedule = {
+        1: [], 2: [], 3: [], 4: [], 5: []
+    }
+
+    for item in schedule_rows:
+        if item.day_of_week in weekly_schedule:
+            weekly_schedule[item.day_of_week].append({
+                "start_time": item.start_time,
+                "end_time": item.end_time,
+                "subject_name": item.subject_name,
+                "group_name": item.group_name,
+                "group_id": item.group_id,
+                "schedule_type": item.schedule_type
+            })
+
+    day_map = {1: "monday", 2: "tuesday", 3: "wednesday", 4: "thursday", 5: "friday"}
+    return {day_map[day]: schedule_list for day, schedule_list in weekly_schedule.items()}
+
+
+def get_schedule_version(db: Session, teacher_id: int) -> int | None:
+    """Current schedule version of the teacher, or None if the teacher does not exist."""
+    return db.query(teacher.Teacher.schedule_version).filter(teacher.Teacher.teacher_id == teacher_id).scalar()
+
+
+def bump_schedule_version(db: Session, teacher_id: int):
+    """Marks the teacher's schedule as changed. Takes effect when the caller commits."""
+    db.query(teacher.Teacher).filter(teacher.Teacher.teacher_id == teacher_id).update(
+        {teacher.Teacher.schedule_version: teacher.Teacher.schedule_version + 1}, synchronize_session=False
+    )
+    with _lock:
+        _cache.pop(teacher_id, None)
+
+
+def _load_rows(db: Session, teacher_id: int) -> tuple[ScheduleRow, ...]:
+    rows = (
+        db.query(
+            schedule.Schedule.day_of_week,
+            schedule.Schedule.start_time,
+            schedule.Schedule.end_time,
+            schedule.Schedule.schedule_type,
+            subject.Subject.subject_id,
+            subject.Subject.subject_name,
+            group.Group.group_id,
+            group.Group.group_name,
+        )
+        .join(subject.Subject, schedule.Schedule.subject_id == subject.Subject.subject_id)
+        .join(group.Group, schedule.Schedule.group_id == group.Group.group_id)
+        .filter(schedule.Schedule.teacher_id == teacher_id)
+        .order_by(schedule.Schedule.day_of_week, schedule.Schedule.start_time)
+        .all()
+    )
+    return tuple(ScheduleRow(*row) for row in rows)
+
+
+def get_schedule_projection(db: Session, teacher_id: int, version: int | None = None) -> ScheduleProjection:
+    """
+    The teacher's weekly schedule at its current version, from the cache when possible.
+    Pass `version` when the caller already read it.
+    """
+    if version is None:
+        version = get_schedule_version(db, teacher_id) or 0
+    with _lock:
+        cached = _cache.get(teacher_id)
+        if cached is not None and cached.version == version:
+            _cache.move_to_end(teacher_id)
+            return cached
+
+    rows = _load_rows(db, teacher_id)
+    projection = ScheduleProjection(teacher_id, version, rows, build_weekly_schedule(rows))
+    with _lock:
+        current = _cache.get(teacher_id)
+        # A concurrent request may already have cached a newer version.
+        if current is None or current.version <= version:
+            _cache[teacher_id] = projection
+            _cache.move_to_end(teacher_id)
+            while len(_cache) > MAX_CACHED_TEACHERS:
+                _cache.popitem(last=False)
+    return projection
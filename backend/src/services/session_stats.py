@@ -0,0 +1,90 @@
+"""
+Sweeper for the completed-session counters in models/session_stats.py.
+
+Database triggers keep the counters right whenever a booking is written. What they cannot
+see is time passing: a session becomes "completed" when its end time goes by. A sweep
+counts the bookings that ended since the watermark, adds them to the counters and moves
+the watermark to now(), all in one transaction.
+
+Dashboard reads add the bookings that ended after the watermark themselves, so sweeping
+is never needed for correctness. It only keeps that remainder small. Each API process
+sweeps every SESSION_STATS_SWEEP_SECONDS; a sweep already running elsewhere makes the
+others skip their turn.
+"""
+import asyncio
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from src.core.config import settings
+from src.models import booking, practice, session_stats
+
+# Transaction-level advisory lock held by the running sweep.
+SWEEP_LOCK_ID = 727_002
+
+
+def _upsert_completed(table, key_columns: list, counts):
+    statement = insert(table).from_select([*key_columns, "completed_sessions"], counts)
+    return statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={"completed_sessions": table.completed_sessions + statement.excluded.completed_sessions}
+    )
+
+
+def sweep(db: Session) -> int | None:
+    """
+    Folds the sessions that ended since the last sweep into the counters and commits.
+    Returns how many were added, or None if another sweep was running.
+    """
+    if not db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": SWEEP_LOCK_ID}).scalar():
+        db.rollback()
+        return None
+    # Waits for transactions whose booking triggers already read the current watermark,
+    # so their rows are visible to the count below; later ones wait for the new watermark.
+    watermark = db.execute(
+        select(session_stats.SessionStatsWatermark.completed_through).with_for_update()
+    ).scalar()
+
+    completed_through = db.execute(select(func.now())).scalar()
+    ended = (
+        booking.Booking.ends_at > watermark,
+        booking.Booking.ends_at <= completed_through,
+    )
+    swept = db.execute(select(func.count(booking.Booking.booking_id)).where(*ended)).scalar()
+    if swept:
+        per_teacher = select(
+            practice.Practice.teacher_id, func.count(booking.Booking.booking_id)
+        ).join(
+            practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+        ).where(*ended).group_by(practice.Practice.teacher_id)
+        per_group = select(
+            practice.Practice.teacher_id, booking.Booking.group_id, func.count(booking.Booking.booking_id)
+        ).join(
+            practice.Practice, booking.Booking.practice_id == practice.Practice.practice_id
+        ).where(*ended, booking.Booking.group_id.is_not(None)).group_by(
+            practice.Practice.teacher_id, booking.Booking.group_id
+        )
+        db.execute(_upsert_completed(session_stats.TeacherSessionStats, ["teacher_id"], per_teacher))
+        db.execute(_upsert_completed(session_stats.GroupSessionStats, ["teacher_id", "group_id"], per_group))
+
+    db.execute(update(session_stats.SessionStatsWatermark).values(completed_through=completed_through))
+    db.commit()
+    return swept
+
+
+async def run_periodically(session_factory, interval_seconds: float = settings.SESSION_STATS_SWEEP_SECONDS):
+    """Sweeps forever, in a worker thread, every `interval_seconds`. Meant to run as a lifespan task."""
+    def sweep_once():
+        db = session_factory()
+        try:
+            return sweep(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            swept = await asyncio.to_thread(sweep_once)
+            if swept:
+                print(f"Session stats: folded {swept} newly completed session(s) into the leaderboard counters.")
+        except Exception as e:
+            print(f"WARNING: Session stats sweep failed: {e}")
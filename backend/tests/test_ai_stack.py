@@ -0,0 +1,81 @@
+"""
+The AI stack is built lazily and cached per worker. These tests replace the langchain
+packages with small stand-ins so they run without the AI dependencies installed.
+"""
+import sys
+import threading
+import types
+import pytest
+from src.core.config import settings
+from src.services import ai_stack
+
+
+class FakeRunnable:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def from_template(cls, template):
+        return cls()
+
+    def __or__(self, other):
+        return self
+
+    def __ror__(self, other):
+        return self
+
+
+class FakeFAISS:
+    @staticmethod
+    def load_local(path, embeddings, **kwargs):
+        return ("faiss", embeddings)
+
+
+@pytest.fixture
+def cold_ai_stack(monkeypatch):
+    modules = {
+        "langchain_core": {},
+        "langchain_core.prompts": {"ChatPromptTemplate": FakeRunnable},
+        "langchain_core.output_parsers": {"StrOutputParser": FakeRunnable},
+        "langchain_ollama": {},
+        "langchain_ollama.llms": {"OllamaLLM": FakeRunnable},
+        "langchain_ollama.embeddings": {"OllamaEmbeddings": FakeRunnable},
+        "langchain_community": {},
+        "langchain_community.vectorstores": {"FAISS": FakeFAISS},
+    }
+    for name, attributes in modules.items():
+        monkeypatch.setitem(sys.modules, name, types.SimpleNamespace(**attributes))
+    monkeypatch.setattr(settings, "AI_FEATURES_ENABLED", True)
+    monkeypatch.setattr(ai_stack, "_cache", {})
+    monkeypatch.setattr(ai_stack, "_build_locks", {})
+    monkeypatch.setattr(ai_stack, "_vector_store_state", None)
+    monkeypatch.setattr(ai_stack, "_index_mtime", lambda: 1.0)
+
+
+def run_with_timeout(function, timeout: float = 5):
+    """Runs `function` on a thread and fails the test if it has not returned in `timeout` seconds."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=function()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{function.__name__} did not return within {timeout}s (deadlock?)"
+    return result["value"]
+
+
+def test_chat_chain_builds_from_cold_cache(cold_ai_stack):
+    # Imported through the app, as uvicorn does: the auth and crud modules import each other.
+    import src.main  # noqa: F401
+    from src.api.endpoints import chat
+
+    chain = run_with_timeout(chat.get_chain)
+
+    assert chain is not None
+    assert run_with_timeout(chat.get_chain) is chain
+    assert "llm" in ai_stack._cache
+
+
+def test_vector_store_loads_from_cold_cache(cold_ai_stack):
+    vector_store = run_with_timeout(ai_stack.get_vector_store)
+
+    assert vector_store == ("faiss", ai_stack._cache["embeddings"])
+    assert run_with_timeout(ai_stack.get_vector_store) is vector_store
@@ -0,0 +1,158 @@
+"""
+OccupancyIndex keeps one worker's view of the bookings current with its own commits.
+Reads go through a stand-in session that serves fixed rows; the commit and rollback
+hooks run on a real Session over in-memory SQLite, which no query ever touches.
+"""
+from datetime import date, time
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.models import booking, room
+from src.services import booking_service
+from src.services.booking_service import OccupancyIndex
+
+DAY = date(2026, 10, 19)
+ROOMS = [SimpleNamespace(room_id=1, room_name="Lab 1", capacity=30), SimpleNamespace(room_id=2, room_name="Lab 2", capacity=30)]
+
+
+class FakeQuery:
+    def __init__(self, rows, before_rows=None):
+        self.rows = rows
+        self.before_rows = before_rows
+
+    def filter(self, *criteria):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def all(self):
+        if self.before_rows:
+            self.before_rows()
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.all())
+
+
+class FakeSession:
+    """Answers the index's two queries: a date's bookings and the room list."""
+    def __init__(self, bookings=(), before_rows=None):
+        self.bookings = list(bookings)
+        self.before_rows = before_rows
+        self.queries = 0
+
+    def query(self, *columns):
+        self.queries += 1
+        if columns[0] is booking.Booking.booking_id:
+            return FakeQuery(self.bookings, self.before_rows)
+        assert columns[0] is room.Room.room_id
+        return FakeQuery(ROOMS)
+
+
+def booking_row(room_id: int, start: int, end: int, booking_id: int = 1):
+    return SimpleNamespace(booking_id=booking_id, room_id=room_id, start_time=time(start), end_time=time(end))
+
+
+def added_row(room_id: int, start: int, end: int, practice_date: date = DAY):
+    return {"practice_date": practice_date, "room_id": room_id, "group_id": 1, "start_time": time(start), "end_time": time(end)}
+
+
+def free_room_ids(index, db, start: int, end: int):
+    return [r["room_id"] for r in index.available_rooms(db, DAY, time(start), time(end))]
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(booking_service.settings, "OCCUPANCY_INDEX_ENABLED", True)
+    fresh = OccupancyIndex(ttl_seconds=3600)
+    monkeypatch.setattr(booking_service, "occupancy", fresh)
+    return fresh
+
+
+@pytest.fixture
+def session():
+    db = Session(bind=create_engine("sqlite://"))
+    yield db
+    db.close()
+
+
+def test_load_racing_a_commit_is_not_cached(index):
+    # A commit for the same date lands between the read and the store.
+    db = FakeSession(before_rows=lambda: index.apply([added_row(1, 8, 10)], set(), everything=False))
+
+    assert free_room_ids(index, db, 8, 10) == [1, 2]
+    assert DAY not in index._days
+
+    # The next read loads the date again instead of serving the older snapshot.
+    db.before_rows = None
+    db.bookings = [booking_row(1, 8, 10)]
+    assert free_room_ids(index, db, 8, 10) == [2]
+    assert DAY in index._days
+
+
+def test_added_rows_merge_into_a_loaded_day(index):
+    db = FakeSession(bookings=[booking_row(1, 8, 10)])
+    assert free_room_ids(index, db, 10, 12) == [1, 2]
+    queries = db.queries
+
+    index.apply([added_row(2, 10, 12)], set(), everything=False)
+
+    assert free_room_ids(index, db, 10, 12) == [1]
+    assert free_room_ids(index, db, 8, 10) == [2]
+    assert db.queries == queries
+
+
+def test_added_row_already_loaded_reloads_the_day(index):
+    # The date was read inside the writing transaction, so the row is already there.
+    db = FakeSession(bookings=[booking_row(1, 8, 10)])
+    free_room_ids(index, db, 8, 10)
+
+    index.apply([added_row(1, 8, 10)], set(), everything=False)
+
+    assert DAY not in index._days
+
+
+def test_everything_drops_days_and_rooms(index):
+    db = FakeSession(bookings=[booking_row(1, 8, 10)])
+    free_room_ids(index, db, 8, 10)
+    assert index._days and index._rooms is not None
+
+    index.invalidate()
+
+    assert not index._days
+    assert index._rooms is None
+
+
+def test_load_racing_everything_is_not_cached(index):
+    db = FakeSession(before_rows=index.invalidate)
+
+    free_room_ids(index, db, 8, 10)
+
+    assert DAY not in index._days
+
+
+def test_commit_applies_staged_rows(index, session):
+    db = FakeSession()
+    free_room_ids(index, db, 8, 10)
+    session.connection()
+    booking_service.stage_added_bookings(session, [added_row(1, 8, 10)])
+
+    session.commit()
+
+    assert free_room_ids(index, db, 8, 10) == [2]
+
+
+def test_rollback_discards_staged_rows(index, session):
+    db = FakeSession()
+    free_room_ids(index, db, 8, 10)
+    session.connection()
+    booking_service.stage_added_bookings(session, [added_row(1, 8, 10)])
+
+    session.rollback()
+
+    # The staged row never enters the index, and its date is reloaded rather than trusted.
+    assert booking_service._PENDING_KEY not in session.info
+    assert DAY not in index._days
+    assert free_room_ids(index, db, 8, 10) == [1, 2]
@@ -0,0 +1,42 @@
+"""
+Startup budget: importing src.main must stay cheap and must not pull in the AI stack.
+Runs manage.STARTUP_PROBE in fresh interpreters, the same probe as
+`python -m src.manage startup-time`.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from src import manage
+from src.services import ai_stack
+
+RUNS = 3
+# The budgets suggested in manage.py; override them on slower machines.
+MAX_IMPORT_MS = float(os.getenv("STARTUP_MAX_IMPORT_MS", 1500))
+MAX_RSS_MB = float(os.getenv("STARTUP_MAX_RSS_MB", 150))
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def probe_startup() -> list[tuple[float, float, set[str]]]:
+    """(import ms, peak RSS MB, heavy modules loaded) of RUNS fresh imports of src.main."""
+    results = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", manage.STARTUP_PROBE], cwd=BACKEND_ROOT, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        imported, _, rss, loaded = result.stdout.strip().splitlines()[-1].split()
+        results.append((float(imported), float(rss), set() if loaded == "-" else set(loaded.split(","))))
+    return results
+
+
+def test_startup_stays_within_budget():
+    results = probe_startup()
+
+    heavy_loaded = set().union(*(loaded for _, _, loaded in results))
+    assert not heavy_loaded & set(ai_stack.HEAVY_MODULES), f"AI packages imported at startup: {sorted(heavy_loaded)}"
+
+    median_import_ms = statistics.median(imported for imported, _, _ in results)
+    median_rss_mb = statistics.median(rss for _, rss, _ in results)
+    assert median_import_ms <= MAX_IMPORT_MS, f"import took {median_import_ms:.1f} ms (budget {MAX_IMPORT_MS:.0f} ms)"
+    assert median_rss_mb <= MAX_RSS_MB, f"peak RSS {median_rss_mb:.1f} MB (budget {MAX_RSS_MB:.0f} MB)"
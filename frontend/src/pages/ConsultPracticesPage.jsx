@@ -129,13 +129,8 @@ const ConsultPracticesPage = () => {
                 ) : (
                     <div className="practices-grid">
                         {practices.map((practice) => {
-                            const now = new Date();
-                            const is_deletable = practice.earliest_session_start
-                                ? new Date(practice.earliest_session_start + 'Z') > now
-                                : true;
-                            const is_editable = practice.latest_session_end
-                                ? new Date(practice.latest_session_end + 'Z') > now
-                                : true;
+                            const is_deletable = practice.deletable;
+                            const is_editable = practice.editable;
 
                             return (
                                 <div key={practice.practice_id} className="practice-card">
@@ -2,12 +2,31 @@ import React, { useState, useEffect, useMemo, useCallback } from 'react';
 import { useNavigate, useParams } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
 import apiClient from '../services/api';
+import { fetchRoomAvailability, formatDate, slotKey, upcomingSlots } from '../services/availability';
 import './RegisterPracticePage.css';
 import { FaCalendarAlt, FaUpload, FaFilePdf, FaArrowLeft} from 'react-icons/fa';
 import DatePicker from 'react-datepicker';
 import 'react-datepicker/dist/react-datepicker.css';
 
-const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings, initialBooking }) => {
+const findGroupSchedule = (group, dayOfWeek) => group.schedules.find(s => s.day_of_week === dayOfWeek);
+
+// The upcoming slots of every group plus the slots the practice is booked in now.
+const editableSlots = (groups, initialBookings) => {
+    const slots = upcomingSlots(groups, findGroupSchedule);
+    for (const group of groups) {
+        const booking = initialBookings.find(b => b.group_name === group.group_name);
+        if (!booking) continue;
+        const date = new Date(booking.practice_date + 'T00:00:00');
+        const schedule = findGroupSchedule(group, date.getDay());
+        if (schedule) {
+            // Formatted like the scheduler formats its selected date, so the lookup keys match.
+            slots.push({ practice_date: formatDate(date), start_time: schedule.start_time, end_time: schedule.end_time });
+        }
+    }
+    return slots;
+};
+
+const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings, initialBooking, availability, isLoadingRooms }) => {
     const { t } = useTranslation();
     
     const initialDate = useMemo(() => 
@@ -16,48 +35,27 @@ const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings,
     );
     
     const [selectedDate, setSelectedDate] = useState(initialDate);
-    const [availableRooms, setAvailableRooms] = useState([]);
     const [selectedRoomId, setSelectedRoomId] = useState(initialBooking ? initialBooking.room_id : '');
     const [scheduleForDate, setScheduleForDate] = useState(null);
-    const [isLoadingRooms, setIsLoadingRooms] = useState(false);
 
-    const checkAvailability = useCallback(async (date, schedule) => {
-        if (!date || !schedule) return;
-        setIsLoadingRooms(true);
-        try {
-            const formattedDate = date.toISOString().split('T')[0];
-            const response = await apiClient.post('/practices/availability', {
-                practice_date: formattedDate,
-                start_time: schedule.start_time,
-                end_time: schedule.end_time,
-            });
-            let finalRooms = response.data;
-            if (initialBooking && date?.getTime() === initialDate?.getTime()) {
-                const isInitialRoomAvailable = response.data.some(room => room.room_id === initialBooking.room_id);
-                if (!isInitialRoomAvailable) {
-                    const initialRoom = allRooms.find(r => r.room_id === initialBooking.room_id);
-                    if (initialRoom) finalRooms = [initialRoom, ...response.data];
-                }
-            }
-            setAvailableRooms(finalRooms);
-        } catch (error) {
-            console.error('Failed to check room availability', error);
-            setAvailableRooms([]);
-        } finally {
-            setIsLoadingRooms(false);
+    // Looked up in the availability the page loads for every group's slots at once.
+    const availableRooms = useMemo(() => {
+        if (!selectedDate || !scheduleForDate) return [];
+        const rooms = availability[slotKey(formatDate(selectedDate), scheduleForDate.start_time, scheduleForDate.end_time)] || [];
+        // The practice's own booking still holds its room on its current date.
+        if (initialBooking && selectedDate.getTime() === initialDate?.getTime()
+            && !rooms.some(room => room.room_id === initialBooking.room_id)) {
+            const initialRoom = allRooms.find(r => r.room_id === initialBooking.room_id);
+            if (initialRoom) return [initialRoom, ...rooms];
         }
-    }, [initialBooking, allRooms]);
+        return rooms;
+    }, [availability, selectedDate, scheduleForDate, initialBooking, initialDate, allRooms]);
 
     useEffect(() => {
         if (initialDate) {
-            const dayOfWeek = initialDate.getDay(); 
-            const schedule = group.schedules.find(s => s.day_of_week === dayOfWeek);
-            setScheduleForDate(schedule);
-            if (schedule) {
-                checkAvailability(initialDate, schedule);
-            }
+            setScheduleForDate(findGroupSchedule(group, initialDate.getDay()));
         }
-    }, [initialDate, group.schedules, checkAvailability]);
+    }, [initialDate, group]);
 
     useEffect(() => {
         if (initialBooking && availableRooms.length > 0) {
@@ -96,12 +94,8 @@ const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings,
 
     const handleDateChange = (date) => {
         setSelectedDate(date);
-        const dayOfWeek = date.getDay(); 
-        const schedule = group.schedules.find(s => s.day_of_week === dayOfWeek);
-        setScheduleForDate(schedule);
+        setScheduleForDate(findGroupSchedule(group, date.getDay()));
         setSelectedRoomId('');
-        setAvailableRooms([]);
-        if (date && schedule) checkAvailability(date, schedule);
     };
   
     const handleRoomChange = (e) => setSelectedRoomId(e.target.value);
@@ -236,6 +230,8 @@ const EditPracticePage = ({ isAdminMode = false }) => {
     const [selectedFile, setSelectedFile] = useState(null);
     const [filePreviewUrl, setFilePreviewUrl] = useState(null);
     const [ownerTeacherId, setOwnerTeacherId] = useState(null);
+    const [availability, setAvailability] = useState({});
+    const [isLoadingRooms, setIsLoadingRooms] = useState(true);
 
     useEffect(() => {
         const fetchAllData = async () => {
@@ -286,6 +282,11 @@ const EditPracticePage = ({ isAdminMode = false }) => {
                 });
                 setGroupBookings(initialBookingsMap);
 
+                fetchRoomAvailability(editableSlots(groupsRes.data, practiceData.bookings))
+                    .then(setAvailability)
+                    .catch(err => console.error('Failed to check room availability', err))
+                    .finally(() => setIsLoadingRooms(false));
+
             } catch (err) {
                 console.error("Failed to load edit page data", err);
                 setError("Could not load practice data. It may no longer be editable.");
@@ -364,6 +365,12 @@ const EditPracticePage = ({ isAdminMode = false }) => {
             const errorMsg = err.response?.data?.detail || t('edit_practice.error_message');
             setError(errorMsg);
             console.error(err);
+            if (err.response?.status === 409) {
+                // Someone else took a room since the form loaded: show current availability.
+                fetchRoomAvailability(editableSlots(groupsForSubject, initialBookings))
+                    .then(setAvailability)
+                    .catch(error => console.error('Failed to refresh room availability', error));
+            }
         } finally {
             setLoading(false);
         }
@@ -428,6 +435,8 @@ const EditPracticePage = ({ isAdminMode = false }) => {
                                     allRooms={allRooms}
                                     existingBookings={existingBookings}
                                     initialBooking={initialBookingForGroup}
+                                    availability={availability}
+                                    isLoadingRooms={isLoadingRooms}
                                 />
                             );
                         })}
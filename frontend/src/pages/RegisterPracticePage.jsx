@@ -2,6 +2,7 @@ import React, { useState, useEffect, useMemo, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
 import apiClient from '../services/api';
+import { fetchRoomAvailability, formatDate, slotKey, upcomingSlots } from '../services/availability';
 import './RegisterPracticePage.css';
 import { FaCalendarAlt, FaUpload, FaArrowLeft} from 'react-icons/fa';
 import DatePicker from 'react-datepicker';
@@ -9,28 +10,20 @@ import 'react-datepicker/dist/react-datepicker.css';
 import PracticeSummaryModal from '../components/specific/PracticeSummaryModal';
 import AnalysisResultModal from '../components/specific/AnalysisResultModal';
 
-const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings }) => {
+const findPracticeSchedule = (group, dayOfWeek) =>
+  group.schedules.find(s => s.day_of_week === dayOfWeek && s.schedule_type === 'PRACTICE');
+
+const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings, availability }) => {
   const { t } = useTranslation();
   const [selectedDate, setSelectedDate] = useState(null);
-  const [availableRooms, setAvailableRooms] = useState([]);
   const [selectedRoomId, setSelectedRoomId] = useState('');
   const [scheduleForDate, setScheduleForDate] = useState(null);
 
-  const checkAvailability = useCallback(async (date, schedule) => {
-    if (!date || !schedule) return;
-    try {
-      const formattedDate = date.toISOString().split('T')[0];
-      const response = await apiClient.post('/practices/availability', {
-        practice_date: formattedDate,
-        start_time: schedule.start_time,
-        end_time: schedule.end_time,
-      });
-      setAvailableRooms(response.data);
-    } catch (error) {
-      console.error('Failed to check room availability', error);
-      setAvailableRooms([]);
-    }
-  }, []);
+  // Looked up in the availability the page loads for every group's upcoming slots at once.
+  const availableRooms = useMemo(() => {
+    if (!selectedDate || !scheduleForDate) return [];
+    return availability[slotKey(formatDate(selectedDate), scheduleForDate.start_time, scheduleForDate.end_time)] || [];
+  }, [availability, selectedDate, scheduleForDate]);
 
   const scheduleDays = useMemo(() => {
     const practiceDates = [];
@@ -72,11 +65,9 @@ const GroupScheduler = ({ group, onGroupDataChange, allRooms, existingBookings }
   const handleDateChange = (date) => {
     setSelectedDate(date);
     const dayOfWeek = date.getDay();
-    const schedule = group.schedules.find(s => s.day_of_week === dayOfWeek && s.schedule_type === 'PRACTICE');
+    const schedule = findPracticeSchedule(group, dayOfWeek);
     setScheduleForDate(schedule);
     setSelectedRoomId('');
-    setAvailableRooms([]);
-    checkAvailability(date, schedule);
   };
   
   const handleRoomChange = (e) => {
@@ -190,6 +181,7 @@ const RegisterPracticePage = () => {
   const [practiceObjective, setPracticeObjective] = useState('');
   const [selectedFile, setSelectedFile] = useState(null);
   const [groupBookings, setGroupBookings] = useState({});
+  const [availability, setAvailability] = useState({});
 
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
@@ -222,6 +214,7 @@ const RegisterPracticePage = () => {
       setGroupsForSubject([]);
       setExistingBookings([]);
       setGroupBookings({});
+      setAvailability({});
       return;
     }
 
@@ -234,6 +227,7 @@ const RegisterPracticePage = () => {
         setGroupsForSubject(groupsRes.data);
         setExistingBookings(bookingsRes.data);
         setGroupBookings({});
+        setAvailability(await fetchRoomAvailability(upcomingSlots(groupsRes.data, findPracticeSchedule)));
       } catch (err) {
         console.error("Failed to fetch group data", err);
       }
@@ -263,6 +257,7 @@ const RegisterPracticePage = () => {
     setPracticeObjective('');
     setSelectedFile(null);
     setGroupBookings({});
+    setAvailability({});
     setError('');
     setSummaryData(null);
   };
@@ -326,6 +321,12 @@ const RegisterPracticePage = () => {
         const errorMsg = err.response?.data?.detail || t('register_practice.error_message');
         setError(errorMsg);
         console.error(err);
+        if (err.response?.status === 409) {
+          // Someone else took a room since the form loaded: show current availability.
+          fetchRoomAvailability(upcomingSlots(groupsForSubject, findPracticeSchedule))
+            .then(setAvailability)
+            .catch(error => console.error('Failed to refresh room availability', error));
+        }
     } finally {
         setLoading(false);
     }
@@ -405,6 +406,7 @@ const RegisterPracticePage = () => {
                       onGroupDataChange={handleGroupDataChange} 
                       allRooms={allRooms}
                       existingBookings={existingBookings}
+                      availability={availability}
                     />
                   ))
                 ) : (
@@ -0,0 +1,51 @@
+import apiClient from './api';
+
+// The batch endpoint accepts at most this many slots per request.
+const MAX_SLOTS_PER_REQUEST = 50;
+
+// Key of one session slot in the map returned by fetchRoomAvailability.
+export const slotKey = (practiceDate, startTime, endTime) => `${practiceDate}|${startTime}|${endTime}`;
+
+export const formatDate = (date) => date.toISOString().split('T')[0];
+
+// Every slot the groups can be booked in over the next `days` days: one per date whose
+// weekday has a schedule returned by findSchedule(group, dayOfWeek).
+export const upcomingSlots = (groups, findSchedule, days = 15) => {
+  const today = new Date();
+  today.setHours(0, 0, 0, 0);
+
+  const slots = [];
+  for (const group of groups) {
+    for (let i = 0; i < days; i++) {
+      const date = new Date(today);
+      date.setDate(today.getDate() + i);
+      const schedule = findSchedule(group, date.getDay());
+      if (schedule) {
+        slots.push({ practice_date: formatDate(date), start_time: schedule.start_time, end_time: schedule.end_time });
+      }
+    }
+  }
+  return slots;
+};
+
+// Free rooms for every slot, from POST /practices/availability/batch (one request per
+// MAX_SLOTS_PER_REQUEST slots). Returns { slotKey: [rooms] }.
+export const fetchRoomAvailability = async (slots) => {
+  const unique = [...new Map(slots.map(s => [slotKey(s.practice_date, s.start_time, s.end_time), s])).values()];
+  const chunks = [];
+  for (let i = 0; i < unique.length; i += MAX_SLOTS_PER_REQUEST) {
+    chunks.push(unique.slice(i, i + MAX_SLOTS_PER_REQUEST));
+  }
+  const responses = await Promise.all(
+    chunks.map(chunk => apiClient.post('/practices/availability/batch', { slots: chunk }))
+  );
+
+  const availability = {};
+  chunks.forEach((chunk, index) => {
+    // Results come back in request order; key them by what was sent.
+    chunk.forEach((slot, slotIndex) => {
+      availability[slotKey(slot.practice_date, slot.start_time, slot.end_time)] = responses[index].data[slotIndex].rooms;
+    });
+  });
+  return availability;
+};